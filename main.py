@@ -21,6 +21,7 @@ import time
 import random
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -32,13 +33,21 @@ IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
 # ============================================
 from src.auth.login import MobileAuth
 from src.models.mobile_voice_enhanced import VoiceEngineEnhanced
+from src.models.speech_scheduler import PRIORITY_HIGH
 from src.utils.theme import MobileTheme
+from src.utils.ui_scheduler import UIScheduler
 
 # API modülleri (Android uyumlu)
 from src.api.gemini import GeminiAI
 from src.api.groq import GroqAI
+from src.api.llm_router import LLMRouter
+from src.api.llm_cache import LLMResponseCache
+from src.api.conversation import ConversationMemory
+from src.api.model_catalog import ModelCatalog
 from src.api.weather import WeatherAPI
 from src.api.news import NewsAPI
+from src.api import render
+from src.api.async_runtime import fan_out_sync
 
 # Mobil özel modüller (Android uyumlu)
 from src.models.phone import PhoneInfo
@@ -47,12 +56,42 @@ from src.models.contacts import ContactsManager
 from src.models.ocr import OCRManager
 from src.models.ar_vision import ARVision
 from src.models.about import AboutManager  # YENİ!
+from src.models.intent import IntentEngine
+from src.models.command_executor import CommandExecutor, CommandContext, CommandCancelled
+from src.models.chat_history import ChatHistory, ChatMessage
 
 # ============================================
 # TEMA AYARLARI
 # ============================================
 colors = MobileTheme.current
 
+# ============================================
+# KOMUT YÜRÜTME AYARLARI
+# ============================================
+# Ağ / kamera beklemeyen, "Düşünüyor…" gerektirmeyen niyetler
+INSTANT_INTENTS = {'time', 'date', 'greeting', 'thanks', 'help', 'new_chat'}
+
+# Niyet başına zaman aşımı (sn); diğerleri 20 sn
+COMMAND_TIMEOUTS = {
+    'chat': 90,
+    'briefing': 8,
+    'weather': 15,
+    'news': 15,
+    'photo': 20,
+    'ocr': 60
+}
+
+# Aynı kaynağı kullanan komutlar: gruptan aynı anda yalnız biri çalışır
+COMMAND_GROUPS = {
+    'photo': 'camera',
+    'ocr': 'camera'
+}
+
+# Sohbet penceresi: ekranda tutulan mesaj sayısı, yukarı kaydırınca yüklenen sayfa, üst sınır
+CHAT_WINDOW = 40
+CHAT_PAGE = 20
+CHAT_WINDOW_MAX = 80
+
 # ============================================
 # GİRİŞ EKRANI
 # ============================================
@@ -270,7 +309,7 @@ class LoginScreen(ft.Container):
         if success:
             self.loading.visible = True
             self.update()
-            threading.Thread(target=lambda: (time.sleep(1), self.page.clean(), self.on_success()), daemon=True).start()
+            threading.Thread(target=lambda: (time.sleep(1), self.page.clean(), self.on_success(self.auth.current_user)), daemon=True).start()
     
     def check_biometric(self, e):
         self.status_text.value = "🖐️ Parmak izi okutuluyor..."
@@ -286,7 +325,7 @@ class LoginScreen(ft.Container):
                 self.status_text.update()
                 time.sleep(0.5)
                 self.page.clean()
-                self.on_success()
+                self.on_success(self.auth.current_user)
             else:
                 self.status_text.value = "❌ Parmak izi okunamadı"
                 self.status_text.color = colors["error"]
@@ -296,6 +335,74 @@ class LoginScreen(ft.Container):
         threading.Thread(target=check, daemon=True).start()
 
 
+# ============================================
+# UYGULAMA SERVİSLERİ
+# ============================================
+class AppServices:
+    """
+    Oturum boyunca tek kopya servisler (ses motoru, modeller, API istemcileri, thread'ler).
+    Arayüz yeniden kurulsa da (tema, giriş) yeniden oluşturulmaz.
+    """
+    
+    def __init__(self, page, user_id: str = "default"):
+        # Core modülleri başlat (Android uyumlu)
+        self.voice = VoiceEngineEnhanced()
+        self.voice.set_volume(0.8)
+        self.voice.set_speed(1.2)
+        self.voice.set_voice('tr-TR-EmelNeural')
+        
+        self.phone = PhoneInfo()
+        self.reminders = ReminderManager()
+        self.contacts = ContactsManager()
+        # Komutlar yerelde tanınır; rehberdeki isimler slot olarak eklenir
+        self.intents = IntentEngine([c['name'] for c in self.contacts.get_all_contacts()])
+        # Komutlar UI thread'i dışında, türüne göre zaman aşımıyla çalışır
+        self.commands = CommandExecutor(max_workers=4, timeouts=COMMAND_TIMEOUTS, groups=COMMAND_GROUPS)
+        # Anlık yerel cevaplar ayrı şeritte: takılan kamera / ağ işleri onları bekletmez
+        self.instant = CommandExecutor(max_workers=1, max_pending=8, default_timeout=5,
+                                       thread_name_prefix="anna-instant")
+        # Sekme verisi ayrı küçük havuzda yenilenir (komut kuyruğunu ve istatistiklerini işgal etmez)
+        self.tab_loader = CommandExecutor(max_workers=1, max_pending=8, default_timeout=15)
+        self.ocr = OCRManager()
+        self.weather_api = WeatherAPI()
+        self.news_api = NewsAPI()
+        self.news_api.start_prefetch()
+        self.ar_vision = ARVision()
+        self.about = AboutManager()  # YENİ!
+        
+        # AI: istek başına en hızlı sağlıklı sağlayıcı / model seçilir
+        self.catalog = ModelCatalog()
+        self.groq = GroqAI(self.catalog)
+        self.gemini = GeminiAI(self.catalog)
+        self.catalog.refresh_background([self.groq, self.gemini])
+        # Sohbet hafızası giriş yapan kullanıcıya ait
+        self.memory = ConversationMemory(user_id)
+        self.router = LLMRouter([self.groq, self.gemini], cache=LLMResponseCache(),
+                                memory=self.memory, catalog=self.catalog)
+        
+        if self.router.available:
+            self.ai = self.router
+            self.ai_name = " + ".join(
+                name for name, client in (("Groq", self.groq), ("Gemini", self.gemini)) if client.available
+            ) + " AI"
+        else:
+            self.ai = None
+            self.ai_name = "Yerel Mod (Sınırlı)"
+        
+        # UI güncellemeleri kare başına birleştirilip tek thread'den gönderilir
+        self.ui = UIScheduler(page)
+        # Sohbet geçmişi (diskte kalıcı)
+        self.history = ChatHistory()
+    
+    def use_memory(self, user_id: str):
+        """Başka kullanıcı giriş yaptı: onun sohbet hafızasına geç"""
+        if self.memory.user_id == user_id:
+            return
+        self.memory = ConversationMemory(user_id)
+        self.router.memory = self.memory
+        print(f"🧠 Sohbet hafızası: {user_id}")
+
+
 # ============================================
 # ANA UYGULAMA
 # ============================================
@@ -322,65 +429,78 @@ def main(page: ft.Page):
     wave_active = False
     current_tab = 0
     current_theme = "dark"
+    services = None
     
     # ============================================
     # GİRİŞ EKRANINI GÖSTER
     # ============================================
     def show_login():
         page.clean()
-        page.add(LoginScreen(page, lambda: show_main_app(is_listening, wake_active, wave_active, current_tab, current_theme)))
+        page.add(LoginScreen(page, lambda user_id: show_main_app(is_listening, wake_active, wave_active, current_tab, current_theme, user_id)))
         page.update()
     
     # ============================================
     # ANA UYGULAMAYI BAŞLAT
     # ============================================
-    def show_main_app(is_listening_param, wake_active_param, wave_active_param, current_tab_param, current_theme_param):
+    def show_main_app(is_listening_param, wake_active_param, wave_active_param, current_tab_param, current_theme_param, user_id="default"):
         # Parametreleri nonlocal olarak al
-        nonlocal is_listening, wake_active, wave_active, current_tab, current_theme
+        nonlocal is_listening, wake_active, wave_active, current_tab, current_theme, services
         is_listening = is_listening_param
         wake_active = wake_active_param
         wave_active = wave_active_param
         current_tab = current_tab_param
         current_theme = current_theme_param
         
-        # Core modülleri başlat (Android uyumlu)
-        voice = VoiceEngineEnhanced()
-        voice.set_volume(0.8)
-        voice.set_speed(1.2)
-        voice.set_voice('tr-TR-EmelNeural')
-        
-        phone = PhoneInfo()
-        reminders = ReminderManager()
-        contacts = ContactsManager()
-        ocr = OCRManager()
-        weather_api = WeatherAPI()
-        news_api = NewsAPI()
-        ar_vision = ARVision()
-        about = AboutManager()  # YENİ!
-        
-        # AI seçimi (önce Groq, yoksa Gemini)
-        groq = GroqAI()
-        gemini = GeminiAI()
-        
-        if groq.available:
-            ai = groq
-            ai_name = "Groq AI (Çok Hızlı!)"
-        elif gemini.available:
-            ai = gemini
-            ai_name = "Gemini AI"
+        # Servisler ilk açılışta bir kez kurulur; arayüz yeniden kurulsa da paylaşılır
+        if services is None:
+            services = AppServices(page, user_id)
         else:
-            ai = None
-            ai_name = "Yerel Mod (Sınırlı)"
-        
-        # UI bileşenleri
-        chat_list = ft.ListView(spacing=10, auto_scroll=True, expand=True)
+            services.use_memory(user_id)
+        
+        voice = services.voice
+        phone = services.phone
+        reminders = services.reminders
+        contacts = services.contacts
+        intents = services.intents
+        commands = services.commands
+        instant = services.instant
+        tab_loader = services.tab_loader
+        ocr = services.ocr
+        weather_api = services.weather_api
+        news_api = services.news_api
+        ar_vision = services.ar_vision
+        about = services.about
+        memory = services.memory
+        ai = services.ai
+        ai_name = services.ai_name
+        ui = services.ui
+        
+        # Sohbet: kalıcı geçmiş + ekranda yalnız son mesajlardan oluşan pencere
+        history = services.history
+        chat_window = []       # chat_list.controls[1:] ile paralel (ChatMessage veya None)
+        chat_lock = threading.Lock()
+        # Eski mesaj sayfası yükleniyor (kaydırma olayları üst üste tetiklemesin)
+        older_loading = threading.Event()
+        
+        def on_chat_scroll(e):
+            # En üste yaklaşınca eski mesajları yükle
+            if older_btn.visible and e.pixels <= e.min_scroll_extent + 40:
+                load_older()
+        
+        older_btn = ft.TextButton("⬆ Önceki mesajlar", visible=False, on_click=lambda _: load_older())
+        chat_list = ft.ListView(
+            controls=[older_btn], spacing=10, auto_scroll=True, expand=True,
+            on_scroll=on_chat_scroll, on_scroll_interval=100,
+        )
         
         # ============================================
         # FONKSİYONLAR
         # ============================================
-        def add_message(sender: str, text: str, is_user: bool = True):
+        def build_bubble(sender: str, text: str, is_user: bool):
+            """Mesaj baloncuğu -> (kapsayıcı, metin kontrolü)"""
             color = colors["secondary"] if is_user else colors["primary"]
             icon = "👤" if is_user else "🤖"
+            body = ft.Text(text, color=colors["text"], size=12, selectable=True)
             
             msg = ft.Container(
                 content=ft.Row([
@@ -394,7 +514,7 @@ def main(page: ft.Page):
                     ft.Container(
                         content=ft.Column([
                             ft.Text(sender, size=11, color=color, weight=ft.FontWeight.BOLD),
-                            ft.Text(text, color=colors["text"], size=12, selectable=True),
+                            body,
                         ]),
                         bgcolor=colors["glass"],
                         border_radius=15,
@@ -404,9 +524,101 @@ def main(page: ft.Page):
                 ], alignment=ft.MainAxisAlignment.END if is_user else ft.MainAxisAlignment.START),
                 margin=ft.margin.only(bottom=5),
             )
+            return msg, body
+        
+        def show_bubble(record):
+            """Geçmişten gelen kaydı çiz; canlı metin kontrolü kayda bağlanır"""
+            msg, body = build_bubble(record.sender, record.text, record.is_user)
+            record.view = body
+            body.data = record
+            return msg
+        
+        def update_older_btn():
+            first = next((r.seq for r in chat_window if r is not None), None)
+            oldest = history.oldest_seq
+            older_btn.visible = oldest is not None and (first is None or first > oldest)
+        
+        def trim_window(keep: int, from_top: bool = True):
+            """Pencereyi keep mesaja indir; çıkan kayıtların kontrolleri bırakılır"""
+            while len(chat_window) > keep:
+                index = 0 if from_top else len(chat_window) - 1
+                record = chat_window.pop(index)
+                chat_list.controls.pop(index + 1)
+                if record is not None:
+                    history.release(record)
+        
+        def show_latest():
+            """Eski mesajlara bakılırken yeni mesaj geldi: en yeni pencereye dön"""
+            trim_window(0)
+            for record in history.recent(CHAT_WINDOW):
+                chat_list.controls.append(show_bubble(record))
+                chat_window.append(record)
+            chat_list.auto_scroll = True
+        
+        def add_message(sender: str, text: str, is_user: bool = True, persist: bool = True):
+            """Sohbete mesaj ekle -> metin kontrolü (akışta güncellenir)"""
+            msg, body = build_bubble(sender, text, is_user)
+            with chat_lock:
+                if not chat_list.auto_scroll:
+                    show_latest()
+                record = None
+                if persist:
+                    record = history.append(sender, text, is_user, view=body)
+                    body.data = record
+                chat_list.controls.append(msg)
+                chat_window.append(record)
+                trim_window(CHAT_WINDOW)
+                update_older_btn()
+            ui.mark(chat_list)
+            return body
+        
+        def load_older():
+            """Yukarı kaydırınca bir sayfa eski mesajı diskten / halkadan yükle (arka planda)"""
+            if older_loading.is_set():
+                return
+            with chat_lock:
+                first = next((r.seq for r in chat_window if r is not None), None)
+            if first is None:
+                return
+            older_loading.set()
             
-            chat_list.controls.append(msg)
-            page.update()
+            def run(handle):
+                try:
+                    records = history.older(first, CHAT_PAGE)
+                    handle.check()
+                    with chat_lock:
+                        # Bu arada yeni mesaj gelip pencere değiştiyse sonuç bayat
+                        current = next((r.seq for r in chat_window if r is not None), None)
+                        if current != first:
+                            return
+                        if not records:
+                            older_btn.visible = False
+                        else:
+                            # Kaydırma konumu korunsun; en alttan eski mesajlar bırakılır
+                            chat_list.auto_scroll = False
+                            chat_list.controls[1:1] = [show_bubble(r) for r in records]
+                            chat_window[0:0] = records
+                            trim_window(CHAT_WINDOW_MAX, from_top=False)
+                            update_older_btn()
+                    ui.mark(chat_list)
+                finally:
+                    older_loading.clear()
+            
+            if tab_loader.submit("chat:older", run, on_timeout=lambda _: older_loading.clear()) is None:
+                older_loading.clear()
+        
+        def refresh_message(control):
+            """Akışta değişen mesaj: ekrana gönder, geçmişe kaydı planla"""
+            ui.mark(control)
+            record = getattr(control, 'data', None)
+            if not isinstance(record, ChatMessage):
+                return
+            record.text = control.value
+            # Pencere yeniden çizildiyse mesajın yeni kontrolünü de güncelle
+            if record.view is not None and record.view is not control:
+                record.view.value = control.value
+                ui.mark(record.view)
+            history.changed(record)
         
         # Ses dalgası animasyonu
         wave_bars = []
@@ -422,20 +634,43 @@ def main(page: ft.Page):
             )
         
         wave_container = ft.Row(wave_bars, alignment=ft.MainAxisAlignment.CENTER, spacing=3, visible=False)
+        # Her animasyon turunun numarası: durdurulup hemen yeniden başlatılınca
+        # eski döngü yenisinin seviye aboneliğini kapatmasın
+        wave_current = 0
         
         def animate_wave():
-            nonlocal wave_active
+            nonlocal wave_active, wave_current
             wave_active = True
+            wave_current += 1
+            generation = wave_current
             wave_container.visible = True
-            page.update()
+            ui.mark(wave_container)
             
             def wave_loop():
-                while wave_active:
-                    for bar in wave_bars:
-                        bar.height = random.randint(15, 40)
-                        bar.bgcolor = random.choice([colors["accent"], colors["primary"], colors["secondary"]])
-                    page.update()
-                    time.sleep(0.1)
+                # Çubuklar ortak mikrofon akışının gerçek seviyesinden çizilir
+                metered = voice.start_level_meter()
+                try:
+                    while wave_active and wave_current == generation:
+                        levels = voice.input_levels(len(wave_bars)) if metered else []
+                        if levels:
+                            levels = [0.0] * (len(wave_bars) - len(levels)) + levels
+                            for bar, level in zip(wave_bars, levels):
+                                # Konuşma RMS'i ~0.02-0.2; karekök sessiz kareleri de görünür kılar
+                                strength = min(1.0, (level * 10) ** 0.5)
+                                bar.height = 10 + strength * 30
+                                bar.bgcolor = (colors["secondary"] if strength > 0.7 else
+                                               colors["primary"] if strength > 0.35 else colors["accent"])
+                        else:
+                            # Ortak akış yok (ör. sounddevice'sız Android): süs animasyonu
+                            for bar in wave_bars:
+                                bar.height = random.randint(15, 40)
+                                bar.bgcolor = random.choice([colors["accent"], colors["primary"], colors["secondary"]])
+                        # Yalnız dalga satırı gönderilir, sayfanın tamamı değil
+                        ui.mark(wave_container)
+                        time.sleep(0.1)
+                finally:
+                    if metered and wave_current == generation:
+                        voice.stop_level_meter()
             
             threading.Thread(target=wave_loop, daemon=True).start()
         
@@ -443,16 +678,63 @@ def main(page: ft.Page):
             nonlocal wave_active
             wave_active = False
             wave_container.visible = False
-            page.update()
+            ui.mark(wave_container)
+        
+        # ============================================
+        # ARA SONUÇLAR VE ERKEN NİYET TAHMİNİ
+        # ============================================
+        prefetch_pool = ThreadPoolExecutor(max_workers=2)
+        prefetched = {}
+        
+        def detect_early_intent(stable_prefix: str):
+            """Kararlı önekten niyet tahmini -> (anahtar, getirici) veya None"""
+            intent = intents.parse(stable_prefix)
+            if intent.name == 'weather':
+                city = intent.slots.get('city', "İstanbul")
+                return f"hava:{city}", lambda: weather_api.fetch_weather(city)
+            if intent.name == 'news':
+                category = intent.slots.get('category', 'general')
+                return f"haber:{category}", lambda: news_api.fetch_headlines(category=category)
+            return None
+        
+        def on_partial(text: str, stable_prefix: str):
+            """Konuşurken mesaj kutusunu güncelle ve veriyi önceden getir"""
+            message_input.value = text
+            ui.mark(message_input)
+            
+            intent = detect_early_intent(stable_prefix)
+            if intent and intent[0] not in prefetched:
+                prefetched[intent[0]] = prefetch_pool.submit(intent[1])
+        
+        # Akan AI cevabının kuyruktaki cümleleri
+        ai_speech = []
+        
+        def take_prefetched(key: str, fetch):
+            """Önceden getirilmiş sonucu kullan, yoksa şimdi getir"""
+            future = prefetched.pop(key, None)
+            if future is not None:
+                try:
+                    return future.result(timeout=15)
+                except Exception:
+                    pass
+            return fetch()
+        
+        def listen_command():
+            """Sesli komutu ara sonuçlarla dinle"""
+            prefetched.clear()
+            komut = voice.listen(timeout=5, on_partial=on_partial)
+            message_input.value = ""
+            return komut
         
         # Wake word callback
         def on_wake_word(word):
-            add_message("ANNA", f"🔊 '{word}' algılandı, dinliyorum...", is_user=False)
-            voice.speak("Buyurun, dinliyorum.")
+            add_message("ANNA", f"🔊 '{word}' algılandı, dinliyorum...", is_user=False, persist=False)
+            # Dinleme istemle paralel başlar; istemin yankısı ses motorunda kapılanır
+            voice.speak("Buyurun, dinliyorum.", priority=PRIORITY_HIGH, max_age=2)
             animate_wave()
             
             def listen_thread():
-                komut = voice.listen(timeout=5)
+                komut = listen_command()
                 stop_wave()
                 if komut:
                     add_message("Sen", komut, is_user=True)
@@ -469,16 +751,16 @@ def main(page: ft.Page):
                     wake_btn.content.controls[0].name = ft.icons.MIC
                     wake_btn.content.controls[1].value = "Wake Açık"
                     wake_btn.border = ft.border.all(2, colors["success"])
-                    add_message("ANNA", "Wake word aktif: 'Jarvis' deyin", is_user=False)
+                    add_message("ANNA", "Wake word aktif: 'Jarvis' deyin", is_user=False, persist=False)
             else:
                 voice.stop_wake_word()
                 wake_active = False
                 wake_btn.content.controls[0].name = ft.icons.MIC_OFF
                 wake_btn.content.controls[1].value = "Wake Kapalı"
                 wake_btn.border = ft.border.all(1, colors["error"] + "80")
-                add_message("ANNA", "Wake word pasif", is_user=False)
+                add_message("ANNA", "Wake word pasif", is_user=False, persist=False)
             
-            page.update()
+            ui.mark(wake_btn)
         
         # Sesli komut butonu
         def start_listening(e):
@@ -491,10 +773,10 @@ def main(page: ft.Page):
             listen_btn.content.controls[1].value = "Dinliyor..."
             listen_btn.bgcolor = colors["primary"] + "40"
             animate_wave()
-            page.update()
+            ui.mark(listen_btn)
             
             def listen_thread():
-                komut = voice.listen(timeout=5)
+                komut = listen_command()
                 stop_wave()
                 
                 def update_ui():
@@ -503,7 +785,7 @@ def main(page: ft.Page):
                     listen_btn.content.controls[0].name = ft.icons.MIC_NONE
                     listen_btn.content.controls[1].value = "Sesli Komut"
                     listen_btn.bgcolor = "transparent"
-                    page.update()
+                    ui.mark(listen_btn)
                     
                     if komut:
                         add_message("Sen", komut, is_user=True)
@@ -513,139 +795,236 @@ def main(page: ft.Page):
             
             threading.Thread(target=listen_thread, daemon=True).start()
         
-        # Komut işleme (senkron)
-        def process_command(text: str):
-            text_lower = text.lower()
-            
-            # AR komutları
-            if "ar başlat" in text_lower or "kamera aç" in text_lower:
-                result = ar_vision.start_camera()
-                add_message("ANNA", result, is_user=False)
-                voice.speak(result)
-                change_tab(5)  # AR sekmesine geç
-            
-            elif "ar durdur" in text_lower or "kamera kapat" in text_lower:
-                result = ar_vision.stop_camera()
-                add_message("ANNA", result, is_user=False)
-                voice.speak(result)
-            
-            elif "fotoğraf çek" in text_lower:
-                result = ar_vision.take_photo()
-                if isinstance(result, dict):
-                    if result.get('scan', {}).get('text'):
-                        add_message("ANNA", f"📝 Okunan: {result['scan']['text'][:100]}", is_user=False)
-                    elif result.get('scan', {}).get('qr_codes'):
-                        qr_text = result['scan']['qr_codes'][0]['data']
-                        add_message("ANNA", f"📱 QR: {qr_text}", is_user=False)
-                    else:
-                        add_message("ANNA", "📸 Fotoğraf çekildi", is_user=False)
-            
-            # Hava durumu
-            elif "hava" in text_lower:
-                result = weather_api.get_weather()
-                add_message("ANNA", result, is_user=False)
-                voice.speak(result)
-            
-            # Haberler
-            elif "haber" in text_lower:
-                categories = {
-                    'teknoloji': 'technology',
-                    'spor': 'sports',
-                    'ekonomi': 'business',
-                    'sağlık': 'health',
-                    'bilim': 'science',
-                    'eğlence': 'entertainment'
-                }
-                
-                kategori_bulundu = False
-                for tr_kelime, en_kategori in categories.items():
-                    if tr_kelime in text_lower:
-                        result = news_api.get_headlines(category=en_kategori)
-                        add_message("ANNA", result, is_user=False)
-                        voice.speak(f"{tr_kelime} haberleri getiriliyor...")
-                        kategori_bulundu = True
-                        break
-                
-                if not kategori_bulundu:
-                    result = news_api.get_headlines()
-                    add_message("ANNA", result, is_user=False)
-                    voice.speak("Güncel haberler getiriliyor...")
+        # ============================================
+        # KOMUTLAR (niyet -> işleyici)
+        # ============================================
+        # AR komutları
+        def handle_ar_start(ctx, text, intent):
+            ctx.reply(ar_vision.start_camera())
+            change_tab(5)  # AR sekmesine geç
+        
+        def handle_ar_stop(ctx, text, intent):
+            ctx.reply(ar_vision.stop_camera())
+        
+        def handle_photo(ctx, text, intent):
+            result = ar_vision.take_photo()
+            if isinstance(result, dict):
+                if result.get('scan', {}).get('text'):
+                    ctx.reply(f"📝 Okunan: {result['scan']['text'][:100]}", speech=False)
+                elif result.get('scan', {}).get('qr_codes'):
+                    qr_text = result['scan']['qr_codes'][0]['data']
+                    ctx.reply(f"📱 QR: {qr_text}", speech=False)
+                else:
+                    ctx.reply("📸 Fotoğraf çekildi", speech=False)
+        
+        # Sabah özeti: hava, manşetler ve hatırlatıcılar eşzamanlı
+        def handle_briefing(ctx, text, intent):
+            briefing = fan_out_sync({
+                'hava': weather_api.afetch_weather(intent.slots.get('city', "İstanbul")),
+                'haber': news_api.afetch_headlines(page_size=3),
+                'hatırlatıcı': reminders.list_reminders
+            }, deadline=4.0)
             
-            # Telefon bilgileri
-            elif "batarya" in text_lower:
-                result = phone.get_battery_info()
-                add_message("ANNA", result, is_user=False)
-                voice.speak("Batarya bilgileri getiriliyor...")
+            parts, speech = [], []
+            obs = briefing.get('hava')
+            if obs:
+                parts.append(render.weather_markdown(obs))
+                speech.append(render.weather_speech(obs))
+            news = briefing.get('haber')
+            if news:
+                parts.append(render.news_markdown(news, 3))
+                speech.append(render.news_speech(news))
+            if briefing.get('hatırlatıcı'):
+                parts.append(briefing.get('hatırlatıcı'))
             
-            elif "depolama" in text_lower:
-                result = phone.get_storage_info()
-                add_message("ANNA", result, is_user=False)
-                voice.speak("Depolama bilgileri getiriliyor...")
+            # Süre sınırına yetişmeyenler kısmi sonuçla bildirilir
+            missing = briefing.timed_out + list(briefing.errors)
+            if missing:
+                parts.append(f"⏱️ Alınamayanlar: {', '.join(missing)}")
             
-            # Rehber
-            elif "rehber" in text_lower:
-                result = contacts.format_contact_list()
-                add_message("ANNA", result, is_user=False)
-                voice.speak("Rehber listeleniyor...")
-            
-            # OCR
-            elif "fotoğraf oku" in text_lower or "resim oku" in text_lower:
-                add_message("ANNA", "📸 Kameradan fotoğraf çekiliyor...", is_user=False)
-                voice.speak("Kameradan fotoğraf çekiyorum, lütfen bekleyin.")
-                
-                def ocr_thread():
-                    result = ocr.camera_to_text()
-                    if result.get('success'):
-                        add_message("ANNA", f"📝 {result['text'][:200]}", is_user=False)
-                    else:
-                        add_message("ANNA", "❌ Yazı okunamadı", is_user=False)
-                
-                threading.Thread(target=ocr_thread, daemon=True).start()
-            
-            # Hatırlatıcı
-            elif "hatırlat" in text_lower:
-                import re
-                minutes = 5
-                match = re.search(r'(\d+)\s*dakika', text_lower)
-                if match:
-                    minutes = int(match.group(1))
-                
-                message = text.replace("hatırlat", "").strip()
-                if message:
-                    result = reminders.add_reminder("Hatırlatıcı", message, minutes)
-                    add_message("ANNA", result, is_user=False)
-                    voice.speak(result)
+            result = "\n\n".join(parts) or "❌ Özet hazırlanamadı"
+            ctx.reply(result, " ".join(speech), key="özet")
+        
+        # Hava durumu
+        def handle_weather(ctx, text, intent):
+            # Sohbet ve ses aynı gözlem nesnesinden üretilir
+            city = intent.slots.get('city', "İstanbul")
+            try:
+                obs = take_prefetched(f"hava:{city}", lambda: weather_api.fetch_weather(city))
+                ctx.reply(render.weather_markdown(obs) + weather_api.freshness_note(obs),
+                      render.weather_speech(obs), key="hava")
+            except Exception as e:
+                ctx.reply(weather_api.error_message(e, city), key="hava")
+        
+        # Haberler
+        def handle_news(ctx, text, intent):
+            category = intent.slots.get('category', 'general')
+            try:
+                news = take_prefetched(f"haber:{category}",
+                                       lambda: news_api.fetch_headlines(category=category))
+                ctx.reply(render.news_markdown(news), render.news_speech(news), key="haber")
+            except Exception as e:
+                ctx.reply(news_api.error_message(e), key="haber")
+        
+        # Telefon bilgileri
+        def handle_battery(ctx, text, intent):
+            ctx.reply(phone.get_battery_info(), "Batarya bilgileri getiriliyor...")
+        
+        def handle_storage(ctx, text, intent):
+            ctx.reply(phone.get_storage_info(), "Depolama bilgileri getiriliyor...")
+        
+        # Rehber
+        def handle_contacts(ctx, text, intent):
+            name = intent.slots.get('contact')
+            if name:
+                ctx.reply(contacts.format_contact_list(contacts.search_contacts(name)), f"{name} bulunuyor...")
+            else:
+                ctx.reply(contacts.format_contact_list(), "Rehber listeleniyor...")
+        
+        # OCR
+        def handle_ocr(ctx, text, intent):
+            ctx.show("📸 Kameradan fotoğraf çekiliyor...")
+            voice.speak("Kameradan fotoğraf çekiyorum, lütfen bekleyin.")
             
-            # Yardım
-            elif "yardım" in text_lower:
-                help_text = """🤖 **A.N.N.A Komutları**
+            result = ocr.camera_to_text()
+            if result.get('success'):
+                ctx.reply(f"📝 {result['text'][:200]}", speech=False)
+            else:
+                ctx.reply("❌ Yazı okunamadı", speech=False)
+        
+        # Hatırlatıcı
+        def handle_reminder(ctx, text, intent):
+            minutes = intent.slots.get('minutes', 5)
+            ctx.reply(reminders.add_reminder("Hatırlatıcı", intent.slots.get('message', text), minutes))
+        
+        # Yeni sohbet (hafızayı sıfırla)
+        def handle_new_chat(ctx, text, intent):
+            memory.clear()
+            ctx.reply("🧹 Yeni sohbet başladı, önceki konuşmayı unuttum.", "Yeni sohbet başladı.")
+        
+        # Yardım
+        def handle_help(ctx, text, intent):
+            help_text = """🤖 **A.N.N.A Komutları**
 
 🕶️ AR: 'kamera aç', 'fotoğraf çek'
-🌤️ Hava durumu
-📰 Haberler
+🌤️ Hava durumu ('Ankara'da hava')
+📰 Haberler ('spor haberleri')
 📱 Telefon bilgisi
-👤 Rehber
+👤 Rehber ('Ahmet'in numarası')
 📸 OCR: 'fotoğraf oku'
-⏰ Hatırlatıcı
-💬 Sohbet"""
-                add_message("ANNA", help_text, is_user=False)
-                voice.speak("Size nasıl yardımcı olabilirim?")
-            
-            # AI sohbet
+⏰ Hatırlatıcı ('10 dakika sonra ... hatırlat')
+💬 Sohbet ('yeni sohbet' ile sıfırla)"""
+            ctx.reply(help_text, "Size nasıl yardımcı olabilirim?")
+        
+        # Saat / tarih / selamlaşma: LLM'e gitmeden
+        def handle_time(ctx, text, intent):
+            ctx.reply(f"🕐 Saat {datetime.now().strftime('%H:%M')}")
+        
+        def handle_date(ctx, text, intent):
+            now = datetime.now()
+            days = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+            months = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz",
+                      "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+            ctx.reply(f"📅 Bugün {now.day} {months[now.month - 1]} {now.year}, {days[now.weekday()]}")
+        
+        def handle_greeting(ctx, text, intent):
+            ctx.reply("Merhaba! Size nasıl yardımcı olabilirim?")
+        
+        def handle_thanks(ctx, text, intent):
+            ctx.reply("Rica ederim! 😊")
+        
+        # AI sohbet
+        def handle_chat(ctx, text, intent):
+            if ai:
+                try:
+                    # Önceki cevabın okunmamış cümlelerini at
+                    for handle in ai_speech:
+                        handle.cancel()
+                    ai_speech.clear()
+                    
+                    def on_text(partial: str):
+                        # Yeni soru geldiyse akış burada kesilir
+                        ctx.show(partial)
+                    
+                    def on_sentence(sentence: str):
+                        # Tamamlanan cümle hemen okunur
+                        if ctx.cancelled:
+                            return
+                        handle = voice.speak(sentence)
+                        if handle is not None:
+                            ai_speech.append(handle)
+                    
+                    result = ai.stream(text, on_text=on_text, on_sentence=on_sentence)
+                    ctx.check()
+                    if not result.text:
+                        ctx.reply("❌ Cevap alınamadı", speech=False)
+                except CommandCancelled:
+                    raise
+                except Exception as e:
+                    ctx.reply(f"❌ AI hatası: {e}", "Üzgünüm, şu anda cevap veremiyorum.")
             else:
-                if ai:
-                    try:
-                        response = ai.ask(text)
-                        add_message("ANNA", response, is_user=False)
-                        voice.speak(response)
-                    except Exception as e:
-                        error_msg = f"❌ AI hatası: {e}"
-                        add_message("ANNA", error_msg, is_user=False)
-                        voice.speak("Üzgünüm, şu anda cevap veremiyorum.")
+                ctx.reply("Merhaba! API anahtarlarınızı kontrol edin veya 'yardım' yazın.")
+        
+        command_handlers = {
+            'ar_start': handle_ar_start,
+            'ar_stop': handle_ar_stop,
+            'photo': handle_photo,
+            'briefing': handle_briefing,
+            'weather': handle_weather,
+            'news': handle_news,
+            'battery': handle_battery,
+            'storage': handle_storage,
+            'contacts': handle_contacts,
+            'ocr': handle_ocr,
+            'reminder': handle_reminder,
+            'new_chat': handle_new_chat,
+            'help': handle_help,
+            'time': handle_time,
+            'date': handle_date,
+            'greeting': handle_greeting,
+            'thanks': handle_thanks,
+        }
+        
+        def post_reply(text: str):
+            add_message("ANNA", text, is_user=False)
+        
+        def speak_reply(text: str, key: str = None):
+            return voice.speak(text, key=key)
+        
+        def process_command(text: str):
+            """Niyeti çöz, işleyiciyi havuza ver; UI thread'i hemen serbest kalır"""
+            intent = intents.parse(text)
+            handler = command_handlers.get(intent.name, handle_chat)
+            
+            # Anlık yerel cevaplarda yer tutucu gösterilmez
+            placeholder = None
+            if intent.name not in INSTANT_INTENTS:
+                placeholder = add_message("ANNA", "⏳ Düşünüyor…", is_user=False)
+            
+            def show_status(message: str):
+                if placeholder is not None:
+                    placeholder.value = message
+                    refresh_message(placeholder)
+                else:
+                    post_reply(message)
+            
+            def run(handle):
+                handler(CommandContext(handle, placeholder, post_reply, speak_reply, refresh=refresh_message),
+                        text, intent)
+            
+            executor = instant if intent.name in INSTANT_INTENTS else commands
+            handle = executor.submit(
+                intent.name, run,
+                # Yeni AI sorusu önceki akışı keser
+                supersede=intent.name == 'chat',
+                on_timeout=lambda h: show_status("⏱️ İşlem zaman aşımına uğradı, lütfen tekrar deneyin."),
+                on_error=lambda h, e: show_status(f"❌ Komut çalıştırılamadı: {e}")
+            )
+            if handle is None:
+                if executor.busy(intent.name):
+                    show_status("📷 Kamera meşgul, önceki işlem bitince tekrar deneyin.")
                 else:
-                    response = "Merhaba! API anahtarlarınızı kontrol edin veya 'yardım' yazın."
-                    add_message("ANNA", response, is_user=False)
-                    voice.speak(response)
+                    show_status("⏳ Çok fazla işlem sürüyor, biraz sonra tekrar deneyin.")
         
         # Mesaj gönderme
         def send_message(e):
@@ -654,59 +1033,58 @@ def main(page: ft.Page):
             
             msg = message_input.value
             message_input.value = ""
-            page.update()
+            ui.mark(message_input)
             
             add_message("Sen", msg, is_user=True)
             process_command(msg)
         
-        # Tema değiştirici
-        def change_theme(e):
-            nonlocal current_theme
-            if current_theme == "dark":
-                current_theme = "ocean"
-                MobileTheme.set_theme("ocean")
-            elif current_theme == "ocean":
-                current_theme = "ice"
-                MobileTheme.set_theme("ice")
-            else:
-                current_theme = "dark"
-                MobileTheme.set_theme("dark")
-            
-            globals()["colors"] = MobileTheme.current
-            page.bgcolor = colors["bg_primary"]
-            page.clean()
-            show_main_app(is_listening, wake_active, wave_active, current_tab, current_theme)
+        # Tema değiştirici: kontroller yeniden kurulmaz, jeton tablosundan yerinde boyanır
+        THEME_ORDER = ["dark", "ocean", "ice"]
         
-        def change_theme_direct(theme):
+        def apply_theme(theme):
             nonlocal current_theme
+            if theme == current_theme:
+                return
+            started = time.perf_counter()
             current_theme = theme
-            MobileTheme.set_theme(theme)
-            globals()["colors"] = MobileTheme.current
+            previous = MobileTheme.set_theme(theme)
             page.bgcolor = colors["bg_primary"]
-            page.clean()
-            show_main_app(is_listening, wake_active, wave_active, current_tab, current_theme)
+            # Ekrandaki ağaç + henüz gösterilmeyen önbellekteki sekmeler
+            roots = list(page.controls) + list(tab_views.values())
+            changed = MobileTheme.restyle(roots, previous)
+            ui.mark_page()
+            print(f"🎨 Tema: {theme} ({changed} renk, {(time.perf_counter() - started) * 1000:.0f} ms)")
+        
+        def change_theme(e):
+            index = THEME_ORDER.index(current_theme) if current_theme in THEME_ORDER else -1
+            apply_theme(THEME_ORDER[(index + 1) % len(THEME_ORDER)])
+        
+        def change_theme_direct(theme):
+            apply_theme(theme)
+        
+        # Sekme değiştirici: her sekme bir kez kurulur, verisi arka planda yenilenir
+        tab_views = {}
+        tab_refreshers = {}
+        
+        def tab_view(index):
+            view = tab_views.get(index)
+            if view is None:
+                view = tab_builders[index]()
+                tab_views[index] = view
+            return view
+        
+        def refresh_tab(index):
+            refresher = tab_refreshers.get(index)
+            if refresher is not None:
+                tab_loader.submit(f"tab:{index}", lambda handle: refresher(), supersede=True)
         
-        # Sekme değiştirici
         def change_tab(index):
             nonlocal current_tab
             current_tab = index
             
-            if index == 0:
-                content_area.content = build_chat_tab()
-            elif index == 1:
-                content_area.content = build_phone_tab()
-            elif index == 2:
-                content_area.content = build_weather_tab()
-            elif index == 3:
-                content_area.content = build_contacts_tab()
-            elif index == 4:
-                content_area.content = build_settings_tab()
-            elif index == 5:
-                content_area.content = build_ar_tab()
-            elif index == 6:
-                content_area.content = build_about_tab()
-            
-            page.update()
+            content_area.content = tab_view(index)
+            ui.mark(content_area)
+            refresh_tab(index)
         
         # ============================================
         # TAB İÇERİKLERİ
@@ -717,61 +1095,55 @@ def main(page: ft.Page):
                 ft.Container(content=chat_list, expand=True),
             ], expand=True)
         
+        # Telefon bilgileri: kartlar bir kez kurulur, değerler bağlı metinlere yazılır
+        phone_values = {}
+        
         def build_phone_tab():
+            cards = [
+                ('battery', "Batarya", ft.icons.BATTERY_FULL, colors["success"], phone.get_battery_info),
+                ('storage', "Depolama", ft.icons.STORAGE, colors["primary"], phone.get_storage_info),
+                ('ram', "RAM", ft.icons.MEMORY, colors["accent"], phone.get_ram_info),
+                ('cpu', "İşlemci", ft.icons.SPEED, colors["warning"], phone.get_cpu_info),
+            ]
+            bindings = {}
+            controls = [
+                ft.Text("📱 TELEFON BİLGİLERİ", size=16, weight=ft.FontWeight.BOLD, color=colors["text"]),
+                ft.Divider(height=1, color=colors["primary"] + "40"),
+                ft.Container(height=10),
+            ]
+            
+            for i, (key, title, icon, icon_color, getter) in enumerate(cards):
+                value_text = ft.Text(
+                    phone_values.get(key, "⏳ Yükleniyor…").replace("**", ""),
+                    color=colors["text_secondary"], size=12,
+                )
+                bindings[key] = (value_text, getter)
+                controls.append(
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Row([ft.Icon(icon, color=icon_color), ft.Text(title, color=colors["text"], size=14)]),
+                            value_text,
+                        ]),
+                        bgcolor=colors["glass"],
+                        border_radius=15,
+                        padding=15,
+                        margin=ft.margin.only(bottom=10) if i < len(cards) - 1 else None,
+                        on_click=lambda _, key=key, title=title: show_detail_dialog(
+                            title, phone_values.get(key, "⏳ Yükleniyor…")),
+                    )
+                )
+            
+            def refresh_phone():
+                for key, (value_text, getter) in bindings.items():
+                    phone_values[key] = getter()
+                    value_text.value = phone_values[key].replace("**", "")
+                    ui.mark(value_text)
+            
+            tab_refreshers[1] = refresh_phone
+            
             return ft.Column([
                 ft.Container(
-                    content=ft.Column([
-                        ft.Text("📱 TELEFON BİLGİLERİ", size=16, weight=ft.FontWeight.BOLD, color=colors["text"]),
-                        ft.Divider(height=1, color=colors["primary"] + "40"),
-                        ft.Container(height=10),
-                        
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([ft.Icon(ft.icons.BATTERY_FULL, color=colors["success"]), ft.Text("Batarya", color=colors["text"], size=14)]),
-                                ft.Text(phone.get_battery_info().replace("**", ""), color=colors["text_secondary"], size=12),
-                            ]),
-                            bgcolor=colors["glass"],
-                            border_radius=15,
-                            padding=15,
-                            margin=ft.margin.only(bottom=10),
-                            on_click=lambda _: show_detail_dialog("Batarya", phone.get_battery_info()),
-                        ),
-                        
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([ft.Icon(ft.icons.STORAGE, color=colors["primary"]), ft.Text("Depolama", color=colors["text"], size=14)]),
-                                ft.Text(phone.get_storage_info().replace("**", ""), color=colors["text_secondary"], size=12),
-                            ]),
-                            bgcolor=colors["glass"],
-                            border_radius=15,
-                            padding=15,
-                            margin=ft.margin.only(bottom=10),
-                            on_click=lambda _: show_detail_dialog("Depolama", phone.get_storage_info()),
-                        ),
-                        
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([ft.Icon(ft.icons.MEMORY, color=colors["accent"]), ft.Text("RAM", color=colors["text"], size=14)]),
-                                ft.Text(phone.get_ram_info().replace("**", ""), color=colors["text_secondary"], size=12),
-                            ]),
-                            bgcolor=colors["glass"],
-                            border_radius=15,
-                            padding=15,
-                            margin=ft.margin.only(bottom=10),
-                            on_click=lambda _: show_detail_dialog("RAM", phone.get_ram_info()),
-                        ),
-                        
-                        ft.Container(
-                            content=ft.Column([
-                                ft.Row([ft.Icon(ft.icons.SPEED, color=colors["warning"]), ft.Text("İşlemci", color=colors["text"], size=14)]),
-                                ft.Text(phone.get_cpu_info().replace("**", ""), color=colors["text_secondary"], size=12),
-                            ]),
-                            bgcolor=colors["glass"],
-                            border_radius=15,
-                            padding=15,
-                            on_click=lambda _: show_detail_dialog("İşlemci", phone.get_cpu_info()),
-                        ),
-                    ]),
+                    content=ft.Column(controls),
                     padding=10,
                 )
             ], scroll=ft.ScrollMode.AUTO)
@@ -795,11 +1167,34 @@ def main(page: ft.Page):
                 padding=15,
             )
             
+            def show_weather(text, color=None):
+                weather_result.content = ft.Text(text, color=color or colors["text"])
+                ui.mark(weather_result)
+            
             def get_weather(e):
-                if city_input.value:
-                    result = weather_api.get_weather(city_input.value)
-                    weather_result.content = ft.Text(result, color=colors["text"])
-                    page.update()
+                city = city_input.value
+                if not city:
+                    return
+                
+                # Ağ isteği komut havuzunda; tıklama işleyicisi hemen döner
+                def run(handle):
+                    try:
+                        obs = weather_api.fetch_weather(city)
+                        result = render.plain(render.weather_markdown(obs) + weather_api.freshness_note(obs))
+                    except Exception as ex:
+                        result = weather_api.error_message(ex, city)
+                    handle.check()
+                    show_weather(result)
+                
+                # Yükleniyor yazısı önce: hızlı sonuç üzerine yazılmasın
+                show_weather("⏳ Hava durumu alınıyor...", colors["text_muted"])
+                handle = commands.submit(
+                    'weather', run,
+                    on_timeout=lambda h: show_weather("⏱️ Hava durumu servisi zaman aşımı"),
+                    on_error=lambda h, ex: show_weather(weather_api.error_message(ex, city))
+                )
+                if handle is None:
+                    show_weather("⏳ Çok fazla işlem sürüyor, biraz sonra tekrar deneyin.", colors["warning"])
             
             return ft.Column([
                 ft.Container(
@@ -838,11 +1233,15 @@ def main(page: ft.Page):
             
             contacts_list = ft.ListView(spacing=5, expand=True)
             
-            def refresh_contacts():
-                contacts_list.controls.clear()
+            def refresh_contacts(force: bool = False):
+                # Arama sonucu ekrandayken sekmeye dönmek listeyi silmesin
+                if search_input.value and not force:
+                    return
+                # Liste thread dışında kurulur, UI thread'inin gönderdiği listeye tek atamayla geçilir
+                rows = []
                 for c in contacts.get_all_contacts()[:10]:
                     fav = "⭐ " if c.get('favorite') else ""
-                    contacts_list.controls.append(
+                    rows.append(
                         ft.Container(
                             content=ft.Row([
                                 ft.Container(
@@ -868,15 +1267,26 @@ def main(page: ft.Page):
                             margin=ft.margin.only(bottom=5),
                         )
                     )
-                page.update()
+                contacts_list.controls = rows
+                ui.mark(contacts_list)
+            
+            def show_all_contacts():
+                search_input.value = ""
+                ui.mark(search_input)
+                # Tek işçili sekme havuzu: arama / tümü istekleri sırayla uygulanır
+                tab_loader.submit("contacts", lambda handle: refresh_contacts(force=True), supersede=True)
             
             def search_contacts(e):
-                if search_input.value:
-                    results = contacts.search_contacts(search_input.value)
-                    contacts_list.controls.clear()
+                query = search_input.value
+                if not query:
+                    return
+                
+                def run(handle):
+                    results = contacts.search_contacts(query)
+                    rows = []
                     for c in results:
                         fav = "⭐ " if c.get('favorite') else ""
-                        contacts_list.controls.append(
+                        rows.append(
                             ft.Container(
                                 content=ft.Row([
                                     ft.Container(
@@ -897,9 +1307,13 @@ def main(page: ft.Page):
                                 margin=ft.margin.only(bottom=5),
                             )
                         )
-                    page.update()
+                    handle.check()
+                    contacts_list.controls = rows
+                    ui.mark(contacts_list)
+                
+                tab_loader.submit("contacts", run, supersede=True)
             
-            refresh_contacts()
+            tab_refreshers[3] = refresh_contacts
             
             return ft.Column([
                 ft.Container(
@@ -919,7 +1333,7 @@ def main(page: ft.Page):
                             ft.Container(
                                 content=ft.Text("📋 Tümü", color=colors["text"]),
                                 bgcolor=colors["glass"], border_radius=15, padding=5,
-                                on_click=lambda _: refresh_contacts(),
+                                on_click=lambda _: show_all_contacts(),
                             ),
                             ft.Container(width=5),
                             ft.Container(
@@ -937,6 +1351,14 @@ def main(page: ft.Page):
             ], expand=True)
         
         def build_settings_tab():
+            reminders_text = ft.Text("⏳ Yükleniyor…", color=colors["text_secondary"], size=12)
+            
+            def refresh_settings():
+                reminders_text.value = reminders.list_reminders().replace("**", "")
+                ui.mark(reminders_text)
+            
+            tab_refreshers[4] = refresh_settings
+            
             return ft.Column([
                 ft.Container(
                     content=ft.Column([
@@ -969,7 +1391,7 @@ def main(page: ft.Page):
                         ft.Container(
                             content=ft.Column([
                                 ft.Row([ft.Icon(ft.icons.NOTIFICATIONS, color=colors["warning"]), ft.Text("Hatırlatıcılar", color=colors["text"], size=14)]),
-                                ft.Text(reminders.list_reminders().replace("**", ""), color=colors["text_secondary"], size=12),
+                                reminders_text,
                             ]),
                             bgcolor=colors["glass"], border_radius=15, padding=15, margin=ft.margin.only(bottom=10),
                         ),
@@ -1022,38 +1444,56 @@ def main(page: ft.Page):
                 result = ar_vision.start_camera()
                 camera_view.content = ft.Text("📷 Kamera aktif - AR çalışıyor", 
                                              color=colors["success"], weight=ft.FontWeight.BOLD)
-                page.update()
+                ui.mark(camera_view)
                 show_notification(result, "info")
             
             def stop_ar(e):
                 result = ar_vision.stop_camera()
                 camera_view.content = ft.Text("📷 Kamera görüntüsü burada olacak\n(AR aktif değil)", 
                                              color=colors["text_muted"], text_align=ft.TextAlign.CENTER)
-                page.update()
+                ui.mark(camera_view)
                 show_notification(result, "info")
             
-            def capture_and_scan(e):
+            def submit_photo(run):
+                """Kamera işi komut havuzunda ('camera' grubu: aynı anda tek çekim)"""
                 if not ar_vision.camera_active:
                     show_notification("❌ Önce kamerayı başlatın", "error")
-                    return
-                
-                result = ar_vision.take_photo()
-                if isinstance(result, dict):
-                    scan_result = ""
-                    if result.get('scan', {}).get('text'):
-                        scan_result = f"📝 {result['scan']['text'][:150]}"
-                    elif result.get('scan', {}).get('qr_codes'):
-                        qr = result['scan']['qr_codes'][0]['data']
-                        scan_result = f"📱 QR: {qr[:100]}"
-                    elif result.get('scan', {}).get('colors'):
-                        colors_list = [f"{c['name']}(%{c['percent']})" for c in result['scan']['colors'][:3]]
-                        scan_result = f"🎨 {', '.join(colors_list)}"
+                    return False
+                handle = commands.submit(
+                    'photo', run,
+                    on_timeout=lambda h: show_notification("⏱️ Fotoğraf çekimi zaman aşımına uğradı", "error"),
+                    on_error=lambda h, ex: show_notification(f"❌ Fotoğraf çekilemedi: {ex}", "error")
+                )
+                if handle is None:
+                    if commands.busy('photo'):
+                        show_notification("📷 Kamera meşgul, önceki işlem bitince tekrar deneyin.", "warning")
                     else:
-                        scan_result = "📸 Fotoğraf çekildi, ancak içerik bulunamadı"
-                    
-                    result_text.content = ft.Text(scan_result, color=colors["text"], size=12)
-                    show_notification("Fotoğraf çekildi ve tarandı", "success")
-                page.update()
+                        show_notification("⏳ Çok fazla işlem sürüyor, biraz sonra tekrar deneyin.", "warning")
+                    return False
+                return True
+            
+            def capture_and_scan(e):
+                def run(handle):
+                    result = ar_vision.take_photo()
+                    handle.check()
+                    if isinstance(result, dict):
+                        scan_result = ""
+                        if result.get('scan', {}).get('text'):
+                            scan_result = f"📝 {result['scan']['text'][:150]}"
+                        elif result.get('scan', {}).get('qr_codes'):
+                            qr = result['scan']['qr_codes'][0]['data']
+                            scan_result = f"📱 QR: {qr[:100]}"
+                        elif result.get('scan', {}).get('colors'):
+                            colors_list = [f"{c['name']}(%{c['percent']})" for c in result['scan']['colors'][:3]]
+                            scan_result = f"🎨 {', '.join(colors_list)}"
+                        else:
+                            scan_result = "📸 Fotoğraf çekildi, ancak içerik bulunamadı"
+                        
+                        result_text.content = ft.Text(scan_result, color=colors["text"], size=12)
+                        show_notification("Fotoğraf çekildi ve tarandı", "success")
+                    ui.mark(result_text)
+                
+                submit_photo(run)
             
             def change_mode(e):
                 mode = mode_dropdown.value
@@ -1061,17 +1501,17 @@ def main(page: ft.Page):
                 show_notification(result, "info")
             
             def quick_scan(e):
-                if not ar_vision.camera_active:
-                    show_notification("❌ Önce kamerayı başlatın", "error")
-                    return
+                def run(handle):
+                    result = ar_vision.take_photo()
+                    handle.check()
+                    if isinstance(result, dict) and result.get('scan', {}).get('text'):
+                        text = result['scan']['text'][:200]
+                        result_text.content = ft.Text(f"📝 {text}", color=colors["text"])
+                        voice.speak(f"Okunan metin: {text[:50]}")
+                    ui.mark(result_text)
                 
-                show_notification("📸 Fotoğraf çekiliyor...", "info")
-                result = ar_vision.take_photo()
-                if isinstance(result, dict) and result.get('scan', {}).get('text'):
-                    text = result['scan']['text'][:200]
-                    result_text.content = ft.Text(f"📝 {text}", color=colors["text"])
-                    voice.speak(f"Okunan metin: {text[:50]}")
-                page.update()
+                if submit_photo(run):
+                    show_notification("📸 Fotoğraf çekiliyor...", "info")
             
             return ft.Column([
                 ft.Container(
@@ -1365,7 +1805,7 @@ def main(page: ft.Page):
                 duration=2000,
             )
             page.snack_bar.open = True
-            page.update()
+            ui.mark_page()
         
         # ============================================
         # UI BİLEŞENLERİ
@@ -1490,8 +1930,18 @@ def main(page: ft.Page):
             bgcolor=colors["glass"], padding=8,
         )
         
+        tab_builders = {
+            0: build_chat_tab,
+            1: build_phone_tab,
+            2: build_weather_tab,
+            3: build_contacts_tab,
+            4: build_settings_tab,
+            5: build_ar_tab,
+            6: build_about_tab,
+        }
+        
         # İçerik alanı
-        content_area = ft.Container(content=build_chat_tab(), expand=True, padding=10)
+        content_area = ft.Container(content=tab_view(0), expand=True, padding=10)
         
         # Ana düzen
         page.add(
@@ -1510,10 +1960,15 @@ def main(page: ft.Page):
             ], expand=True)
         )
         
-        # Hoşgeldin mesajı
-        add_message("ANNA", f"Merhaba! Ben A.N.N.A Mobile. {ai_name} ile çalışıyorum.", is_user=False)
-        add_message("ANNA", "Sesli komut için 🎤 butonuna basın veya 'Jarvis' deyin", is_user=False)
-        add_message("ANNA", "Yeni özellik: AR sekmesinde kamera ile QR, yazı ve renkleri tarayın!", is_user=False)
+        # Önceki oturumun son mesajları (eskileri yukarı kaydırınca yüklenir)
+        with chat_lock:
+            show_latest()
+            update_older_btn()
+        
+        # Hoşgeldin mesajı (geçmişe yazılmaz)
+        add_message("ANNA", f"Merhaba! Ben A.N.N.A Mobile. {ai_name} ile çalışıyorum.", is_user=False, persist=False)
+        add_message("ANNA", "Sesli komut için 🎤 butonuna basın veya 'Jarvis' deyin", is_user=False, persist=False)
+        add_message("ANNA", "Yeni özellik: AR sekmesinde kamera ile QR, yazı ve renkleri tarayın!", is_user=False, persist=False)
     
     # ============================================
     # BAŞLANGIÇ
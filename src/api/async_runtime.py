@@ -0,0 +1,116 @@
+# src/api/async_runtime.py - ANDROID UYUMLU
+"""
+Ortak asyncio döngüsü
+- 🔁 Tüm async API istemcileri için tek arka plan döngüsü
+- 🧵 Senkron koddan çağırma (run_sync) ve bloklamadan gönderme (submit)
+- 🌐 Genel süre sınırlı eşzamanlı çağrılar (fan_out) - kısmi sonuç döner
+"""
+
+import time
+import asyncio
+import threading
+import inspect
+from concurrent.futures import TimeoutError as FutureTimeout
+
+_loop = None
+_loop_thread = None
+_loop_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Paylaşılan döngüyü döndür (ilk çağrıda başlatılır)"""
+    global _loop, _loop_thread
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(_loop)
+                _loop.call_soon(ready.set)
+                _loop.run_forever()
+
+            _loop_thread = threading.Thread(target=run, name="anna-async", daemon=True)
+            _loop_thread.start()
+            ready.wait()
+        return _loop
+
+
+def in_loop_thread() -> bool:
+    """Şu an paylaşılan döngünün thread'inde miyiz?"""
+    return _loop_thread is not None and threading.current_thread() is _loop_thread
+
+
+def submit(coro):
+    """Coroutine'i döngüye gönder -> concurrent.futures.Future (bloklamaz)"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+def run_sync(coro, timeout: float = None):
+    """Coroutine'i paylaşılan döngüde çalıştır ve sonucunu bekle"""
+    if in_loop_thread():
+        coro.close()
+        raise RuntimeError("run_sync döngü thread'inden çağrılamaz, await kullanın")
+    future = submit(coro)
+    try:
+        return future.result(timeout)
+    except FutureTimeout:
+        future.cancel()
+        raise
+
+
+class FanOutResult:
+    """fan_out sonucu: tamamlananlar, hatalar ve süresi dolanlar"""
+
+    __slots__ = ('results', 'errors', 'timed_out', 'elapsed')
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.timed_out = []
+        self.elapsed = 0.0
+
+    @property
+    def complete(self) -> bool:
+        return not self.errors and not self.timed_out
+
+    def get(self, name: str, default=None):
+        return self.results.get(name, default)
+
+
+async def _call(call):
+    """Coroutine'i bekle; senkron fonksiyonu thread havuzunda çalıştır"""
+    if inspect.isawaitable(call):
+        return await call
+    return await asyncio.get_running_loop().run_in_executor(None, call)
+
+
+async def fan_out(calls: dict, deadline: float) -> FanOutResult:
+    """
+    Bağımsız çağrıları eşzamanlı çalıştır.
+    calls: {ad: coroutine veya argümansız fonksiyon}
+    deadline: toplam süre sınırı (saniye); bitmeyenler iptal edilir
+    """
+    started = time.monotonic()
+    result = FanOutResult()
+    tasks = {asyncio.ensure_future(_call(call)): name for name, call in calls.items()}
+
+    if tasks:
+        done, pending = await asyncio.wait(tasks, timeout=deadline)
+        for task in pending:
+            task.cancel()
+            result.timed_out.append(tasks[task])
+        for task in done:
+            name = tasks[task]
+            if task.exception() is not None:
+                result.errors[name] = task.exception()
+            else:
+                result.results[name] = task.result()
+
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def fan_out_sync(calls: dict, deadline: float) -> FanOutResult:
+    """fan_out'un senkron sarmalayıcısı"""
+    return run_sync(fan_out(calls, deadline), timeout=deadline + 1.0)
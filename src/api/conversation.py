@@ -0,0 +1,240 @@
+# src/api/conversation.py - ANDROID UYUMLU
+"""
+Sohbet hafızası (kullanıcı başına)
+- 🧮 Yaklaşık token sayacı
+- 📏 Token bütçesi aşılınca eski turlar özetlenir (özetleyici yoksa budanır)
+- 💾 Yeniden başlatmalar arasında kalıcı
+- 🔁 Sürüm sayacı: sağlayıcı tarafı sohbet oturumları ne zaman yenilenecek bilir
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# Android tespiti
+IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
+
+# Takip sorusu işaretleri (önceki cevaba bağlı, önbellekten cevaplanamaz)
+FOLLOW_UP_MARKERS = ('peki', 'ya ', 'bunu', 'bunun', 'buna', 'onu', 'onun', 'ona', 'şunu',
+                     'onlar', 'devam', 'daha fazla', 'başka', 'neden', 'niye', 'ayrıca',
+                     'o zaman', 'öyleyse', 'açıkla', 'örnek ver')
+
+SUMMARY_PROMPT = ("Aşağıdaki konuşmayı, sonraki sorular için gereken bilgileri koruyarak "
+                  "en fazla 5 kısa cümleyle Türkçe özetle:\n\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Yaklaşık token sayısı.
+    Türkçe eklemeli olduğundan kelimeler birden çok token'a bölünür;
+    karakter ve kelime tahminlerinin büyüğü alınır.
+    """
+    if not text:
+        return 0
+    words = len(text.split())
+    symbols = len(re.findall(r"[^\w\s]", text))
+    return max(int(len(text) / 3.5), int(words * 1.6)) + symbols // 2 + 1
+
+
+def is_follow_up(prompt: str) -> bool:
+    """Soru önceki konuşmaya mı dayanıyor?"""
+    lowered = " " + prompt.lower().strip() + " "
+    if len(lowered.split()) <= 2:
+        return True
+    return any(f" {marker}" in lowered for marker in FOLLOW_UP_MARKERS)
+
+
+def default_conversation_dir() -> Path:
+    if IS_ANDROID:
+        return Path("/storage/emulated/0/ANNA/data/conversations")
+    return Path("data/conversations")
+
+
+class ConversationMemory:
+    """
+    Tek kullanıcının sohbet geçmişi.
+    turns: [{'role': 'user'|'assistant', 'content': str, 'tokens': int}]
+    summary: bütçeye sığmayan eski turların özeti
+    """
+
+    def __init__(self, user_id: str = "default", budget_tokens: int = 1500,
+                 keep_recent: int = 4, idle_reset: float = 6 * 3600, path: Path = None):
+        self.user_id = user_id
+        self.budget_tokens = budget_tokens
+        # Özetlenmeden korunacak son tur sayısı
+        self.keep_recent = keep_recent
+        # Bu kadar süre sessizlikten sonra yeni konu sayılır
+        self.idle_reset = idle_reset
+        # Kullanıcı adı dosya adına güvenli karakterlerle girer
+        safe_id = re.sub(r"[^\w.-]", "_", user_id) or "default"
+        self.path = Path(path or default_conversation_dir() / f"{safe_id}.json")
+
+        self.turns = []
+        self.summary = ""
+        self.version = 0
+        self.updated_at = 0.0
+        self._lock = threading.Lock()
+        # Thread havuzundaki kayıtlar aynı geçici dosyaya sırayla yazar
+        self._save_lock = threading.Lock()
+        self._compacting = False
+        self.metrics = {'summaries': 0, 'prunes': 0, 'discarded': 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # ============================================
+    # OKUMA
+    # ============================================
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(t['tokens'] for t in self.turns)
+
+    def history(self) -> list:
+        """Sağlayıcıya gönderilecek geçmiş (özet + turlar)"""
+        with self._lock:
+            if self.updated_at and time.time() - self.updated_at > self.idle_reset:
+                self._reset()
+            return [{'role': t['role'], 'content': t['content']} for t in self.turns]
+
+    def summary_text(self) -> str:
+        return self.summary
+
+    def is_empty(self) -> bool:
+        return not self.turns and not self.summary
+
+    # ============================================
+    # YAZMA
+    # ============================================
+
+    def add_exchange(self, prompt: str, answer: str):
+        """Soru + cevap turunu ekle"""
+        with self._lock:
+            for role, content in (('user', prompt), ('assistant', answer)):
+                self.turns.append({'role': role, 'content': content, 'tokens': estimate_tokens(content)})
+            self.updated_at = time.time()
+        self.save_async()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+        self.save_async()
+
+    def _reset(self):
+        self.turns = []
+        self.summary = ""
+        self.version += 1
+        self.updated_at = 0.0
+
+    def needs_compaction(self) -> bool:
+        return self.tokens > self.budget_tokens and len(self.turns) > self.keep_recent
+
+    async def acompact(self, summarizer=None):
+        """
+        Bütçe aşıldıysa eski turları özetle.
+        summarizer: async fn(metin) -> özet; yoksa / hata verirse budanır.
+        """
+        if self._compacting or not self.needs_compaction():
+            return
+        self._compacting = True
+        try:
+            with self._lock:
+                cut = len(self.turns) - self.keep_recent
+                old = self.turns[:cut]
+                version = self.version
+
+            transcript = "\n".join(
+                f"{'Kullanıcı' if t['role'] == 'user' else 'A.N.N.A'}: {t['content']}" for t in old
+            )
+            if self.summary:
+                transcript = f"Önceki özet: {self.summary}\n{transcript}"
+
+            summary = None
+            if summarizer is not None:
+                try:
+                    summary = (await summarizer(SUMMARY_PROMPT + transcript)).strip()
+                except Exception as e:
+                    print(f"⚠️ Sohbet özeti çıkarılamadı: {e}")
+                if summary and (summary.startswith("❌") or estimate_tokens(summary) > self.budget_tokens // 3):
+                    summary = None
+
+            with self._lock:
+                if self.version != version:
+                    # Özetleme sürerken sohbet sıfırlandı ('yeni sohbet' / uzun sessizlik):
+                    # eski konuşmanın özeti geri getirilmez, yeni turlar kesilmez
+                    self.metrics['discarded'] += 1
+                    return
+                if summary:
+                    self.metrics['summaries'] += 1
+                else:
+                    summary = self._prune_summary(old)
+                    self.metrics['prunes'] += 1
+                # Özetleme sırasında eklenen turlar korunur
+                self.turns = self.turns[cut:]
+                self.summary = summary
+                self.version += 1
+            self.save_async()
+            print(f"🧠 Sohbet hafızası sıkıştırıldı (~{self.tokens} token)")
+        finally:
+            self._compacting = False
+
+    def _prune_summary(self, old: list) -> str:
+        """Özetleyici yoksa: her kullanıcı sorusunun ilk cümlesini tut"""
+        points = [self.summary] if self.summary else []
+        for turn in old:
+            if turn['role'] == 'user':
+                points.append(re.split(r"(?<=[.!?])\s", turn['content'].strip())[0][:120])
+        text = " | ".join(p for p in points if p)
+        # Özet bütçenin üçte birini geçmesin (en eskiler atılır)
+        limit = self.budget_tokens // 3
+        while estimate_tokens(text) > limit and " | " in text:
+            text = text.split(" | ", 1)[1]
+        return text
+
+    # ============================================
+    # KALICILIK
+    # ============================================
+
+    def _load(self):
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.turns = data.get('turns', [])
+                self.summary = data.get('summary', "")
+                self.updated_at = data.get('updated_at', 0.0)
+        except:
+            self.turns = []
+            self.summary = ""
+
+    def save(self):
+        """Diske atomik olarak yaz (eşzamanlı çağrılar sırayla, en güncel durumu yazar)"""
+        with self._save_lock:
+            with self._lock:
+                data = {'user_id': self.user_id, 'summary': self.summary,
+                        'turns': list(self.turns), 'updated_at': self.updated_at}
+            tmp_path = self.path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"⚠️ Sohbet hafızası kaydedilemedi: {e}")
+
+    def save_async(self):
+        """Döngü içindeysek thread havuzunda, değilse doğrudan kaydet"""
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self.save)
+        except RuntimeError:
+            self.save()
+
+    def get_stats(self) -> dict:
+        stats = dict(self.metrics)
+        stats.update({'turns': len(self.turns), 'tokens': self.tokens,
+                      'budget': self.budget_tokens, 'has_summary': bool(self.summary)})
+        return stats
@@ -1,13 +1,22 @@
 # src/api/gemini.py - ANDROID UYUMLU
 """
 Google Gemini API - A.N.N.A Mobile için
+- ⚡ generate_content_async ile async çekirdek (paylaşılan döngüde)
+- 🧵 ask() senkron sarmalayıcı
+- 🌊 astream()/stream() ile parça parça cevap (stream=True)
+- 🧠 Sohbet hafızası: her istek hafızadan kurulan kendi chat oturumuyla (start_chat) gider
+- 📋 Model kataloğu: açılışta bilinen sağlam modelle başlar
 """
 
 import os
 import sys
+import asyncio
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+from src.api.async_runtime import run_sync
+from src.api.streaming import stream_sync
+
 # Android tespiti
 IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
 
@@ -23,16 +32,25 @@ else:
 class GeminiAI:
     """Gemini API - Otomatik Model Seçimli"""
     
-    def __init__(self):
+    name = "gemini"
+    
+    # Ana model çalışmazsa sırayla denenenler
+    ALTERNATIVE_MODELS = ['gemini-pro', 'gemini-1.0-pro']
+    
+    def __init__(self, catalog=None):
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.model_name = 'gemini-1.5-flash'
         self.model = None
-        self.chat_session = None
+        self._models = {}
+        self.catalog = catalog
         self.available = False
+        self.last_stream = None
         
         if self.api_key:
             try:
                 genai.configure(api_key=self.api_key)
+                # Diskteki katalogdan: kaldırılmış model hiç denenmez
+                self.model_name = self.models()[0]
                 self.model = genai.GenerativeModel(self.model_name)
                 self.available = True
                 print(f"✅ Gemini AI hazır (Model: {self.model_name})")
@@ -43,13 +61,117 @@ class GeminiAI:
         else:
             print("⚠️ GEMINI_API_KEY bulunamadı")
 
-    def ask(self, prompt: str) -> str:
+    def ask(self, prompt: str, memory=None) -> str:
         """Soru sor (senkron)"""
+        return run_sync(self.aask(prompt, memory))
+    
+    def stream(self, prompt: str, on_text=None, on_sentence=None, memory=None):
+        """Akışlı soru (senkron) -> StreamResult"""
+        result = stream_sync(self.astream(prompt, memory), on_text, on_sentence)
+        self.last_stream = result
+        print(f"🤖 Gemini {result.summary()}")
+        return result
+    
+    def models(self) -> list:
+        """Denenebilecek modeller (tercih sırasıyla, katalogda kullanılabilir olanlar)"""
+        preferred = [self.model_name] + [m for m in self.ALTERNATIVE_MODELS if m != self.model_name]
+        if self.catalog is None:
+            return preferred
+        return self.catalog.usable(self.name, preferred)
+    
+    async def alist_models(self) -> list:
+        """Metin üretebilen modeller (list_models senkron; thread havuzunda)"""
+        def fetch():
+            return [m.name.split('/', 1)[-1] for m in genai.list_models()
+                    if 'generateContent' in m.supported_generation_methods]
+        return await asyncio.get_running_loop().run_in_executor(None, fetch)
+    
+    def _switch_model(self, model_name: str):
+        """Aktif modeli değiştir (örnek önbellekten)"""
+        self.model = self._model_for(model_name)
+        self.model_name = model_name
+    
+    def _model_for(self, model_name: str = None):
+        """İsimden GenerativeModel (örnekler önbelleklenir)"""
+        if not model_name or model_name == self.model_name:
+            return self.model
+        model = self._models.get(model_name)
+        if model is None:
+            model = genai.GenerativeModel(model_name)
+            self._models[model_name] = model
+        return model
+    
+    @staticmethod
+    def _history_for(memory) -> list:
+        """ConversationMemory -> Gemini içerik listesi (özet baştaki çift olarak)"""
+        contents = []
+        if memory.summary:
+            contents.append({'role': 'user', 'parts': [f"Önceki konuşmanın özeti: {memory.summary}"]})
+            contents.append({'role': 'model', 'parts': ["Tamam, hatırlıyorum."]})
+        for turn in memory.history():
+            role = 'user' if turn['role'] == 'user' else 'model'
+            contents.append({'role': role, 'parts': [turn['content']]})
+        return contents
+    
+    def _chat_for(self, model_name: str, memory):
+        """
+        Hafızadan yeni chat oturumu.
+        Oturumlar paylaşılmaz: yedek (hedged) istekler ve yerine geçen sorular
+        aynı anda akabilir, ortak oturumun geçmişi birbirine karışırdı.
+        """
+        return self._model_for(model_name).start_chat(history=self._history_for(memory))
+    
+    async def astream_raw(self, prompt: str, model: str = None, memory=None):
+        """Tek modelden akış; hatalar yükseltilir (yönlendirici için)"""
+        if memory is not None:
+            chat = self._chat_for(model, memory)
+            response = await chat.send_message_async(prompt, stream=True)
+        else:
+            response = await self._model_for(model).generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Güvenlik filtresi vb. nedeniyle metinsiz parça
+                continue
+            if text:
+                yield text
+    
+    async def astream(self, prompt: str, memory=None):
+        """Cevabı parça parça üret (async üreteç)"""
+        if not self.available:
+            yield "Gemini API anahtarı eksik veya süresi dolmuş."
+            return
+        
+        started = False
+        try:
+            async for text in self.astream_raw(prompt, memory=memory):
+                started = True
+                yield text
+        except Exception as e:
+            if started:
+                # Yarıda kesildi; gelen kısım kullanıcıda kalsın
+                print(f"⚠️ Gemini akışı kesildi: {e}")
+                return
+            # Hiç parça gelmediyse akışsız yolun hata yönetimine düş
+            yield await self.aask(prompt, memory)
+    
+    async def _agenerate(self, prompt: str, model_name: str = None, memory=None):
+        """Akışsız tek cevap; hafıza varsa ondan kurulan chat oturumuyla"""
+        if memory is not None:
+            return await self._chat_for(model_name, memory).send_message_async(prompt)
+        return await self._model_for(model_name).generate_content_async(prompt)
+    
+    async def aask(self, prompt: str, memory=None) -> str:
+        """Soru sor (async); memory verilirse geçmiş turlar da gönderilir"""
         if not self.available:
             return "Gemini API anahtarı eksik veya süresi dolmuş."
         
+        if self.catalog is not None and self.models()[0] != self.model_name:
+            self._switch_model(self.models()[0])
+        
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._agenerate(prompt, memory=memory)
             return response.text
         except Exception as e:
             error_str = str(e)
@@ -60,7 +182,9 @@ class GeminiAI:
             
             # 404 hatası - model bulunamadı
             if "404" in error_str or "not found" in error_str.lower():
-                return self._try_alternative_model(prompt)
+                if self.catalog is not None:
+                    self.catalog.mark_deprecated(self.name, self.model_name)
+                return await self._try_alternative_model(prompt, memory)
             
             # Network hatası
             if "connection" in error_str.lower() or "timeout" in error_str.lower():
@@ -68,20 +192,20 @@ class GeminiAI:
             
             return f"❌ Gemini hatası: {error_str[:100]}"
     
-    def _try_alternative_model(self, prompt: str) -> str:
-        """Alternatif Gemini modellerini dene"""
-        alternative_models = ['gemini-pro', 'gemini-1.0-pro']
-        
-        for model_name in alternative_models:
+    async def _try_alternative_model(self, prompt: str, memory=None) -> str:
+        """Alternatif Gemini modellerini dene (katalogda kaldırılmış olanlar atlanır)"""
+        for model_name in self.models():
+            if model_name == self.model_name:
+                continue
             try:
                 print(f"🔄 Alternatif Gemini modeli deneniyor: {model_name}")
-                model = genai.GenerativeModel(model_name)
-                response = model.generate_content(prompt)
-                self.model = model
-                self.model_name = model_name
+                response = await self._agenerate(prompt, model_name, memory)
+                self._switch_model(model_name)
                 print(f"✅ Yeni Gemini model aktif: {model_name}")
                 return response.text
-            except:
+            except Exception as e:
+                if self.catalog is not None and ("404" in str(e) or "not found" in str(e).lower()):
+                    self.catalog.mark_deprecated(self.name, model_name)
                 continue
         
         return "❌ Hiçbir Gemini modeli çalışmadı."
\ No newline at end of file
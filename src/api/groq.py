@@ -1,13 +1,22 @@
 # src/api/groq.py - ANDROID UYUMLU
 """
 Groq API ile ultra hızlı yapay zeka
+- ⚡ AsyncGroq ile async çekirdek (paylaşılan döngüde)
+- 🧵 ask() senkron sarmalayıcı
+- 🌊 astream()/stream() ile parça parça cevap (stream=True)
+- 🧠 Sohbet hafızası: özet + son turlar mesaj listesine eklenir
+- 📋 Model kataloğu: açılışta bilinen sağlam modelle başlar
 """
 
 import os
 import sys
-from groq import Groq
+from groq import AsyncGroq
 from dotenv import load_dotenv
 
+from src.api.async_runtime import run_sync
+from src.api.streaming import stream_sync
+from src.api.prompts import SYSTEM_PROMPT
+
 # Android tespiti
 IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
 
@@ -22,16 +31,29 @@ else:
 class GroqAI:
     """Groq API ile ultra hızlı yapay zeka"""
     
-    def __init__(self):
+    name = "groq"
+    
+    # Ana model çalışmazsa sırayla denenenler
+    ALTERNATIVE_MODELS = [
+        "llama-3.1-8b-instant",
+        "mixtral-8x7b-32768",
+        "gemma2-9b-it"
+    ]
+    
+    def __init__(self, catalog=None):
         self.api_key = os.getenv("GROQ_API_KEY")
         self.client = None
         self.available = False
         self.current_model = "llama-3.3-70b-versatile"
+        self.catalog = catalog
+        self.last_stream = None
         
         if self.api_key:
             try:
-                self.client = Groq(api_key=self.api_key)
+                self.client = AsyncGroq(api_key=self.api_key)
                 self.available = True
+                # Diskteki katalogdan: kaldırılmış model hiç denenmez
+                self.current_model = self.models()[0]
                 print(f"✅ Groq AI hazır (Model: {self.current_model})")
                 print(f"📱 Android: {'✅' if IS_ANDROID else '❌'}")
             except Exception as e:
@@ -40,21 +62,89 @@ class GroqAI:
         else:
             print("⚠️ GROQ_API_KEY bulunamadı")
     
-    def ask(self, prompt: str) -> str:
+    def ask(self, prompt: str, memory=None) -> str:
         """Soru sor (senkron)"""
+        return run_sync(self.aask(prompt, memory))
+    
+    def stream(self, prompt: str, on_text=None, on_sentence=None, memory=None):
+        """Akışlı soru (senkron) -> StreamResult"""
+        result = stream_sync(self.astream(prompt, memory), on_text, on_sentence)
+        self.last_stream = result
+        print(f"🤖 Groq {result.summary()}")
+        return result
+    
+    def models(self) -> list:
+        """Denenebilecek modeller (tercih sırasıyla, katalogda kullanılabilir olanlar)"""
+        preferred = [self.current_model] + [m for m in self.ALTERNATIVE_MODELS if m != self.current_model]
+        if self.catalog is None:
+            return preferred
+        return self.catalog.usable(self.name, preferred)
+    
+    async def alist_models(self) -> list:
+        """Sağlayıcıdaki aktif modeller (models.list)"""
+        response = await self.client.models.list()
+        return [m.id for m in response.data if getattr(m, 'active', True)]
+    
+    @staticmethod
+    def _messages(prompt: str, memory=None) -> list:
+        """Sistem mesajı (+ özet) + geçmiş turlar + yeni soru"""
+        system = SYSTEM_PROMPT
+        history = []
+        if memory is not None:
+            history = memory.history()
+            if memory.summary:
+                system += f"\n\nÖnceki konuşmanın özeti: {memory.summary}"
+        return [{"role": "system", "content": system}] + history + [{"role": "user", "content": prompt}]
+    
+    async def astream_raw(self, prompt: str, model: str = None, memory=None):
+        """
+        Tek modelden akış; hatalar yükseltilir (yönlendirici için).
+        Groq'ta sunucu tarafı oturum yok; geçmiş her istekte gönderilir
+        ama ConversationMemory bütçesiyle sınırlı kalır.
+        """
+        stream = await self.client.chat.completions.create(
+            model=model or self.current_model,
+            messages=self._messages(prompt, memory),
+            temperature=0.6,
+            max_tokens=1024,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    
+    async def astream(self, prompt: str, memory=None):
+        """Cevabı parça parça üret (async üreteç)"""
+        if not self.available or not self.client:
+            yield "Groq API hazır değil."
+            return
+        
+        started = False
+        try:
+            async for delta in self.astream_raw(prompt, memory=memory):
+                started = True
+                yield delta
+        except Exception as e:
+            if started:
+                # Yarıda kesildi; gelen kısım kullanıcıda kalsın
+                print(f"⚠️ Groq akışı kesildi: {e}")
+                return
+            # Hiç parça gelmediyse akışsız yolun hata yönetimine düş
+            yield await self.aask(prompt, memory)
+    
+    async def aask(self, prompt: str, memory=None) -> str:
+        """Soru sor (async); memory verilirse geçmiş turlar da gönderilir"""
         if not self.available or not self.client:
             return "Groq API hazır değil."
         
+        self.current_model = self.models()[0]
         try:
-            completion = self.client.chat.completions.create(
+            completion = await self.client.chat.completions.create(
                 model=self.current_model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "Sen A.N.N.A'sın. Yardımsever, zeki ve karizmatik bir asistansın. Cevapların kısa ve öz olsun."
-                    },
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._messages(prompt, memory),
                 temperature=0.6,
                 max_tokens=1024
             )
@@ -64,7 +154,9 @@ class GroqAI:
             
             # Hata durumunda alternatif model dene
             if "decommissioned" in error_str or "deprecated" in error_str:
-                return self._try_alternative_model(prompt)
+                if self.catalog is not None:
+                    self.catalog.mark_deprecated(self.name, self.current_model)
+                return await self._try_alternative_model(prompt, memory)
             
             # Network hatası
             if "connection" in error_str.lower() or "timeout" in error_str.lower():
@@ -72,30 +164,25 @@ class GroqAI:
             
             return f"❌ Groq hatası: {error_str[:100]}"
     
-    def _try_alternative_model(self, prompt: str) -> str:
-        """Alternatif modelleri dene"""
-        alternative_models = [
-            "llama-3.1-8b-instant",
-            "mixtral-8x7b-32768",
-            "gemma2-9b-it"
-        ]
-        
-        for model in alternative_models:
+    async def _try_alternative_model(self, prompt: str, memory=None) -> str:
+        """Alternatif modelleri dene (katalogda kaldırılmış olanlar atlanır)"""
+        for model in self.models():
+            if model == self.current_model:
+                continue
             try:
                 print(f"🔄 Alternatif model deneniyor: {model}")
-                completion = self.client.chat.completions.create(
+                completion = await self.client.chat.completions.create(
                     model=model,
-                    messages=[
-                        {"role": "system", "content": "Sen A.N.N.A'sın, yardımsever bir asistansın."},
-                        {"role": "user", "content": prompt}
-                    ],
+                    messages=self._messages(prompt, memory),
                     temperature=0.6,
                     max_tokens=1024
                 )
                 self.current_model = model
                 print(f"✅ Yeni model aktif: {model}")
                 return completion.choices[0].message.content
-            except:
+            except Exception as e:
+                if self.catalog is not None and ("decommissioned" in str(e) or "deprecated" in str(e)):
+                    self.catalog.mark_deprecated(self.name, model)
                 continue
         
         return "❌ Tüm Groq modelleri denendi ama hiçbiri çalışmadı."
\ No newline at end of file
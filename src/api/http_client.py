@@ -0,0 +1,294 @@
+# src/api/http_client.py - ANDROID UYUMLU
+"""
+Ortak HTTP istemcisi - WeatherAPI ve NewsAPI için
+- 🔌 Keep-alive bağlantı havuzu (her istekte yeni TCP/TLS yok)
+- 🔁 Sınırlı tekrar deneme + jitter'lı geri çekilme
+- 🚦 Sunucu başına eşzamanlılık sınırı
+- ⏱️ Ayrı bağlanma / okuma zaman aşımları
+- 📊 Uç nokta başına gecikme histogramı
+- ⚡ Aynı politikalarla asyncio istemcisi (AsyncHttpClient)
+"""
+
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Async HTTP (groq paketiyle birlikte gelir)
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except:
+    HTTPX_AVAILABLE = False
+
+# Gecikme histogramı kova sınırları (ms)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+
+# Tekrar denenebilir HTTP durumları
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class LatencyHistogram:
+    """Tek bir uç nokta için gecikme dağılımı"""
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS_MS)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.errors = 0
+
+    def record(self, latency_ms: float, error: bool = False):
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                self.counts[i] += 1
+                break
+        self.total += 1
+        self.sum_ms += latency_ms
+        if error:
+            self.errors += 1
+
+    def percentile(self, p: float) -> float:
+        """Yaklaşık yüzdelik (kova üst sınırı)"""
+        if not self.total:
+            return 0.0
+        target = self.total * p
+        seen = 0
+        for count, bound in zip(self.counts, LATENCY_BUCKETS_MS):
+            seen += count
+            if seen >= target:
+                return bound
+        return LATENCY_BUCKETS_MS[-1]
+
+    def summary(self) -> dict:
+        return {
+            'count': self.total,
+            'errors': self.errors,
+            'avg_ms': self.sum_ms / self.total if self.total else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'buckets': dict(zip([str(b) for b in LATENCY_BUCKETS_MS], self.counts))
+        }
+
+
+class HttpClient:
+    """
+    requests.Session üzerine ince katman.
+    get() başarısız olursa requests istisnalarını aynen yükseltir;
+    böylece API sınıflarındaki mevcut hata yönetimi değişmez.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10.0,
+                 max_retries: int = 2, backoff_base: float = 0.3, backoff_max: float = 4.0,
+                 per_host_limit: int = 4, pool_size: int = 10):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.per_host_limit = per_host_limit
+
+        self.session = requests.Session()
+        # Tekrar denemeyi kendimiz yapıyoruz (jitter + istatistik için)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._host_limits = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            sem = self._host_limits.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_limits[host] = sem
+            return sem
+
+    def _histogram(self, endpoint: str) -> LatencyHistogram:
+        with self._lock:
+            hist = self._histograms.get(endpoint)
+            if hist is None:
+                hist = LatencyHistogram()
+                self._histograms[endpoint] = hist
+            return hist
+
+    def _backoff(self, attempt: int, retry_after: str = None) -> float:
+        """Tam jitter'lı üstel geri çekilme"""
+        if retry_after:
+            try:
+                return min(self.backoff_max, float(retry_after))
+            except ValueError:
+                pass
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    def get(self, url: str, params: dict = None, headers: dict = None,
+            timeout=None) -> requests.Response:
+        """GET isteği (havuzlu, tekrar denemeli, ölçümlü)"""
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+        timeout = timeout or (self.connect_timeout, self.read_timeout)
+        hist = self._histogram(endpoint)
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                with self._host_semaphore(parts.netloc):
+                    response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                hist.record((time.perf_counter() - started) * 1000, error=True)
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            hist.record((time.perf_counter() - started) * 1000,
+                        error=response.status_code >= 500)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+                attempt += 1
+                continue
+
+            return response
+
+    def get_stats(self) -> dict:
+        """Uç nokta başına gecikme özeti"""
+        with self._lock:
+            items = list(self._histograms.items())
+        return {endpoint: hist.summary() for endpoint, hist in items}
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHttpClient:
+    """
+    HttpClient'ın asyncio karşılığı (paylaşılan döngüde kullanılır).
+    httpx yoksa senkron HttpClient thread havuzunda çalıştırılır.
+    Hatalar requests istisnalarına çevrilir; böylece API sınıflarındaki
+    hata yönetimi iki yolda da aynıdır.
+    """
+
+    def __init__(self, sync_client: HttpClient = None, connect_timeout: float = 3.05,
+                 read_timeout: float = 10.0, max_retries: int = 2, per_host_limit: int = 4,
+                 pool_size: int = 10):
+        self.sync_client = sync_client or get_http_client()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.per_host_limit = per_host_limit
+        self.pool_size = pool_size
+
+        self._client = None
+        self._host_limits = {}
+        self._histograms = {}
+
+    def _get_client(self):
+        """httpx istemcisi (döngü içinde tembel oluşturulur)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.pool_size,
+                                    max_keepalive_connections=self.pool_size)
+            )
+        return self._client
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._host_limits.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_host_limit)
+            self._host_limits[host] = sem
+        return sem
+
+    def _histogram(self, endpoint: str) -> LatencyHistogram:
+        hist = self._histograms.get(endpoint)
+        if hist is None:
+            hist = LatencyHistogram()
+            self._histograms[endpoint] = hist
+        return hist
+
+    async def get(self, url: str, params: dict = None, headers: dict = None):
+        """GET isteği (havuzlu, tekrar denemeli, ölçümlü)"""
+        if not HTTPX_AVAILABLE:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, lambda: self.sync_client.get(url, params=params, headers=headers)
+            )
+
+        parts = urlsplit(url)
+        endpoint = f"{parts.netloc}{parts.path}"
+        hist = self._histogram(endpoint)
+        client = self._get_client()
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                async with self._host_semaphore(parts.netloc):
+                    response = await client.get(url, params=params, headers=headers)
+            except httpx.TimeoutException as e:
+                hist.record((time.perf_counter() - started) * 1000, error=True)
+                if attempt >= self.max_retries:
+                    raise requests.exceptions.Timeout(str(e))
+                await asyncio.sleep(self.sync_client._backoff(attempt))
+                attempt += 1
+                continue
+            except httpx.TransportError as e:
+                hist.record((time.perf_counter() - started) * 1000, error=True)
+                if attempt >= self.max_retries:
+                    raise requests.exceptions.ConnectionError(str(e))
+                await asyncio.sleep(self.sync_client._backoff(attempt))
+                attempt += 1
+                continue
+
+            hist.record((time.perf_counter() - started) * 1000,
+                        error=response.status_code >= 500)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(self.sync_client._backoff(attempt, response.headers.get('Retry-After')))
+                attempt += 1
+                continue
+
+            return response
+
+    def get_stats(self) -> dict:
+        """Uç nokta başına gecikme özeti"""
+        return {endpoint: hist.summary() for endpoint, hist in list(self._histograms.items())}
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Uygulama genelinde tek istemci (bağlantılar API'ler arasında paylaşılır)
+_shared_client = None
+_shared_async_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Ortak HttpClient örneği"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
+
+
+def get_async_http_client() -> AsyncHttpClient:
+    """Ortak AsyncHttpClient örneği"""
+    global _shared_async_client
+    client = get_http_client()
+    with _shared_lock:
+        if _shared_async_client is None:
+            _shared_async_client = AsyncHttpClient(client)
+        return _shared_async_client
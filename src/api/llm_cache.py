@@ -0,0 +1,357 @@
+# src/api/llm_cache.py - ANDROID UYUMLU
+"""
+LLM cevap önbelleği
+- 🎯 Tam eşleşme: normalize soru + model + sistem mesajı
+- 🧬 Yakın tekrarlar: karakter üçlüsü MinHash + LSH bantları, Jaccard ile doğrulama
+- 🔢 Yakın eşleşmede sayılar birebir, içerik kelimeleri en fazla küçük yazım farkıyla aynı olmalı
+- ⏳ TTL, 🧠 LRU bellek sınırı, 💾 kalıcı SQLite deposu
+- 🧵 aget / aput: SQLite işleri olay döngüsü yerine thread havuzunda
+"""
+
+import re
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from src.api.response_cache import default_cache_dir
+
+# Zamana bağlı sorular önbelleklenmez
+VOLATILE_WORDS = ('bugün', 'şimdi', 'şu an', 'saat kaç', 'yarın', 'dün', 'bu hafta', 'son dakika')
+
+# MinHash: 32 imza = 8 bant x 4 satır (Jaccard 0.8'de ~%98 aday yakalama)
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_PERMS = [
+    (int.from_bytes(hashlib.blake2b(f"a{i}".encode(), digest_size=8).digest(), 'big') % _PRIME | 1,
+     int.from_bytes(hashlib.blake2b(f"b{i}".encode(), digest_size=8).digest(), 'big') % _PRIME)
+    for i in range(NUM_PERM)
+]
+
+# Bu kadar isabet birikince last_used / hits tek işlemde yazılır
+TOUCH_BATCH = 32
+
+# Yakın eşleşmede farkı önemsenmeyen dolgu kelimeleri
+FILLER_WORDS = frozenset({'acaba', 'lütfen', 'bana', 'bir', 'mi', 'mı', 'mu', 'mü', 'ya', 'peki'})
+
+_NUMBER = re.compile(r"\d+")
+
+# Şapkalı harfler sadeleştirilir (zekâ -> zeka); Türkçe harfler korunur
+_FOLD = str.maketrans({'â': 'a', 'î': 'i', 'û': 'u'})
+
+
+def normalize_prompt(text: str) -> str:
+    """Türkçe küçük harf, noktalama ve fazla boşluk temizliği"""
+    text = unicodedata.normalize('NFC', text)
+    text = text.replace('İ', 'i').replace('I', 'ı').lower().translate(_FOLD)
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """Karakter üçlüleri"""
+    padded = f" {text} "
+    return {padded[i:i + size] for i in range(max(1, len(padded) - size + 1))}
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein uzaklığı; limit aşılınca limit + 1 döner"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def same_content(a: str, b: str) -> bool:
+    """
+    Yakın eşleşme doğrulaması: sayılar birebir aynı olmalı,
+    her içerik kelimesinin karşıda en fazla küçük bir yazım farkıyla eşi olmalı.
+    ("1234 ile 5678 çarpımı" != "1234 ile 5679 çarpımı")
+    """
+    if _NUMBER.findall(a) != _NUMBER.findall(b):
+        return False
+
+    def content(text):
+        return [w for w in text.split() if w not in FILLER_WORDS and not w.isdigit()]
+
+    words_a, words_b = content(a), content(b)
+    for left, right in ((words_a, words_b), (words_b, words_a)):
+        for word in left:
+            limit = 1 if len(word) < 8 else 2
+            if not any(edit_distance(word, other, limit) <= limit for other in right):
+                return False
+    return True
+
+
+def minhash(features: set) -> list:
+    """Özellik kümesinin MinHash imzası"""
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode('utf-8'), digest_size=8).digest(), 'big')
+              for f in features]
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def band_hashes(signature: list) -> list:
+    """LSH bantları (SQLite INTEGER'a sığan 63 bit)"""
+    result = []
+    for band in range(BANDS):
+        chunk = ",".join(str(v) for v in signature[band * ROWS:(band + 1) * ROWS])
+        result.append(int.from_bytes(hashlib.blake2b(chunk.encode(), digest_size=8).digest(), 'big') >> 1)
+    return result
+
+
+class LLMResponseCache:
+    """
+    Soru -> cevap önbelleği.
+    get() önce bellekte, sonra SQLite'ta tam eşleşme arar; bulamazsa
+    aynı kapsamda (model + sistem mesajı) MinHash bantları ortak olan
+    soruları aday alır ve gerçek Jaccard benzerliğiyle doğrular.
+    """
+
+    def __init__(self, db_path=None, ttl: float = 24 * 3600, max_memory: int = 200,
+                 max_rows: int = 5000, near_duplicates: bool = True,
+                 min_similarity: float = 0.8, min_words: int = 3):
+        self.db_path = str(db_path or default_cache_dir() / "llm_cache.db")
+        self.ttl = ttl
+        self.max_memory = max_memory
+        self.max_rows = max_rows
+        self.near_duplicates = near_duplicates
+        self.min_similarity = min_similarity
+        # Çok kısa sorularda yakın eşleşme yanıltıcı olur
+        self.min_words = min_words
+
+        self._memory = OrderedDict()
+        # İsabet kaydı (key -> (son kullanım, isabet sayısı)); toplu yazılır
+        self._touched = {}
+        self._lock = threading.Lock()
+        self.metrics = {'exact_hits': 0, 'near_hits': 0, 'misses': 0, 'stores': 0, 'skipped': 0}
+
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                scope TEXT NOT NULL,
+                prompt TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                source_model TEXT,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hits INTEGER DEFAULT 0
+            )
+        """)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS response_bands (
+                key TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_bands ON response_bands(scope, band, value)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_bands_key ON response_bands(key)")
+        self._db.commit()
+
+    # ============================================
+    # ANAHTARLAR
+    # ============================================
+
+    @staticmethod
+    def _scope(model: str, system_prompt: str) -> str:
+        return hashlib.sha1(f"{model}\x00{system_prompt or ''}".encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _key(scope: str, normalized: str) -> str:
+        return hashlib.sha1(f"{scope}\x00{normalized}".encode('utf-8')).hexdigest()
+
+    def cacheable(self, prompt: str) -> bool:
+        """Zamana bağlı sorular önbelleğe girmez"""
+        lowered = prompt.lower()
+        return not any(word in lowered for word in VOLATILE_WORDS)
+
+    # ============================================
+    # OKUMA
+    # ============================================
+
+    def get(self, prompt: str, model: str, system_prompt: str = ""):
+        """Önbellekteki cevap (yoksa None)"""
+        if not self.cacheable(prompt):
+            return None
+
+        normalized = normalize_prompt(prompt)
+        scope = self._scope(model, system_prompt)
+        key = self._key(scope, normalized)
+        now = time.time()
+
+        with self._lock:
+            # 1) Bellek (LRU)
+            item = self._memory.get(key)
+            if item is not None and now - item[1] <= self.ttl:
+                self._memory.move_to_end(key)
+                self.metrics['exact_hits'] += 1
+                self._touch(key, now)
+                return item[0]
+
+            # 2) SQLite tam eşleşme
+            row = self._db.execute(
+                "SELECT answer, created_at FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl)
+            ).fetchone()
+            if row is not None:
+                self._remember(key, row[0], row[1])
+                self.metrics['exact_hits'] += 1
+                self._touch(key, now)
+                return row[0]
+
+            # 3) Yakın tekrar
+            if self.near_duplicates and len(normalized.split()) >= self.min_words:
+                answer = self._near_lookup(scope, normalized, now)
+                if answer is not None:
+                    self.metrics['near_hits'] += 1
+                    return answer
+
+            self.metrics['misses'] += 1
+            return None
+
+    def _near_lookup(self, scope: str, normalized: str, now: float):
+        features = shingles(normalized)
+        bands = band_hashes(minhash(features))
+        rows = self._db.execute(
+            "SELECT DISTINCT r.key, r.prompt, r.answer FROM response_bands b "
+            "JOIN responses r ON r.key = b.key "
+            "WHERE b.scope = ? AND r.created_at >= ? AND ("
+            + " OR ".join("(b.band = ? AND b.value = ?)" for _ in bands) + ") LIMIT 50",
+            (scope, now - self.ttl, *[x for pair in enumerate(bands) for x in pair])
+        ).fetchall()
+
+        best = None
+        for key, prompt, answer in rows:
+            similarity = jaccard(features, shingles(prompt))
+            if similarity < self.min_similarity or not same_content(normalized, prompt):
+                continue
+            if best is None or similarity > best[0]:
+                best = (similarity, key, answer)
+        if best is None:
+            return None
+        self._touch(best[1], now)
+        return best[2]
+
+    def _touch(self, key: str, now: float):
+        """İsabeti kaydet; her isabette commit yerine TOUCH_BATCH'te bir yaz"""
+        _, hits = self._touched.get(key, (now, 0))
+        self._touched[key] = (now, hits + 1)
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flush_touches()
+            self._db.commit()
+
+    def _flush_touches(self):
+        if not self._touched:
+            return
+        self._db.executemany(
+            "UPDATE responses SET last_used = ?, hits = hits + ? WHERE key = ?",
+            [(used, hits, key) for key, (used, hits) in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _remember(self, key: str, answer: str, created_at: float):
+        self._memory[key] = (answer, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    async def aget(self, prompt: str, model: str, system_prompt: str = ""):
+        """get() - olay döngüsünü SQLite sorgusuyla bekletmez"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.get, prompt, model, system_prompt)
+
+    # ============================================
+    # YAZMA
+    # ============================================
+
+    def put(self, prompt: str, answer: str, model: str, system_prompt: str = "",
+            source_model: str = None):
+        """Cevabı kaydet"""
+        if not answer or not self.cacheable(prompt):
+            self.metrics['skipped'] += 1
+            return
+
+        normalized = normalize_prompt(prompt)
+        scope = self._scope(model, system_prompt)
+        key = self._key(scope, normalized)
+        bands = band_hashes(minhash(shingles(normalized)))
+        now = time.time()
+
+        with self._lock:
+            self._remember(key, answer, now)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, scope, prompt, answer, source_model, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, scope, normalized, answer, source_model or model, now, now)
+            )
+            self._db.execute("DELETE FROM response_bands WHERE key = ?", (key,))
+            self._db.executemany(
+                "INSERT INTO response_bands (key, scope, band, value) VALUES (?, ?, ?, ?)",
+                [(key, scope, band, value) for band, value in enumerate(bands)]
+            )
+            self.metrics['stores'] += 1
+            self._flush_touches()
+            if self.metrics['stores'] % 50 == 0:
+                self._prune(now)
+            self._db.commit()
+
+    async def aput(self, prompt: str, answer: str, model: str, system_prompt: str = "",
+                   source_model: str = None):
+        """put() - thread havuzunda"""
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: self.put(prompt, answer, model, system_prompt, source_model))
+
+    def _prune(self, now: float):
+        """Süresi dolanları ve fazla satırları sil (en az kullanılan önce)"""
+        self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+        self._db.execute("DELETE FROM response_bands WHERE key NOT IN (SELECT key FROM responses)")
+
+    def flush(self):
+        """Bekleyen isabet kayıtlarını yaz"""
+        with self._lock:
+            self._flush_touches()
+            self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute("DELETE FROM responses")
+            self._db.execute("DELETE FROM response_bands")
+            self._db.commit()
+
+    def get_stats(self) -> dict:
+        stats = dict(self.metrics)
+        lookups = stats['exact_hits'] + stats['near_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['exact_hits'] + stats['near_hits']) / lookups if lookups else 0.0
+        with self._lock:
+            stats['memory_entries'] = len(self._memory)
+            stats['pending_touches'] = len(self._touched)
+            stats['stored'] = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return stats
@@ -0,0 +1,427 @@
+# src/api/llm_router.py - ANDROID UYUMLU
+"""
+Çok sağlayıcılı LLM yönlendirici (Groq + Gemini)
+- 📊 Sağlayıcı / model başına ilk token süresi ve hata oranı
+- 🏎️ Her istek en hızlı sağlıklı modele gider
+- 🪁 İlk token p95 süresinde gelmezse diğer sağlayıcıya yedek (hedged) istek
+- 🔌 Devre kesiciler: ölü modeller tekrar tekrar denenmez
+- 💾 Tekrarlanan sorular yerel cevap önbelleğinden (LLMResponseCache)
+- 🧠 Sohbet hafızası (ConversationMemory) tüm adaylara ortak geçmiş olarak verilir
+- 📋 Model kataloğunda kaldırılmış / listede olmayan modeller aday olmaz
+"""
+
+import time
+import asyncio
+from collections import deque
+
+from src.api.async_runtime import run_sync
+from src.api.streaming import stream_sync
+from src.api.prompts import SYSTEM_PROMPT
+from src.api.conversation import is_follow_up
+
+# İstatistik yokken varsayılan ilk token süresi (ms)
+DEFAULT_TTFT_MS = {'groq': 400.0, 'gemini': 900.0}
+
+# Kalıcı hatalar: model kaldırılmış / anahtar geçersiz
+PERMANENT_ERRORS = ('decommissioned', 'deprecated', 'not found', '404',
+                    'api_key_invalid', 'invalid api key', 'expired')
+
+# Bunlar modele özgü: katalogda kaldırılmış olarak işaretlenir (anahtar hataları değil)
+MODEL_GONE_ERRORS = ('decommissioned', 'deprecated', 'not found', '404')
+
+
+class CircuitBreaker:
+    """
+    closed -> (art arda hatalar) -> open -> (bekleme) -> half_open -> closed/open
+    half_open durumunda tek deneme isteğine izin verilir.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_until = 0.0
+        self.trial_running = False
+
+    def allow(self) -> bool:
+        if self.state == 'closed':
+            return True
+        if self.state == 'open' and time.monotonic() >= self.opened_until:
+            self.state = 'half_open'
+            self.trial_running = False
+        if self.state == 'half_open' and not self.trial_running:
+            self.trial_running = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = 'closed'
+        self.failures = 0
+        self.trial_running = False
+
+    def record_failure(self, permanent: bool = False):
+        self.failures += 1
+        self.trial_running = False
+        if permanent:
+            # Kaldırılmış model: uzun süre denenmez
+            self.trip(3600)
+        elif self.state == 'half_open' or self.failures >= self.failure_threshold:
+            self.trip(self.reset_timeout)
+
+    def trip(self, duration: float):
+        self.state = 'open'
+        self.opened_until = time.monotonic() + duration
+
+
+class ModelStats:
+    """Tek (sağlayıcı, model) için gecikme ve hata istatistiği"""
+
+    def __init__(self, provider: str, window: int = 50):
+        self.provider = provider
+        self.ttft = deque(maxlen=window)
+        self.total = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.error_rate = 0.0   # üstel ortalama
+        self.hedges_lost = 0
+
+    def _percentile(self, values, p: float, default: float) -> float:
+        if not values:
+            return default
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    def p50_ttft(self) -> float:
+        return self._percentile(self.ttft, 0.5, DEFAULT_TTFT_MS.get(self.provider, 1000.0))
+
+    def p95_ttft(self) -> float:
+        return self._percentile(self.ttft, 0.95, DEFAULT_TTFT_MS.get(self.provider, 1000.0) * 2)
+
+    def record_ttft(self, ms: float):
+        self.ttft.append(ms)
+
+    def record_success(self, total_ms: float):
+        self.requests += 1
+        self.total.append(total_ms)
+        self.error_rate *= 0.8
+
+    def record_error(self):
+        self.requests += 1
+        self.errors += 1
+        self.error_rate = self.error_rate * 0.8 + 0.2
+
+    def score(self) -> float:
+        """Düşük daha iyi: tipik ilk token süresi, hata oranıyla cezalı"""
+        return self.p50_ttft() * (1 + 4 * self.error_rate)
+
+    def summary(self) -> dict:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': round(self.error_rate, 3),
+            'p50_ttft_ms': round(self.p50_ttft()),
+            'p95_ttft_ms': round(self.p95_ttft()),
+            'avg_total_ms': round(sum(self.total) / len(self.total)) if self.total else 0,
+            'hedges_lost': self.hedges_lost
+        }
+
+
+class Candidate:
+    """Yönlendirilebilir tek model"""
+
+    __slots__ = ('client', 'model', 'stats', 'breaker')
+
+    def __init__(self, client, model: str):
+        self.client = client
+        self.model = model
+        self.stats = ModelStats(client.name)
+        self.breaker = CircuitBreaker()
+
+    @property
+    def key(self) -> str:
+        return f"{self.client.name}/{self.model}"
+
+
+class _Attempt:
+    """Bir adayın akışını kuyruğa pompalayan görev"""
+
+    def __init__(self, candidate: Candidate, prompt: str, memory=None):
+        self.candidate = candidate
+        self.queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        self.task = asyncio.ensure_future(self._pump(prompt, memory))
+
+    async def _pump(self, prompt: str, memory=None):
+        try:
+            async for chunk in self.candidate.client.astream_raw(prompt, self.candidate.model,
+                                                                 memory=memory):
+                await self.queue.put(('chunk', chunk))
+            await self.queue.put(('end', None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self.queue.put(('error', e))
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def cancel(self):
+        self.task.cancel()
+        # Yarıda bırakılan deneme devre kesicinin tek deneme hakkını tutmasın
+        self.candidate.breaker.trial_running = False
+
+
+class LLMRouter:
+    """
+    GroqAI / GeminiAI istemcilerinin önünde durur; ask / stream arayüzü
+    istemcilerle aynıdır, main.py için fark etmez.
+    """
+
+    name = "router"
+
+    def __init__(self, clients: list, min_hedge_ms: float = 300.0, max_hedge_ms: float = 4000.0,
+                 cache=None, memory=None, catalog=None):
+        self.clients = [c for c in clients if c.available]
+        # Cevaplar modelden bağımsız paylaşılır; kaynak model kayıtta tutulur
+        self.cache = cache
+        # Sağlayıcı değişse de konuşma kopmaz
+        self.memory = memory
+        # Kalıcı hatalar yeniden başlatmalardan sonra da hatırlanır
+        self.catalog = catalog
+        self._tasks = set()
+        self.min_hedge_ms = min_hedge_ms
+        self.max_hedge_ms = max_hedge_ms
+        self.candidates = [Candidate(c, m) for c in self.clients for m in c.models()]
+        self.last_stream = None
+        self.last_route = None
+        self.metrics = {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'fallbacks': 0, 'failed': 0,
+                        'cache_hits': 0}
+
+    @property
+    def available(self) -> bool:
+        return bool(self.candidates)
+
+    # ============================================
+    # SEÇİM
+    # ============================================
+
+    def rank(self) -> list:
+        """Devresi açık olmayan adaylar, en hızlıdan yavaşa"""
+        order = {id(c): i for i, c in enumerate(self.candidates)}
+        healthy = [c for c in self.candidates if c.breaker.state != 'open' or
+                   time.monotonic() >= c.breaker.opened_until]
+        if self.catalog is not None:
+            healthy = [c for c in healthy if self.catalog.is_usable(c.client.name, c.model)]
+        return sorted(healthy, key=lambda c: (c.stats.score(), order[id(c)]))
+
+    def _take_next(self, pending: list, other_than: str = None):
+        """Sıradaki (devresi izin veren) adayı al; other_than: farklı sağlayıcı şartı"""
+        for candidate in list(pending):
+            if other_than is not None and candidate.client.name == other_than:
+                continue
+            pending.remove(candidate)
+            if candidate.breaker.allow():
+                return candidate
+        return None
+
+    def hedge_deadline_ms(self, candidate: Candidate) -> float:
+        """Yedek istek için bekleme süresi: adayın p95 ilk token süresi"""
+        return min(self.max_hedge_ms, max(self.min_hedge_ms, candidate.stats.p95_ttft()))
+
+    @staticmethod
+    def _is_permanent(error: Exception) -> bool:
+        text = str(error).lower()
+        return any(marker in text for marker in PERMANENT_ERRORS)
+
+    def _record_failure(self, attempt: _Attempt, error: Exception = None):
+        candidate = attempt.candidate
+        permanent = error is not None and self._is_permanent(error)
+        candidate.stats.record_error()
+        candidate.breaker.record_failure(permanent=permanent)
+        if permanent and self.catalog is not None and \
+                any(marker in str(error).lower() for marker in MODEL_GONE_ERRORS):
+            self.catalog.mark_deprecated(candidate.client.name, candidate.model)
+        print(f"⚠️ {candidate.key} başarısız: {str(error)[:80] if error else 'boş cevap'}")
+
+    # ============================================
+    # SOHBET HAFIZASI
+    # ============================================
+
+    def _uses_cache(self, prompt: str) -> bool:
+        """Önceki cevaba dayanan takip soruları önbellekten cevaplanamaz"""
+        if self.cache is None:
+            return False
+        return self.memory is None or self.memory.is_empty() or not is_follow_up(prompt)
+
+    def _remember(self, prompt: str, answer: str):
+        """Turu hafızaya ekle; bütçe aşıldıysa arka planda özetle"""
+        if self.memory is None or not answer:
+            return
+        self.memory.add_exchange(prompt, answer)
+        if self.memory.needs_compaction():
+            task = asyncio.ensure_future(self.memory.acompact(self._summarize))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, text: str) -> str:
+        """Özet için en hızlı sağlıklı model (hafızasız, önbelleksiz)"""
+        for candidate in self.rank():
+            try:
+                return "".join([chunk async for chunk in
+                                candidate.client.astream_raw(text, candidate.model)])
+            except Exception as e:
+                print(f"⚠️ {candidate.key} özetleyemedi: {str(e)[:80]}")
+        raise RuntimeError("özetleyecek model yok")
+
+    # ============================================
+    # AKIŞ
+    # ============================================
+
+    async def astream(self, prompt: str):
+        """En hızlı sağlıklı modelden akış; gerekirse yedek istek ve geri düşme"""
+        self.metrics['requests'] += 1
+        use_cache = self._uses_cache(prompt)
+        
+        if use_cache:
+            cached = await self.cache.aget(prompt, self.name, SYSTEM_PROMPT)
+            if cached is not None:
+                self.metrics['cache_hits'] += 1
+                self.last_route = "önbellek"
+                self._remember(prompt, cached)
+                yield cached
+                return
+        
+        pending = self.rank()
+        primary = self._take_next(pending)
+        if primary is None:
+            self.metrics['failed'] += 1
+            yield "❌ Şu anda kullanılabilir yapay zeka modeli yok."
+            return
+
+        attempts = [_Attempt(primary, prompt, self.memory)]
+        getters = {}
+        hedge_at = time.perf_counter() + self.hedge_deadline_ms(primary) / 1000
+        hedged = False
+        winner = None
+        first_chunk = None
+
+        try:
+            while winner is None:
+                if not attempts:
+                    # Hepsi hata verdi: sıradakine düş
+                    candidate = self._take_next(pending)
+                    if candidate is None:
+                        break
+                    self.metrics['fallbacks'] += 1
+                    attempts.append(_Attempt(candidate, prompt, self.memory))
+                    if not hedged:
+                        # Yedek istek süresi yeni birincil aday için yeniden başlar
+                        primary = candidate
+                        hedge_at = time.perf_counter() + self.hedge_deadline_ms(candidate) / 1000
+
+                for attempt in attempts:
+                    if attempt not in getters:
+                        getters[attempt] = asyncio.ensure_future(attempt.queue.get())
+
+                timeout = None if hedged else max(0.0, hedge_at - time.perf_counter())
+                done, _ = await asyncio.wait(list(getters.values()), timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # İlk token gecikti: diğer sağlayıcıya yedek istek
+                    hedged = True
+                    hedge = self._take_next(pending, other_than=primary.client.name)
+                    if hedge is not None:
+                        self.metrics['hedged'] += 1
+                        print(f"🪁 Yedek istek: {hedge.key} ({primary.key} gecikti)")
+                        attempts.append(_Attempt(hedge, prompt, self.memory))
+                    continue
+
+                for attempt, getter in list(getters.items()):
+                    if getter not in done:
+                        continue
+                    del getters[attempt]
+                    kind, value = getter.result()
+                    if kind == 'chunk':
+                        winner = attempt
+                        first_chunk = value
+                        break
+                    attempts.remove(attempt)
+                    self._record_failure(attempt, value)
+
+            if winner is None:
+                self.metrics['failed'] += 1
+                yield "❌ Yapay zeka servislerine şu anda ulaşılamıyor."
+                return
+
+            # Kaybedenler iptal; yavaşlıkları istatistiğe alt sınır olarak girer
+            for attempt in attempts:
+                if attempt is not winner:
+                    attempt.cancel()
+                    attempt.candidate.stats.record_ttft(attempt.elapsed_ms)
+                    attempt.candidate.stats.hedges_lost += 1
+            if winner.candidate is not primary:
+                self.metrics['hedge_wins'] += 1
+
+            candidate = winner.candidate
+            candidate.stats.record_ttft(winner.elapsed_ms)
+            self.last_route = candidate.key
+            parts = [first_chunk]
+            yield first_chunk
+
+            while True:
+                kind, value = await winner.queue.get()
+                if kind == 'chunk':
+                    parts.append(value)
+                    yield value
+                elif kind == 'end':
+                    candidate.stats.record_success(winner.elapsed_ms)
+                    candidate.breaker.record_success()
+                    answer = "".join(parts)
+                    if use_cache:
+                        await self.cache.aput(prompt, answer, self.name, SYSTEM_PROMPT,
+                                              source_model=candidate.key)
+                    self._remember(prompt, answer)
+                    break
+                else:
+                    # Yarıda kesilen akış: gelen kısım kullanıcıda kalır
+                    self._record_failure(winner, value)
+                    break
+        finally:
+            for getter in getters.values():
+                getter.cancel()
+            for attempt in attempts:
+                if not attempt.task.done():
+                    attempt.cancel()
+
+    def stream(self, prompt: str, on_text=None, on_sentence=None):
+        """Akışlı soru (senkron) -> StreamResult"""
+        result = stream_sync(self.astream(prompt), on_text, on_sentence)
+        self.last_stream = result
+        print(f"🤖 {self.last_route or '-'} {result.summary()}")
+        return result
+
+    async def aask(self, prompt: str) -> str:
+        """Soru sor (async) - akışı birleştirir"""
+        return "".join([chunk async for chunk in self.astream(prompt)])
+
+    def ask(self, prompt: str) -> str:
+        """Soru sor (senkron)"""
+        return run_sync(self.aask(prompt))
+
+    def get_stats(self) -> dict:
+        """Model başına istatistik ve devre durumu"""
+        stats = {'router': dict(self.metrics)}
+        if self.cache is not None:
+            stats['cache'] = self.cache.get_stats()
+        if self.memory is not None:
+            stats['memory'] = self.memory.get_stats()
+        if self.catalog is not None:
+            stats['catalog'] = self.catalog.get_stats()
+        for candidate in self.candidates:
+            summary = candidate.stats.summary()
+            summary['circuit'] = candidate.breaker.state
+            stats[candidate.key] = summary
+        return stats
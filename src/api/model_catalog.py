@@ -0,0 +1,117 @@
+# src/api/model_catalog.py - ANDROID UYUMLU
+"""
+LLM model kataloğu
+- 📋 Sağlayıcı başına kullanılabilir modeller (models.list) günde bir kez çekilir
+- 💾 Diskte TTL'li önbellek: açılışta ağ beklemeden bilinen sağlam model seçilir
+- 🚫 Kaldırılmış (deprecated / 404) modeller kaydedilir, yeniden başlatmada da denenmez
+"""
+
+import time
+import asyncio
+
+from src.api.response_cache import ResponseCache, default_cache_dir
+from src.api.async_runtime import submit
+
+# Kaldırılmış model kaydı bu süreden sonra tekrar denenir (ad yeniden kullanılabilir)
+DEPRECATED_TTL = 7 * 24 * 3600
+
+
+class ModelCatalog:
+    """
+    Sağlayıcı -> model listesi.
+    İstemciler tercih sıralarını verir; katalog bunlardan kullanılabilir
+    ve kaldırılmamış olanları aynı sırayla döndürür.
+    """
+
+    def __init__(self, path=None, ttl: float = 24 * 3600):
+        self.ttl = ttl
+        self.cache = ResponseCache(
+            path or default_cache_dir() / "models.json",
+            ttl=ttl,
+            max_stale=7 * 24 * 3600,
+            save_delay=1.0
+        )
+        # Bu oturumda görülen sağlayıcılar (istatistik için)
+        self.providers = set()
+
+    # ============================================
+    # SORGULAMA
+    # ============================================
+
+    def available(self, provider: str) -> set:
+        """Son bilinen model listesi (bilinmiyorsa boş küme)"""
+        entry = self.cache.get(f"{provider}:available")
+        return set(entry.data) if entry is not None else set()
+
+    def deprecated(self, provider: str) -> dict:
+        """model -> kaldırıldığı zaman (süresi geçenler hariç)"""
+        entry = self.cache.get(f"{provider}:deprecated")
+        if entry is None:
+            return {}
+        now = time.time()
+        return {model: at for model, at in entry.data.items() if now - at < DEPRECATED_TTL}
+
+    def is_usable(self, provider: str, model: str) -> bool:
+        if model in self.deprecated(provider):
+            return False
+        known = self.available(provider)
+        # Liste henüz çekilmediyse iyimser davran
+        return not known or model in known
+
+    def usable(self, provider: str, preferred: list) -> list:
+        """Tercih sırasını koruyarak kullanılabilir modeller"""
+        models = [m for m in preferred if self.is_usable(provider, m)]
+        if models:
+            return models
+        # Hepsi elendiyse (ör. liste eski) kaldırılmamış olanlara dön
+        deprecated = self.deprecated(provider)
+        return [m for m in preferred if m not in deprecated] or list(preferred)
+
+    # ============================================
+    # GÜNCELLEME
+    # ============================================
+
+    def mark_deprecated(self, provider: str, model: str):
+        """Model kaldırılmış / bulunamadı; kalıcı olarak atla"""
+        self.providers.add(provider)
+        deprecated = self.deprecated(provider)
+        if model in deprecated:
+            return
+        deprecated[model] = time.time()
+        self.cache.put(f"{provider}:deprecated", deprecated)
+        print(f"🚫 Model kullanım dışı işaretlendi: {provider}/{model}")
+
+    async def arefresh(self, client, force: bool = False):
+        """İstemcinin model listesini çek (TTL dolmadıysa diskten)"""
+        self.providers.add(client.name)
+        key = f"{client.name}:available"
+        if force:
+            models = await self.cache.arefresh(key, client.alist_models)
+        else:
+            models, _ = await self.cache.aget_or_fetch(key, client.alist_models)
+        return models
+
+    async def arefresh_all(self, clients: list):
+        """Tüm sağlayıcıları aynı anda yenile; biri düşerse diğerleri etkilenmez"""
+        clients = [c for c in clients if c.available]
+        results = await asyncio.gather(*(self.arefresh(c) for c in clients), return_exceptions=True)
+        for client, result in zip(clients, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ {client.name} model listesi alınamadı: {result}")
+            else:
+                print(f"📋 {client.name}: {len(result)} model, aktif: {client.models()[0]}")
+
+    def refresh_background(self, clients: list):
+        """Açılışı bekletmeden paylaşılan döngüde yenile"""
+        return submit(self.arefresh_all(clients))
+
+    def get_stats(self) -> dict:
+        stats = {}
+        for provider in sorted(self.providers):
+            entry = self.cache.get(f"{provider}:available")
+            stats[provider] = {
+                'known': len(entry.data) if entry is not None else 0,
+                'age': round(entry.age) if entry is not None else None,
+                'deprecated': sorted(self.deprecated(provider))
+            }
+        return stats
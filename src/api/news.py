@@ -1,14 +1,27 @@
 # src/api/news.py - ANDROID UYUMLU (SENKRON)
 """
-Haber modülü - NewsAPI ile güncel haberler
+Haber modülü - NewsAPI ile güncel haberler (async çekirdek + senkron sarmalayıcılar)
+- ⏳ Kategori başına TTL'li önbellek
+- 🏷️ ETag / If-Modified-Since ile koşullu yenileme
+- 🔄 En çok kullanılan kategoriler arka planda önceden çekilir
+- 🧱 fetch_* yapılandırılmış NewsResult döndürür, get_* Markdown
 """
 
 import os
 import sys
+import json
+import asyncio
+import threading
 import requests
 from datetime import datetime
 from dotenv import load_dotenv
 
+from src.api.http_client import AsyncHttpClient, get_async_http_client
+from src.api.async_runtime import run_sync, submit
+from src.api.response_cache import ResponseCache, default_cache_dir
+from src.api.results import NewsResult
+from src.api import render
+
 # Android tespiti
 IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
 
@@ -19,13 +32,39 @@ if IS_ANDROID:
 else:
     load_dotenv()
 
+# Kategori başına önbellek süresi (saniye)
+CATEGORY_TTLS = {
+    'general': 600,
+    'business': 900,
+    'technology': 1800,
+    'science': 3600,
+    'health': 3600,
+    'sports': 600,
+    'entertainment': 1800
+}
+DEFAULT_TTL = 900
+SEARCH_TTL = 1800
+
+# Tek kayıt farklı page_size isteklerine de yetsin
+MIN_FETCH_SIZE = 10
+
+
+class NewsAPIError(Exception):
+    """NewsAPI 200 dışı yanıt"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
 
 class NewsAPI:
-    """Haber API servisi (senkron)"""
+    """Haber API servisi (a* metotları async, diğerleri senkron sarmalayıcı)"""
     
-    def __init__(self):
+    def __init__(self, http: AsyncHttpClient = None, base_url: str = None):
         self.api_key = os.getenv("NEWS_API_KEY")
-        self.base_url = "https://newsapi.org/v2"
+        # Testlerde yerel sahte sunucuya yönlendirilebilir
+        self.base_url = base_url or os.getenv("NEWS_API_BASE_URL", "https://newsapi.org/v2")
+        self.http = http or get_async_http_client()
         
         # Kategoriler ve Türkçe karşılıkları
         self.categories = {
@@ -38,118 +77,184 @@ class NewsAPI:
             'entertainment': '🎬 Eğlence'
         }
         
+        # Önbellek ve kategori kullanım sayaçları
+        cache_dir = default_cache_dir()
+        self.cache = ResponseCache(cache_dir / "news.json", ttl=DEFAULT_TTL,
+                                   encode=NewsResult.to_dict, decode=NewsResult.from_dict,
+                                   version=2)
+        self.usage_file = cache_dir / "news_usage.json"
+        self.usage = self._load_usage()
+        self._usage_lock = threading.Lock()
+        
+        # Önceden çekici (paylaşılan döngüde görev)
+        self._prefetch_future = None
+        self.prefetch_metrics = {'runs': 0, 'fetched': 0, 'errors': 0}
+        
         if self.api_key:
             print("✅ News API hazır")
         else:
             print("⚠️ NEWS_API_KEY bulunamadı, .env dosyasını kontrol edin")
     
-    def get_headlines(self, category: str = 'general', country: str = 'tr', page_size: int = 5) -> str:
-        """
-        Manşet haberleri getir (senkron)
-        """
-        if not self.api_key:
-            return "❌ News API anahtarı gerekli."
+    # ============================================
+    # ÖNBELLEK
+    # ============================================
+    
+    def _conditional_fetch(self, endpoint: str, params: dict, kind: str, query: str, label: str):
+        """ResponseCache için koşullu getirme fonksiyonu üret"""
+        url = f"{self.base_url}/{endpoint}"
+        params = dict(params, apiKey=self.api_key)
         
-        try:
-            url = f"{self.base_url}/top-headlines"
-            params = {
-                'country': country,
-                'category': category,
-                'apiKey': self.api_key,
-                'pageSize': page_size
-            }
+        async def fetch(previous):
+            headers = {}
+            if previous is not None:
+                if previous.meta.get('etag'):
+                    headers['If-None-Match'] = previous.meta['etag']
+                if previous.meta.get('last_modified'):
+                    headers['If-Modified-Since'] = previous.meta['last_modified']
             
-            response = requests.get(url, params=params, timeout=10)
+            response = await self.http.get(url, params=params, headers=headers or None)
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data['status'] == 'ok' and data['totalResults'] > 0:
-                    category_name = self.categories.get(category, '📰 Haberler')
-                    result = [f"**{category_name} Manşetleri**\n"]
-                    
-                    for i, article in enumerate(data['articles'][:page_size], 1):
-                        title = article['title']
-                        source = article['source']['name']
-                        time = article['publishedAt'][:10] if article['publishedAt'] else ''
-                        
-                        if len(title) > 60:
-                            title = title[:57] + "..."
-                        
-                        result.append(f"\n{i}. **{title}**")
-                        result.append(f"   📍 {source} | 📅 {time}")
-                    
-                    return "\n".join(result)
-                else:
-                    return f"📭 {category} kategorisinde haber bulunamadı."
+            if response.status_code == 304 and previous is not None:
+                return previous.data, previous.meta
+            if response.status_code != 200:
+                raise NewsAPIError(response.status_code)
             
-            elif response.status_code == 426:
-                return "⚠️ API sürümü güncellenmeli."
-            else:
-                return f"❌ Haberler alınamadı (Hata: {response.status_code})"
-                
-        except requests.exceptions.Timeout:
-            return "⏱️ Haber servisi zaman aşımı"
-        except requests.exceptions.ConnectionError:
-            return "❌ İnternet bağlantısı yok"
-        except Exception as e:
-            return f"❌ Haber API hatası: {e}"
-    
-    def search_news(self, query: str, page_size: int = 5) -> str:
-        """
-        Belirli bir konuda haber ara (senkron)
-        """
-        if not self.api_key:
-            return "❌ News API anahtarı gerekli."
+            meta = {}
+            if response.headers.get('ETag'):
+                meta['etag'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                meta['last_modified'] = response.headers['Last-Modified']
+            return NewsResult.from_newsapi(response.json(), kind, query, label), meta
         
+        return fetch
+    
+    def _headline_request(self, category: str, country: str, page_size: int):
+        """Manşet isteği için (anahtar, getirici, ttl)"""
+        fetch_size = max(page_size, MIN_FETCH_SIZE)
+        key = f"top:{country}:{category}:{fetch_size}"
+        fetch = self._conditional_fetch('top-headlines', {
+            'country': country,
+            'category': category,
+            'pageSize': fetch_size
+        }, 'category', category, self.categories.get(category, '📰 Haberler'))
+        return key, fetch, CATEGORY_TTLS.get(category, DEFAULT_TTL)
+    
+    # ============================================
+    # KULLANIM SAYAÇLARI
+    # ============================================
+    
+    def _load_usage(self) -> dict:
         try:
-            url = f"{self.base_url}/everything"
-            params = {
-                'q': query,
-                'apiKey': self.api_key,
-                'language': 'tr',
-                'pageSize': page_size,
-                'sortBy': 'publishedAt'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data['status'] == 'ok' and data['totalResults'] > 0:
-                    result = [f"🔍 **'{query}' ile ilgili {data['totalResults']} haber bulundu**\n"]
-                    
-                    for i, article in enumerate(data['articles'][:page_size], 1):
-                        title = article['title']
-                        source = article['source']['name']
-                        time = article['publishedAt'][:10] if article['publishedAt'] else ''
-                        
-                        if len(title) > 60:
-                            title = title[:57] + "..."
-                        
-                        result.append(f"\n{i}. **{title}**")
-                        result.append(f"   📍 {source} | 📅 {time}")
-                    
-                    return "\n".join(result)
-                else:
-                    return f"📭 '{query}' ile ilgili haber bulunamadı."
-            else:
-                return f"❌ Arama yapılamadı (Hata: {response.status_code})"
-                
-        except requests.exceptions.Timeout:
-            return "⏱️ Arama zaman aşımı"
-        except requests.exceptions.ConnectionError:
-            return "❌ İnternet bağlantısı yok"
+            if self.usage_file.exists():
+                with open(self.usage_file, 'r', encoding='utf-8') as f:
+                    return {k: int(v) for k, v in json.load(f).items()}
+        except:
+            pass
+        return {}
+    
+    def _record_usage(self, category: str):
+        """Kategori kullanımını say (kayıt döngü dışında yapılır)"""
+        with self._usage_lock:
+            self.usage[category] = self.usage.get(category, 0) + 1
+        asyncio.get_running_loop().run_in_executor(None, self._save_usage)
+    
+    def _save_usage(self):
+        with self._usage_lock:
+            snapshot = dict(self.usage)
+        try:
+            with open(self.usage_file, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+        except:
+            pass
+    
+    def top_categories(self, count: int = 3) -> list:
+        """En çok kullanılan kategoriler (hiç yoksa genel)"""
+        with self._usage_lock:
+            ranked = sorted(self.usage, key=self.usage.get, reverse=True)
+        ranked = [c for c in ranked if c in self.categories][:count]
+        if 'general' not in ranked and len(ranked) < count:
+            ranked.append('general')
+        return ranked
+    
+    # ============================================
+    # ÖNCEDEN ÇEKME
+    # ============================================
+    
+    def start_prefetch(self, interval: float = 300, top_n: int = 3, country: str = 'tr'):
+        """Açılışta ve belirli aralıklarla popüler kategorileri yenile"""
+        if not self.api_key or self._prefetch_future is not None:
+            return
+        self._prefetch_future = submit(self._prefetch_loop(interval, top_n, country))
+        print("🔄 Haber ön belleği başlatıldı")
+    
+    def stop_prefetch(self):
+        if self._prefetch_future is not None:
+            self._prefetch_future.cancel()
+            self._prefetch_future = None
+    
+    async def _prefetch_once(self, category: str, country: str):
+        key, fetch, ttl = self._headline_request(category, country, 5)
+        entry = self.cache.get(key)
+        # TTL'nin yarısını geçen kayıtları erkenden yenile
+        if entry is not None and entry.age < ttl / 2:
+            return
+        try:
+            await self.cache.arefresh(key, fetch, conditional=True)
+            self.prefetch_metrics['fetched'] += 1
         except Exception as e:
-            return f"❌ Haber arama hatası: {e}"
+            self.prefetch_metrics['errors'] += 1
+            print(f"⚠️ Haber ön çekme hatası ({category}): {e}")
     
-    def get_news_by_source(self, source: str, page_size: int = 5) -> str:
-        """
-        Belirli bir kaynaktan haberler (senkron)
-        """
+    async def _prefetch_loop(self, interval: float, top_n: int, country: str):
+        while True:
+            self.prefetch_metrics['runs'] += 1
+            # Kategoriler eşzamanlı yenilenir
+            await asyncio.gather(*(self._prefetch_once(c, country)
+                                   for c in self.top_categories(top_n)))
+            await asyncio.sleep(interval)
+    
+    def get_cache_stats(self) -> dict:
+        """Önbellek isabet oranı ve ön çekme sayaçları"""
+        stats = self.cache.get_stats()
+        stats['prefetch'] = dict(self.prefetch_metrics)
+        with self._usage_lock:
+            stats['usage'] = dict(self.usage)
+        return stats
+    
+    # ============================================
+    # YAPILANDIRILMIŞ API
+    # ============================================
+    
+    def _require_key(self):
         if not self.api_key:
-            return "❌ News API anahtarı gerekli."
+            raise NewsAPIError(401)
+    
+    async def afetch_headlines(self, category: str = 'general', country: str = 'tr',
+                               page_size: int = 5) -> NewsResult:
+        """Manşetler (önbellekli). Hata durumunda istisna yükseltir."""
+        self._require_key()
+        self._record_usage(category)
+        key, fetch, ttl = self._headline_request(category, country, page_size)
+        result, _ = await self.cache.aget_or_fetch(key, fetch, ttl=ttl, conditional=True)
+        return result
+    
+    async def afetch_search(self, query: str, page_size: int = 5) -> NewsResult:
+        """Konu araması (önbellekli). Hata durumunda istisna yükseltir."""
+        self._require_key()
+        fetch_size = max(page_size, MIN_FETCH_SIZE)
+        key = f"search:{' '.join(query.lower().split())}:{fetch_size}"
+        fetch = self._conditional_fetch('everything', {
+            'q': query,
+            'language': 'tr',
+            'pageSize': fetch_size,
+            'sortBy': 'publishedAt'
+        }, 'search', query, query)
+        result, _ = await self.cache.aget_or_fetch(key, fetch, ttl=SEARCH_TTL, conditional=True)
+        return result
+    
+    async def afetch_by_source(self, source: str, page_size: int = 5) -> NewsResult:
+        """Kaynağın haberleri (önbellekli). Hata durumunda istisna yükseltir."""
+        self._require_key()
         
         # Popüler Türkçe kaynaklar
         turkish_sources = {
@@ -168,44 +273,87 @@ class NewsAPI:
         if source_lower in turkish_sources:
             source = turkish_sources[source_lower]
         
-        try:
-            url = f"{self.base_url}/top-headlines"
-            params = {
-                'sources': source,
-                'apiKey': self.api_key,
-                'pageSize': page_size
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data['status'] == 'ok' and data['totalResults'] > 0:
-                    result = [f"📰 **{source.title()} Haberleri**\n"]
-                    
-                    for i, article in enumerate(data['articles'][:page_size], 1):
-                        title = article['title']
-                        time = article['publishedAt'][:10] if article['publishedAt'] else ''
-                        
-                        if len(title) > 60:
-                            title = title[:57] + "..."
-                        
-                        result.append(f"\n{i}. **{title}**")
-                        result.append(f"   📅 {time}")
-                    
-                    return "\n".join(result)
-                else:
-                    return f"📭 {source} kaynağından haber bulunamadı."
-            else:
-                return f"❌ Kaynak haberleri alınamadı (Hata: {response.status_code})"
-                
-        except requests.exceptions.Timeout:
-            return "⏱️ Kaynak zaman aşımı"
-        except requests.exceptions.ConnectionError:
+        fetch_size = max(page_size, MIN_FETCH_SIZE)
+        key = f"source:{source}:{fetch_size}"
+        fetch = self._conditional_fetch('top-headlines', {
+            'sources': source,
+            'pageSize': fetch_size
+        }, 'source', source, source)
+        result, _ = await self.cache.aget_or_fetch(key, fetch, conditional=True)
+        return result
+    
+    def fetch_headlines(self, category: str = 'general', country: str = 'tr',
+                        page_size: int = 5) -> NewsResult:
+        return run_sync(self.afetch_headlines(category, country, page_size))
+    
+    def fetch_search(self, query: str, page_size: int = 5) -> NewsResult:
+        return run_sync(self.afetch_search(query, page_size))
+    
+    def fetch_by_source(self, source: str, page_size: int = 5) -> NewsResult:
+        return run_sync(self.afetch_by_source(source, page_size))
+    
+    def error_message(self, error: Exception, kind: str = 'category') -> str:
+        """fetch_* istisnasını kullanıcı mesajına çevir"""
+        if isinstance(error, NewsAPIError):
+            if error.status_code == 401 and not self.api_key:
+                return "❌ News API anahtarı gerekli."
+            if kind == 'search':
+                return f"❌ Arama yapılamadı (Hata: {error.status_code})"
+            if kind == 'source':
+                return f"❌ Kaynak haberleri alınamadı (Hata: {error.status_code})"
+            if error.status_code == 426:
+                return "⚠️ API sürümü güncellenmeli."
+            return f"❌ Haberler alınamadı (Hata: {error.status_code})"
+        if isinstance(error, requests.exceptions.Timeout):
+            return {'search': "⏱️ Arama zaman aşımı",
+                    'source': "⏱️ Kaynak zaman aşımı"}.get(kind, "⏱️ Haber servisi zaman aşımı")
+        if isinstance(error, requests.exceptions.ConnectionError):
             return "❌ İnternet bağlantısı yok"
+        return {'search': f"❌ Haber arama hatası: {error}",
+                'source': f"❌ Kaynak haber hatası: {error}"}.get(kind, f"❌ Haber API hatası: {error}")
+    
+    # ============================================
+    # METİN API (eski arayüz)
+    # ============================================
+    
+    async def aget_headlines(self, category: str = 'general', country: str = 'tr', page_size: int = 5) -> str:
+        """Manşet haberleri getir (async, önbellekli)"""
+        try:
+            return render.news_markdown(await self.afetch_headlines(category, country, page_size), page_size)
         except Exception as e:
-            return f"❌ Kaynak haber hatası: {e}"
+            return self.error_message(e)
+    
+    async def asearch_news(self, query: str, page_size: int = 5) -> str:
+        """Belirli bir konuda haber ara (async, önbellekli)"""
+        try:
+            return render.news_markdown(await self.afetch_search(query, page_size), page_size)
+        except Exception as e:
+            return self.error_message(e, 'search')
+    
+    async def aget_news_by_source(self, source: str, page_size: int = 5) -> str:
+        """Belirli bir kaynaktan haberler (async, önbellekli)"""
+        try:
+            return render.news_markdown(await self.afetch_by_source(source, page_size), page_size)
+        except Exception as e:
+            return self.error_message(e, 'source')
+    
+    def get_headlines(self, category: str = 'general', country: str = 'tr', page_size: int = 5) -> str:
+        """
+        Manşet haberleri getir (senkron, önbellekli)
+        """
+        return run_sync(self.aget_headlines(category, country, page_size))
+    
+    def search_news(self, query: str, page_size: int = 5) -> str:
+        """
+        Belirli bir konuda haber ara (senkron, önbellekli)
+        """
+        return run_sync(self.asearch_news(query, page_size))
+    
+    def get_news_by_source(self, source: str, page_size: int = 5) -> str:
+        """
+        Belirli bir kaynaktan haberler (senkron, önbellekli)
+        """
+        return run_sync(self.aget_news_by_source(source, page_size))
     
     def get_category_list(self) -> str:
         """Kullanılabilir kategorileri listele"""
@@ -0,0 +1,121 @@
+# src/api/render.py - ANDROID UYUMLU
+"""
+Sonuç nesnelerini metne çevirme
+- 💬 Sohbet için Markdown
+- 🔊 TTS için düz, emojisiz cümleler
+- 🧩 Widget'lar için düz metin
+- 🧠 Aynı nesne için tekrar render edilmez (lru_cache)
+"""
+
+import re
+from functools import lru_cache
+
+from src.api.results import WeatherObservation, NewsResult
+from src.api.response_cache import format_age
+
+# Uzun başlıklar kısaltılır
+TITLE_LIMIT = 60
+
+
+def _short_title(title: str) -> str:
+    if len(title) > TITLE_LIMIT:
+        return title[:TITLE_LIMIT - 3] + "..."
+    return title
+
+
+@lru_cache(maxsize=256)
+def plain(text: str) -> str:
+    """Markdown işaretlerini kaldır (widget'lar için)"""
+    return text.replace("**", "").replace("`", "")
+
+
+# ============================================
+# HAVA DURUMU
+# ============================================
+
+@lru_cache(maxsize=64)
+def weather_markdown(obs: WeatherObservation) -> str:
+    """Şehir hava durumu kartı"""
+    return f"""🌤️ **{obs.city} Hava Durumu**
+
+📍 {obs.description.title()}
+🌡️ Sıcaklık: {obs.temp:.1f}°C
+💧 Nem: %{obs.humidity}
+🤔 Hissedilen: {obs.feels_like:.1f}°C"""
+
+
+@lru_cache(maxsize=64)
+def weather_location_markdown(obs: WeatherObservation) -> str:
+    """Konum hava durumu (kısa)"""
+    return f"""📍 **{obs.city}**
+🌤️ {obs.description.title()}
+🌡️ {obs.temp:.1f}°C"""
+
+
+@lru_cache(maxsize=64)
+def weather_speech(obs: WeatherObservation) -> str:
+    """Sesli okunacak hava durumu"""
+    return (f"{obs.city} için hava {obs.description}. "
+            f"Sıcaklık {round(obs.temp)} derece, hissedilen {round(obs.feels_like)} derece, "
+            f"nem yüzde {obs.humidity}.")
+
+
+def freshness_note(fetched_at: float, ttl: float, now: float) -> str:
+    """Veri bayatsa yaşını belirt (zamana bağlı, önbelleklenmez)"""
+    age = max(0.0, now - fetched_at)
+    if fetched_at and age > ttl:
+        return f"\n🕐 Son güncelleme: {format_age(age)}"
+    return ""
+
+
+# ============================================
+# HABERLER
+# ============================================
+
+@lru_cache(maxsize=64)
+def news_markdown(result: NewsResult, limit: int = 5) -> str:
+    """Haber listesi (manşet / arama / kaynak)"""
+    if result.empty:
+        if result.kind == 'search':
+            return f"📭 '{result.query}' ile ilgili haber bulunamadı."
+        if result.kind == 'source':
+            return f"📭 {result.query} kaynağından haber bulunamadı."
+        return f"📭 {result.query} kategorisinde haber bulunamadı."
+
+    if result.kind == 'search':
+        lines = [f"🔍 **'{result.label}' ile ilgili {result.total_results} haber bulundu**\n"]
+    elif result.kind == 'source':
+        lines = [f"📰 **{result.label.title()} Haberleri**\n"]
+    else:
+        lines = [f"**{result.label} Manşetleri**\n"]
+
+    for i, article in enumerate(result.articles[:limit], 1):
+        lines.append(f"\n{i}. **{_short_title(article.title)}**")
+        if result.kind == 'source':
+            lines.append(f"   📅 {article.date}")
+        else:
+            lines.append(f"   📍 {article.source} | 📅 {article.date}")
+
+    return "\n".join(lines)
+
+
+# Konuşmada kaynak eki ("Başlık - Kaynak") okunmaz
+_SOURCE_SUFFIX = re.compile(r"\s+-\s+[^-]+$")
+
+
+@lru_cache(maxsize=64)
+def news_speech(result: NewsResult, limit: int = 3) -> str:
+    """Sesli okunacak ilk birkaç başlık"""
+    if result.empty:
+        return "Bu konuda haber bulamadım."
+
+    label = re.sub(r"[^\w\s']", "", result.label).strip()
+    if result.kind == 'search':
+        intro = f"{label} ile ilgili son haberler."
+    elif result.kind == 'source':
+        intro = f"{label.title()} haberleri."
+    else:
+        intro = f"{label} manşetleri."
+
+    titles = [_SOURCE_SUFFIX.sub("", a.title) for a in result.articles[:limit]]
+    return intro + " " + " ".join(f"{i}. {t}." for i, t in enumerate(titles, 1))
@@ -0,0 +1,259 @@
+# src/api/response_cache.py - ANDROID UYUMLU
+"""
+API yanıt önbelleği
+- ⏳ TTL + stale-while-revalidate
+- 💾 Diske kalıcı (soğuk açılış ve çevrimdışı kullanım)
+- 🧵 Aynı anahtar için tek arka plan yenilemesi
+- 🏷️ ETag / If-Modified-Since ile koşullu yenileme
+- 🧱 Bellekte nesne, diskte sıkıştırılmış sözlük (encode / decode)
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+# Android tespiti
+IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
+
+
+def default_cache_dir() -> Path:
+    """Önbellek klasörü (Android'de harici depolama)"""
+    if IS_ANDROID:
+        return Path("/storage/emulated/0/ANNA/data/cache")
+    return Path("data/cache")
+
+
+class CacheEntry:
+    """Önbellekteki tek kayıt"""
+
+    __slots__ = ('data', 'stored_at', 'meta')
+
+    def __init__(self, data, stored_at: float, meta: dict = None):
+        self.data = data
+        self.stored_at = stored_at
+        self.meta = meta or {}
+
+    @property
+    def age(self) -> float:
+        """Kaydın yaşı (saniye)"""
+        return max(0.0, time.time() - self.stored_at)
+
+
+class ResponseCache:
+    """
+    Anahtar -> veri önbelleği.
+    Kayıtlar duvar saatine göre (time.time) saklanır ki yeniden
+    başlatmalardan sonra da yaşları doğru hesaplansın.
+    """
+
+    def __init__(self, path: Path, ttl: float = 600, max_stale: float = 6 * 3600,
+                 max_entries: int = 200, save_delay: float = 2.0,
+                 encode=None, decode=None, version: int = 1):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        # Nesne <-> JSON dönüşümü; biçim değişince version artırılır
+        self.encode = encode
+        self.decode = decode
+        self.version = version
+
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._tasks = set()
+        self._save_timer = None
+
+        self.metrics = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0,
+                        'offline_hits': 0, 'revalidated': 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # ============================================
+    # OKUMA / YAZMA
+    # ============================================
+
+    def get(self, key: str):
+        """Kaydı döndür (yoksa None). Tazelik çağıranın kararı."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def is_fresh(self, entry: CacheEntry, ttl: float = None) -> bool:
+        return entry.age <= (self.ttl if ttl is None else ttl)
+
+    def put(self, key: str, data, meta: dict = None):
+        """Kaydı ekle / güncelle ve diske yazmayı planla"""
+        with self._lock:
+            self._entries[key] = CacheEntry(data, time.time(), meta)
+            if len(self._entries) > self.max_entries:
+                # En eski kayıtları at
+                oldest = sorted(self._entries.items(), key=lambda kv: kv[1].stored_at)
+                for old_key, _ in oldest[:len(self._entries) - self.max_entries]:
+                    del self._entries[old_key]
+        self._schedule_save()
+
+    def touch(self, key: str):
+        """Kaydı değiştirmeden tazele (örn. 304 Not Modified)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.time()
+        self._schedule_save()
+
+    # ============================================
+    # STALE-WHILE-REVALIDATE (paylaşılan döngüde)
+    # ============================================
+
+    async def aget_or_fetch(self, key: str, afetch, ttl: float = None, conditional: bool = False):
+        """
+        Önbellekten sun, gerekirse getir.
+        afetch() -> veri döndüren coroutine fonksiyonu; istisna yükseltebilir.
+        conditional=True ise afetch(önceki_kayıt) çağrılır ve (veri, meta)
+        döndürmelidir; meta (örn. ETag) bir sonraki koşullu istekte kullanılır.
+        -> (veri, yaş_saniye)
+
+        - taze kayıt: anında döner
+        - bayat ama max_stale içinde: anında döner, arka planda yenilenir
+        - yok / çok eski: getirilir; ağ hatasında eski kayıt sunulur
+        """
+        entry = self.get(key)
+
+        if entry is not None and self.is_fresh(entry, ttl):
+            self.metrics['hits'] += 1
+            return entry.data, entry.age
+
+        if entry is not None and entry.age <= self.max_stale:
+            self.metrics['stale_hits'] += 1
+            self.arefresh_background(key, afetch, conditional)
+            return entry.data, entry.age
+
+        self.metrics['misses'] += 1
+        try:
+            data = await self._arun_fetch(key, afetch, conditional)
+        except Exception:
+            if entry is not None:
+                # Çevrimdışı: son bilinen değeri yaşıyla birlikte sun
+                self.metrics['offline_hits'] += 1
+                return entry.data, entry.age
+            raise
+
+        return data, 0.0
+
+    async def _arun_fetch(self, key: str, afetch, conditional: bool):
+        """afetch'i çalıştır ve sonucu kaydet"""
+        if not conditional:
+            data = await afetch()
+            self.put(key, data)
+            return data
+
+        previous = self.get(key)
+        data, meta = await afetch(previous)
+        if previous is not None and data is previous.data:
+            # Sunucu "değişmedi" dedi (304)
+            self.metrics['revalidated'] += 1
+            self.touch(key)
+        else:
+            self.put(key, data, meta)
+        return data
+
+    async def arefresh(self, key: str, afetch, conditional: bool = False):
+        """Anahtarı şimdi yenile (async)"""
+        data = await self._arun_fetch(key, afetch, conditional)
+        self.metrics['refreshes'] += 1
+        return data
+
+    def arefresh_background(self, key: str, afetch, conditional: bool = False):
+        """Çalışan döngüde arka plan yenileme görevi başlat"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def worker():
+            try:
+                await self.arefresh(key, afetch, conditional)
+            except Exception as e:
+                print(f"⚠️ Arka plan yenileme hatası ({key}): {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        task = asyncio.ensure_future(worker())
+        # Görev referansı tutulmazsa toplanabilir
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # ============================================
+    # KALICILIK
+    # ============================================
+
+    def _load(self):
+        """Diskten yükle"""
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+                if raw.get('version') != self.version:
+                    # Eski biçim - yok say, yeniden getirilecek
+                    return
+                for key, item in raw['entries'].items():
+                    data = self.decode(item['data']) if self.decode else item['data']
+                    self._entries[key] = CacheEntry(data, item['stored_at'], item.get('meta'))
+        except:
+            self._entries = {}
+
+    def _schedule_save(self):
+        """Yazmayı biraz geciktirip birleştir"""
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self):
+        """Diske atomik olarak yaz"""
+        with self._lock:
+            self._save_timer = None
+            items = list(self._entries.items())
+
+        encode = self.encode or (lambda data: data)
+        raw = {
+            'version': self.version,
+            'entries': {key: {'data': encode(e.data), 'stored_at': e.stored_at, 'meta': e.meta}
+                        for key, e in items}
+        }
+
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(raw, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ Önbellek kaydedilemedi: {e}")
+
+    def get_stats(self) -> dict:
+        stats = dict(self.metrics)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['entries'] = len(self._entries)
+        stats['hit_rate'] = (stats['hits'] + stats['stale_hits']) / lookups if lookups else 0.0
+        return stats
+
+
+def format_age(seconds: float) -> str:
+    """Yaşı okunur metne çevir"""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "az önce"
+    if minutes < 60:
+        return f"{minutes} dk önce"
+    hours = minutes // 60
+    if hours < 24:
+        return f"{hours} saat önce"
+    return f"{hours // 24} gün önce"
@@ -0,0 +1,130 @@
+# src/api/results.py - ANDROID UYUMLU
+"""
+API sonuç nesneleri
+- 🧱 Hava durumu gözlemi ve haber listesi için tipli, slotlu veri sınıfları
+- 💾 Önbellek için sıkıştırılmış sözlük (to_dict / from_dict)
+- 🧊 Değişmez (frozen) - render önbelleğinde anahtar olarak kullanılabilir
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherObservation:
+    """Tek bir hava durumu gözlemi"""
+    city: str
+    description: str
+    temp: float
+    feels_like: float
+    humidity: int
+    icon: str = ''
+    observed_at: int = 0      # OpenWeather ölçüm zamanı (unix)
+    fetched_at: float = 0.0   # Bizim indirdiğimiz an (unix)
+
+    @classmethod
+    def from_openweather(cls, data: dict, fallback_city: str = ''):
+        """OpenWeather /weather yanıtından"""
+        weather = (data.get('weather') or [{}])[0]
+        main = data.get('main') or {}
+        return cls(
+            city=data.get('name') or fallback_city,
+            description=weather.get('description', ''),
+            temp=float(main.get('temp', 0.0)),
+            feels_like=float(main.get('feels_like', main.get('temp', 0.0))),
+            humidity=int(main.get('humidity', 0)),
+            icon=weather.get('icon', ''),
+            observed_at=int(data.get('dt', 0)),
+            fetched_at=time.time()
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'city': self.city,
+            'description': self.description,
+            'temp': self.temp,
+            'feels_like': self.feels_like,
+            'humidity': self.humidity,
+            'icon': self.icon,
+            'observed_at': self.observed_at,
+            'fetched_at': self.fetched_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**data)
+
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """Tek haber"""
+    title: str
+    source: str
+    published_at: str = ''
+    url: str = ''
+
+    @property
+    def date(self) -> str:
+        """Yayın tarihi (YYYY-AA-GG)"""
+        return self.published_at[:10]
+
+
+@dataclass(frozen=True, slots=True)
+class NewsResult:
+    """
+    Haber listesi.
+    kind: 'category' | 'search' | 'source'
+    query: istekteki kategori / arama / kaynak
+    label: gösterim adı (örn. '💻 Teknoloji')
+    """
+    kind: str
+    query: str
+    label: str
+    total_results: int = 0
+    articles: Tuple[Article, ...] = ()
+    fetched_at: float = 0.0
+
+    @classmethod
+    def from_newsapi(cls, data: dict, kind: str, query: str, label: str):
+        """NewsAPI yanıtından (status 'ok' değilse boş liste)"""
+        articles = ()
+        total = 0
+        if data.get('status') == 'ok':
+            total = int(data.get('totalResults') or 0)
+            articles = tuple(
+                Article(
+                    title=a.get('title') or '',
+                    source=(a.get('source') or {}).get('name') or '',
+                    published_at=a.get('publishedAt') or '',
+                    url=a.get('url') or ''
+                )
+                for a in data.get('articles') or []
+            )
+        return cls(kind, query, label, total, articles, time.time())
+
+    def to_dict(self) -> dict:
+        return {
+            'kind': self.kind,
+            'query': self.query,
+            'label': self.label,
+            'total_results': self.total_results,
+            # Makaleler satır olarak: [başlık, kaynak, tarih, url]
+            'articles': [[a.title, a.source, a.published_at, a.url] for a in self.articles],
+            'fetched_at': self.fetched_at
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            kind=data['kind'],
+            query=data['query'],
+            label=data['label'],
+            total_results=data.get('total_results', 0),
+            articles=tuple(Article(*row) for row in data.get('articles', [])),
+            fetched_at=data.get('fetched_at', 0.0)
+        )
+
+    @property
+    def empty(self) -> bool:
+        return self.total_results <= 0 or not self.articles
@@ -0,0 +1,168 @@
+# src/api/streaming.py - ANDROID UYUMLU
+"""
+LLM akış (streaming) yardımcıları
+- ✂️ Gelen parçalardan tamamlanmış cümleleri ayırma (TTS'e hemen verilir)
+- ⏱️ İlk token süresi (TTFT) ve toplam süre ölçümü
+- 🧵 Async akışı senkron koddan geri çağrılarla tüketme
+- 🚦 Geri çağrılar ortak döngüde değil, ayrı sıralı bir thread'de çalışır (UI işi döngüyü bekletmez)
+"""
+
+import re
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.api.async_runtime import run_sync
+
+# Akış geri çağrıları için tek işçi: sıra korunur, olay döngüsü hiç bloklanmaz
+_CALLBACKS = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-callback")
+
+# Cümle sonu: noktalama + boşluk (rakamdan sonraki nokta "1." sayılmaz) veya satır sonu
+_SENTENCE_END = re.compile(r'(?<!\d)[.!?…]+["\')\]]*\s+|\n+')
+
+# TTS'e gitmemesi gereken Markdown işaretleri
+_MARKDOWN = re.compile(r'[*_`#]+|^\s*[-•]\s+', re.MULTILINE)
+
+
+def clean_for_speech(text: str) -> str:
+    """Markdown işaretlerini konuşma metninden temizle"""
+    return " ".join(_MARKDOWN.sub("", text).split())
+
+
+class SentenceSplitter:
+    """
+    Akan metni cümlelere böler.
+    Çok kısa parçalar ("Evet.") bir sonrakiyle birleştirilir ki
+    TTS her kelime için ayrı dosya üretmesin.
+    """
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self.buffer = ""
+
+    def feed(self, text: str) -> list:
+        """Yeni parçayı ekle -> tamamlanan cümleler"""
+        self.buffer += text
+        sentences = []
+        cut = 0
+        for match in _SENTENCE_END.finditer(self.buffer):
+            piece = self.buffer[cut:match.end()].strip()
+            if len(piece) >= self.min_chars:
+                sentences.append(piece)
+                cut = match.end()
+        self.buffer = self.buffer[cut:]
+        return sentences
+
+    def flush(self) -> str:
+        """Akış bitti, kalan metni döndür"""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return rest
+
+
+class _CallbackLane:
+    """
+    Bir akışın geri çağrılarını _CALLBACKS thread'ine taşır.
+    on_text birleştirilir: işçi geride kalırsa yalnız en güncel metin gönderilir.
+    """
+
+    def __init__(self, on_text=None, on_sentence=None):
+        self.on_text = on_text
+        self.on_sentence = on_sentence
+        self._latest_text = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _call(fn, value):
+        try:
+            fn(value)
+        except Exception as e:
+            print(f"⚠️ Akış geri çağrısı hatası: {e}")
+
+    def text(self, text: str):
+        if not self.on_text:
+            return
+        with self._lock:
+            pending = self._latest_text is not None
+            self._latest_text = text
+        if not pending:
+            _CALLBACKS.submit(self._deliver_text)
+
+    def _deliver_text(self):
+        with self._lock:
+            text, self._latest_text = self._latest_text, None
+        if text is not None:
+            self._call(self.on_text, text)
+
+    def sentence(self, sentence: str):
+        if self.on_sentence:
+            _CALLBACKS.submit(self._call, self.on_sentence, sentence)
+
+    async def drain(self):
+        """Sıradaki tüm geri çağrılar bitene kadar (döngüyü bloklamadan) bekle"""
+        await asyncio.wrap_future(_CALLBACKS.submit(lambda: None))
+
+
+class StreamResult:
+    """Tamamlanan akışın metni ve zamanlaması"""
+
+    __slots__ = ('text', 'ttft_ms', 'total_ms', 'chunks', 'error')
+
+    def __init__(self):
+        self.text = ""
+        self.ttft_ms = None
+        self.total_ms = 0.0
+        self.chunks = 0
+        self.error = None
+
+    def summary(self) -> str:
+        ttft = f"{self.ttft_ms:.0f} ms" if self.ttft_ms is not None else "-"
+        return f"⚡ İlk token: {ttft} | Toplam: {self.total_ms:.0f} ms ({self.chunks} parça)"
+
+
+async def consume(agen, on_text=None, on_sentence=None) -> StreamResult:
+    """
+    Async parça üretecini tüket.
+    on_text(birikmiş_metin): parçalar geldikçe (işçi geride kalırsa birleştirilir)
+    on_sentence(cümle): her tamamlanan cümlede (Markdown temizlenmiş)
+    Geri çağrılar ayrı bir thread'de sırayla çalışır; dönmeden önce hepsi biter.
+    """
+    result = StreamResult()
+    splitter = SentenceSplitter()
+    lane = _CallbackLane(on_text, on_sentence)
+    parts = []
+    started = time.perf_counter()
+
+    def emit_sentence(sentence: str):
+        spoken = clean_for_speech(sentence)
+        if spoken:
+            lane.sentence(spoken)
+
+    try:
+        async for chunk in agen:
+            if not chunk:
+                continue
+            if result.ttft_ms is None:
+                result.ttft_ms = (time.perf_counter() - started) * 1000
+            result.chunks += 1
+            parts.append(chunk)
+            lane.text("".join(parts))
+            for sentence in splitter.feed(chunk):
+                emit_sentence(sentence)
+    except Exception as e:
+        result.error = e
+
+    rest = splitter.flush()
+    if rest:
+        emit_sentence(rest)
+
+    await lane.drain()
+    result.text = "".join(parts)
+    result.total_ms = (time.perf_counter() - started) * 1000
+    return result
+
+
+def stream_sync(agen, on_text=None, on_sentence=None) -> StreamResult:
+    """consume'un senkron sarmalayıcısı (geri çağrılar akış thread'inde çalışır)"""
+    return run_sync(consume(agen, on_text, on_sentence))
@@ -1,13 +1,24 @@
 # src/api/weather.py - ANDROID UYUMLU
 """
-Hava Durumu API - Senkron versiyon
+Hava Durumu API - Async çekirdek + senkron sarmalayıcılar
+- ⏳ TTL önbellek + arka planda yenileme (stale-while-revalidate)
+- 💾 Son bilinen hava durumu diske kaydedilir (çevrimdışı kullanım)
+- 🧱 fetch_* yapılandırılmış WeatherObservation döndürür, get_* Markdown
 """
 
 import os
 import sys
+import time
+import unicodedata
 import requests
 from dotenv import load_dotenv
 
+from src.api.http_client import AsyncHttpClient, get_async_http_client
+from src.api.async_runtime import run_sync
+from src.api.response_cache import ResponseCache, default_cache_dir
+from src.api.results import WeatherObservation
+from src.api import render
+
 # Android tespiti
 IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
 
@@ -19,12 +30,28 @@ else:
     load_dotenv()
 
 
+class WeatherAPIError(Exception):
+    """OpenWeather 200 dışı yanıt"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
 class WeatherAPI:
-    """Hava durumu sorgulama (senkron)"""
+    """Hava durumu sorgulama (a* metotları async, diğerleri senkron sarmalayıcı)"""
     
-    def __init__(self):
+    def __init__(self, http: AsyncHttpClient = None, base_url: str = None, cache_ttl: float = None):
         self.api_key = os.getenv("OPENWEATHER_API_KEY")
-        self.base_url = "http://api.openweathermap.org/data/2.5"
+        # Testlerde yerel sahte sunucuya yönlendirilebilir
+        self.base_url = base_url or os.getenv("OPENWEATHER_BASE_URL", "http://api.openweathermap.org/data/2.5")
+        self.http = http or get_async_http_client()
+        
+        # Hava durumu birkaç dakikada bir değişir; varsayılan 10 dk
+        ttl = cache_ttl if cache_ttl is not None else float(os.getenv("WEATHER_CACHE_TTL", 600))
+        self.cache = ResponseCache(default_cache_dir() / "weather.json", ttl=ttl,
+                                   encode=WeatherObservation.to_dict,
+                                   decode=WeatherObservation.from_dict, version=2)
         
         if self.api_key:
             print("✅ Weather API hazır")
@@ -32,81 +59,101 @@ class WeatherAPI:
         else:
             print("⚠️ OPENWEATHER_API_KEY bulunamadı")
     
-    def get_weather(self, city: str = "İstanbul") -> str:
-        """Şehir için hava durumu (senkron)"""
+    @staticmethod
+    def _city_key(city: str) -> str:
+        """Şehir adını önbellek anahtarına çevir (Türkçe büyük/küçük harf duyarsız)"""
+        city = unicodedata.normalize('NFC', city.strip())
+        city = city.replace('İ', 'i').replace('I', 'ı').lower()
+        return "city:" + " ".join(city.split())
+    
+    @staticmethod
+    def _location_key(lat: float, lon: float) -> str:
+        """Koordinatları ~1 km hassasiyete yuvarla"""
+        return f"loc:{round(lat, 2):.2f},{round(lon, 2):.2f}"
+    
+    async def _afetch(self, params: dict, fallback_city: str = '') -> WeatherObservation:
+        """OpenWeather'dan getir ve gözleme çevir"""
+        url = f"{self.base_url}/weather"
+        params = dict(params, appid=self.api_key, units='metric', lang='tr')
+        response = await self.http.get(url, params=params)
+        if response.status_code != 200:
+            raise WeatherAPIError(response.status_code)
+        return WeatherObservation.from_openweather(response.json(), fallback_city)
+    
+    # ============================================
+    # YAPILANDIRILMIŞ API
+    # ============================================
+    
+    async def afetch_weather(self, city: str = "İstanbul") -> WeatherObservation:
+        """Şehir için gözlem (önbellekli). Hata durumunda istisna yükseltir."""
         if not self.api_key:
-            return "❌ OpenWeather API anahtarı gerekli."
-        
-        try:
-            url = f"{self.base_url}/weather"
-            params = {
-                'q': city,
-                'appid': self.api_key,
-                'units': 'metric',
-                'lang': 'tr'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                temp = data['main']['temp']
-                feels_like = data['main']['feels_like']
-                humidity = data['main']['humidity']
-                description = data['weather'][0]['description']
-                
-                # Şehir adını düzgün göster
-                city_name = data.get('name', city)
-                
-                return f"""🌤️ **{city_name} Hava Durumu**
-
-📍 {description.title()}
-🌡️ Sıcaklık: {temp:.1f}°C
-💧 Nem: %{humidity}
-🤔 Hissedilen: {feels_like:.1f}°C"""
-            
-            elif response.status_code == 404:
+            raise WeatherAPIError(401)
+        obs, _ = await self.cache.aget_or_fetch(
+            self._city_key(city),
+            lambda: self._afetch({'q': city}, city)
+        )
+        return obs
+    
+    async def afetch_weather_by_location(self, lat: float, lon: float) -> WeatherObservation:
+        """Konum için gözlem (önbellekli). Hata durumunda istisna yükseltir."""
+        if not self.api_key:
+            raise WeatherAPIError(401)
+        obs, _ = await self.cache.aget_or_fetch(
+            self._location_key(lat, lon),
+            lambda: self._afetch({'lat': lat, 'lon': lon}, 'Bulunduğunuz konum')
+        )
+        return obs
+    
+    def fetch_weather(self, city: str = "İstanbul") -> WeatherObservation:
+        return run_sync(self.afetch_weather(city))
+    
+    def fetch_weather_by_location(self, lat: float, lon: float) -> WeatherObservation:
+        return run_sync(self.afetch_weather_by_location(lat, lon))
+    
+    def freshness_note(self, obs: WeatherObservation) -> str:
+        """Veri bayatsa yaşını belirt"""
+        return render.freshness_note(obs.fetched_at, self.cache.ttl, time.time())
+    
+    def error_message(self, error: Exception, city: str = None) -> str:
+        """fetch_* istisnasını kullanıcı mesajına çevir"""
+        if isinstance(error, WeatherAPIError):
+            if error.status_code == 401 and not self.api_key:
+                return "❌ OpenWeather API anahtarı gerekli."
+            if city is None:
+                return "❌ Konum bilgisi alınamadı"
+            if error.status_code == 404:
                 return f"❌ Şehir bulunamadı: {city}"
-            else:
-                return f"❌ Hava durumu alınamadı (Hata: {response.status_code})"
-                
-        except requests.exceptions.Timeout:
+            return f"❌ Hava durumu alınamadı (Hata: {error.status_code})"
+        if isinstance(error, requests.exceptions.Timeout):
             return "⏱️ Hava durumu servisi zaman aşımı"
-        except requests.exceptions.ConnectionError:
+        if isinstance(error, requests.exceptions.ConnectionError):
             return "❌ İnternet bağlantısı yok"
+        return f"❌ Hava durumu hatası: {error}"
+    
+    # ============================================
+    # METİN API (eski arayüz)
+    # ============================================
+    
+    async def aget_weather(self, city: str = "İstanbul") -> str:
+        """Şehir için hava durumu (async, önbellekli)"""
+        try:
+            obs = await self.afetch_weather(city)
+            return render.weather_markdown(obs) + self.freshness_note(obs)
         except Exception as e:
-            return f"❌ Hava durumu hatası: {e}"
+            return self.error_message(e, city)
     
-    def get_weather_by_location(self, lat: float, lon: float) -> str:
-        """Konuma göre hava durumu (senkron)"""
-        if not self.api_key:
-            return "❌ OpenWeather API anahtarı gerekli."
-        
+    async def aget_weather_by_location(self, lat: float, lon: float) -> str:
+        """Konuma göre hava durumu (async, önbellekli)"""
         try:
-            url = f"{self.base_url}/weather"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.api_key,
-                'units': 'metric',
-                'lang': 'tr'
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                city = data.get('name', 'Bulunduğunuz konum')
-                temp = data['main']['temp']
-                description = data['weather'][0]['description']
-                
-                return f"""📍 **{city}**
-🌤️ {description.title()}
-🌡️ {temp:.1f}°C"""
-            else:
-                return "❌ Konum bilgisi alınamadı"
-                
+            obs = await self.afetch_weather_by_location(lat, lon)
+            return render.weather_location_markdown(obs) + self.freshness_note(obs)
         except Exception as e:
-            return f"❌ Hava durumu hatası: {e}"
\ No newline at end of file
+            return self.error_message(e)
+    
+    def get_weather(self, city: str = "İstanbul") -> str:
+        """Şehir için hava durumu (senkron, önbellekli)"""
+        return run_sync(self.aget_weather(city))
+    
+    def get_weather_by_location(self, lat: float, lon: float) -> str:
+        """Konuma göre hava durumu (senkron, önbellekli)"""
+        return run_sync(self.aget_weather_by_location(lat, lon))
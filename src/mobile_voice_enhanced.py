@@ -3,7 +3,7 @@
 A.N.N.A Mobile Gelişmiş Ses Motoru
 - 🎙️ Wake word (Jarvis, Bilgisayar, Alexa)
 - 🗣️ Doğal ses sentezi (Edge-TTS + gTTS yedek)
-- 👂 Ses tanıma (Google Speech)
+- 👂 Ses tanıma (Google Speech + çevrimdışı Vosk/Whisper)
 - 📊 Ses seviyesi göstergesi
 - 🔇 Sessiz mod
 - 💬 Konuşma geçmişi
@@ -14,12 +14,20 @@ import sys
 import asyncio
 import tempfile
 import threading
-import queue
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+from src.models.voice_history import VoiceHistoryLog
+from src.models.noise_floor import NoiseFloorEstimator
+from src.models.vad import VoiceActivityDetector, Endpointer, EchoGate
+from src.models.audio_capture import AudioCaptureService
+from src.models.recognition import RecognitionRouter, PartialTranscript
+from src.models.speech_scheduler import SpeechScheduler, PRIORITY_NORMAL
+
 # Android tespiti
 IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
 
@@ -83,13 +91,46 @@ class VoiceEngineEnhanced:
         # Temel bileşenler
         self.recognizer = sr.Recognizer() if SR_AVAILABLE else None
         self.microphone = None
+        
+        # Ortak mikrofon akışı (wake word, dinleme ve seviye göstergesi paylaşır)
+        self.capture = AudioCaptureService(sample_rate=16000, blocksize=512) if SOUNDDEVICE_AVAILABLE else None
+        self._pending_wake_seq = None
+        self._pending_wake_time = 0
         self._init_microphone()
         
+        # Tanıma arka uçları (yerel Vosk/Whisper + Google)
+        self.stt = RecognitionRouter(self.data_dir, recognizer=self.recognizer)
+        # Ara sonuç modeli arka planda yüklenir (ilk dinlemede yakalama beklemesin)
+        self.stt.warm_streaming()
+        
+        # Konuşma algılama (VAD) ve konuşma sonu tespiti
+        # Yankı kapısı: TTS çalarken dinleme paralel yürüyebilir
+        self.echo_gate = EchoGate()
+        self.vad = VoiceActivityDetector(sample_rate=16000, noise_floor=self.noise_floor,
+                                         echo_gate=self.echo_gate)
+        self.vad_config = {
+            'pre_roll_ms': 300,   # konuşma öncesi tampon
+            'start_ms': 64,       # konuşma başlangıcı için gereken süre
+            'hangover_ms': 400    # konuşma sonu için gereken sessizlik
+        }
+        self.latency_samples = deque(maxlen=50)
+        self._speech_ended_at = None
+        
         # Wake word
         self.porcupine = None
         self.wake_active = False
         self.wake_callback = None
         self.wake_keywords = ["jarvis", "computer", "alexa", "bilgisayar"]
+        self.wake_refractory = 1.5  # algılamadan sonra yok sayılan süre (sn)
+        self._last_wake_time = 0
+        self._wake_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wake-callback")
+        self.wake_metrics = {
+            'frames': 0,
+            'cpu_seconds': 0.0,
+            'audio_seconds': 0.0,
+            'suppressed': 0,
+            'dropped_frames': 0
+        }
         self._init_wake_word()
         
         # PYGAME MİXER'ı BAŞLAT (Android'de farklı ayarlar)
@@ -106,7 +147,9 @@ class VoiceEngineEnhanced:
                 print(f"⚠️ Pygame mixer hatası: {e}")
         
         # Ses kuyruğu
-        self.sound_queue = queue.Queue()
+        # Öncelikli konuşma kuyruğu (eski cevaplar yenileriyle değişir)
+        self.sound_queue = SpeechScheduler(max_age=20.0, on_preempt=self._on_preempt)
+        self.current_speech = None
         self.is_playing = False
         self.sound_thread = threading.Thread(target=self._sound_worker, daemon=True)
         self.sound_thread.start()
@@ -126,11 +169,6 @@ class VoiceEngineEnhanced:
         }
         self.current_voice = 'tr-TR-DenizNeural'
         
-        # Konuşma geçmişi
-        self.history = []
-        self.history_file = self.data_dir / "voice_history.json"
-        self._load_history()
-        
         # İstatistikler
         self.stats = {
             'words_spoken': 0,
@@ -139,6 +177,14 @@ class VoiceEngineEnhanced:
             'wake_word_triggers': 0
         }
         
+        # Konuşma geçmişi (append-only JSONL, arka planda yazılır)
+        self.history = []
+        self.history_limit = 100
+        self.history_file = self.data_dir / "voice_history.jsonl"
+        self.history_log = VoiceHistoryLog(self.history_file, max_entries=self.history_limit)
+        self.history_log.import_legacy(self.data_dir / "voice_history.json")
+        self._load_history()
+        
         print("\n" + "="*50)
         print("🎤 A.N.N.A GELİŞMİŞ SES MOTORU")
         print("="*50)
@@ -150,7 +196,13 @@ class VoiceEngineEnhanced:
         print("="*50)
     
     def _init_microphone(self):
-        """Mikrofonu başlat (Android'de farklı)"""
+        """Mikrofonu başlat (kalibrasyon arka planda, başlangıcı bekletmez)"""
+        # Gürültü tabanı: kayıtlı kalibrasyon anında uygulanır
+        self.noise_floor = NoiseFloorEstimator(
+            self.data_dir / "mic_calibration.json",
+            recognizer=self.recognizer
+        )
+        
         if not SR_AVAILABLE:
             return
         
@@ -161,15 +213,39 @@ class VoiceEngineEnhanced:
             else:
                 self.microphone = sr.Microphone()
             
-            with self.microphone as source:
-                print("🎤 Mikrofon kalibre ediliyor...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                self.recognizer.energy_threshold = 3000
-                self.recognizer.dynamic_energy_threshold = True
-                print("✅ Mikrofon hazır")
+            # Kalibrasyon gelene kadar recognizer kendisi uyarlar; sonra eşik gürültü tabanından
+            self.recognizer.dynamic_energy_threshold = not self.noise_floor.calibrated
+            
+            if self.noise_floor.calibrated:
+                print(f"✅ Mikrofon hazır (kayıtlı eşik: {self.noise_floor.energy_threshold:.0f})")
+            else:
+                # İlk çalıştırma: kalibrasyonu arka planda yap
+                threading.Thread(target=self._initial_calibration, daemon=True).start()
+                print("✅ Mikrofon hazır (kalibrasyon arka planda)")
         except Exception as e:
             print(f"❌ Mikrofon hatası: {e}")
     
+    def _initial_calibration(self, duration: float = 1.0):
+        """İlk kalibrasyon (arka plan thread'i)"""
+        try:
+            if self.capture is not None:
+                reader = self.capture.reader()
+                for _ in range(int(duration / self.capture.frame_seconds)):
+                    frame, _ = reader.read(timeout=1.0)
+                    if frame is None:
+                        break
+                    self.noise_floor.update(frame)
+                reader.close()
+            else:
+                with self.microphone as source:
+                    self.recognizer.adjust_for_ambient_noise(source, duration=duration)
+                self.noise_floor.update_rms(self.recognizer.energy_threshold / self.noise_floor.ratio)
+            
+            self.noise_floor.save()
+            print(f"🎤 Mikrofon kalibre edildi (eşik: {self.noise_floor.energy_threshold:.0f})")
+        except Exception as e:
+            print(f"⚠️ Mikrofon kalibrasyon hatası: {e}")
+    
     def _init_wake_word(self):
         """Wake word sistemini başlat (Android'de PICOVOICE_ACCESS_KEY gerekli)"""
         if not PORCUPINE_AVAILABLE:
@@ -195,25 +271,39 @@ class VoiceEngineEnhanced:
         """Ses çalma worker'ı"""
         while True:
             try:
-                text, voice, speed = self.sound_queue.get(timeout=1)
+                handle = self.sound_queue.get(timeout=1)
+                if handle is None:
+                    continue
+                
+                self.current_speech = handle
                 self.is_playing = True
                 
                 if not self.muted:
                     # Her konuşma için yeni event loop
                     loop = asyncio.new_event_loop()
                     asyncio.set_event_loop(loop)
-                    loop.run_until_complete(self._speak_async(text, voice, speed))
+                    loop.run_until_complete(self._speak_async(handle.text, handle.voice, handle.speed))
                     loop.close()
                 else:
-                    print(f"🔇 [SESSİZ] A.N.N.A: {text}")
+                    print(f"🔇 [SESSİZ] A.N.N.A: {handle.text}")
                 
                 self.is_playing = False
-                self.sound_queue.task_done()
-            except queue.Empty:
-                continue
+                self.current_speech = None
+                self.sound_queue.done(handle)
             except Exception as e:
                 print(f"❌ Ses worker hatası: {e}")
                 self.is_playing = False
+                if self.current_speech is not None:
+                    self.sound_queue.done(self.current_speech)
+                    self.current_speech = None
+    
+    def _on_preempt(self, handle):
+        """Daha öncelikli konuşma geldi, çalanı kes"""
+        if PYGAME_AVAILABLE and self.current_speech is handle:
+            try:
+                pygame.mixer.music.stop()
+            except:
+                pass
     
     async def _speak_async(self, text: str, voice: str = None, speed: float = 1.0):
         """Asenkron konuşma"""
@@ -242,13 +332,7 @@ class VoiceEngineEnhanced:
                     await communicate.save(temp_file)
                     
                     if PYGAME_AVAILABLE and os.path.exists(temp_file):
-                        pygame.mixer.music.load(temp_file)
-                        pygame.mixer.music.set_volume(self.volume)
-                        pygame.mixer.music.play()
-                        
-                        # Ses bitene kadar bekle
-                        while pygame.mixer.music.get_busy():
-                            await asyncio.sleep(0.1)
+                        await self._play_file(temp_file)
                         
                         # Dosyayı sil
                         try:
@@ -268,12 +352,7 @@ class VoiceEngineEnhanced:
                     tts.save(temp_file)
                     
                     if PYGAME_AVAILABLE and os.path.exists(temp_file):
-                        pygame.mixer.music.load(temp_file)
-                        pygame.mixer.music.set_volume(self.volume)
-                        pygame.mixer.music.play()
-                        
-                        while pygame.mixer.music.get_busy():
-                            await asyncio.sleep(0.1)
+                        await self._play_file(temp_file)
                         
                         try:
                             os.unlink(temp_file)
@@ -298,132 +377,351 @@ class VoiceEngineEnhanced:
                 except:
                     pass
     
-    def speak(self, text: str, wait: bool = False):
-        """Konuş"""
-        if not text:
+    async def _play_file(self, path: str):
+        """Ses dosyasını çal; çalma süresince yankı kapısı açık kalır"""
+        handle = self.current_speech
+        if handle is not None and handle.cancelled:
+            # Sentez sırasında iptal edildi / yenisiyle değişti
             return
         
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(self.volume)
+        self.echo_gate.playback_started()
+        try:
+            pygame.mixer.music.play()
+            
+            # Ses bitene (veya konuşma iptal edilene) kadar bekle
+            while pygame.mixer.music.get_busy():
+                if handle is not None and handle.cancelled:
+                    pygame.mixer.music.stop()
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            self.echo_gate.playback_stopped()
+    
+    def speak(self, text: str, wait: bool = False, priority: int = PRIORITY_NORMAL,
+              key: str = None, max_age: float = None, preempt: bool = False):
+        """
+        Konuş.
+        priority: yüksek öncelik önce okunur (ve daha düşük önceliği keser)
+        key: aynı anahtarlı, henüz okunmamış eski cevap iptal edilir (örn. 'hava')
+        max_age: bu kadar saniye bekleyen konuşma atılır
+        preempt: aynı anahtarlı konuşma çalıyorsa onu da kes
+        -> SpeechHandle (cancel() / wait())
+        """
+        if not text:
+            return None
+        
         print(f"🗣️ A.N.N.A: {text}")
-        self.sound_queue.put((text, self.current_voice, self.speed))
+        handle = self.sound_queue.submit(text, self.current_voice, self.speed,
+                                         priority=priority, key=key,
+                                         max_age=max_age, preempt=preempt)
         
         if wait:
-            while self.is_busy():
-                time.sleep(0.1)
+            handle.wait()
+        return handle
     
-    def speak_with_voice(self, text: str, voice: str, wait: bool = False):
+    def speak_with_voice(self, text: str, voice: str, wait: bool = False,
+                         priority: int = PRIORITY_NORMAL, key: str = None):
         """Belirli bir sesle konuş"""
-        if voice in self.voices:
-            self.sound_queue.put((text, voice, self.speed))
+        if not text or voice not in self.voices:
+            return None
+        
+        handle = self.sound_queue.submit(text, voice, self.speed, priority=priority, key=key)
+        if wait:
+            handle.wait()
+        return handle
+    
+    def stop_speaking(self):
+        """Çalanı kes ve bekleyen tüm konuşmaları iptal et"""
+        self.sound_queue.cancel_all()
+        if self.current_speech is not None:
+            self.current_speech.cancel()
     
-    def listen(self, timeout: int = 5, phrase_limit: int = 10) -> str:
-        """Dinle ve metne çevir"""
-        if not SR_AVAILABLE or not self.microphone:
+    def listen(self, timeout: int = 5, phrase_limit: int = 10, start_seq: int = None,
+               mode: str = "command", on_partial=None) -> str:
+        """
+        Dinle ve metne çevir.
+        start_seq verilirse (veya az önce wake word algılandıysa) ortak
+        tampondaki o kareden itibaren okunur; komut boşluksuz yakalanır.
+        mode: 'command' (kısa komut, önce yerel model) veya 'dictation' (önce bulut)
+        on_partial(metin, kararlı_önek): konuşma sürerken ara sonuçlar
+        """
+        if self.capture is None and (not SR_AVAILABLE or not self.microphone):
             return ""
         
         self.stats['listening_sessions'] += 1
         
         try:
-            with self.microphone as source:
-                print("🎤 Dinliyorum...")
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                audio = self.recognizer.listen(
-                    source, 
-                    timeout=timeout,
-                    phrase_time_limit=phrase_limit
-                )
+            if self.capture is not None:
+                # Akış halinde VAD: konuşma biter bitmez tanımaya gönder
+                if start_seq is None:
+                    start_seq = self._take_pending_wake_seq()
+                captured = self._capture_utterance(timeout, phrase_limit, start_seq, on_partial)
+                if captured is None:
+                    return ""
+                pcm, sample_rate, streamed_text = captured
+            else:
+                with self.microphone as source:
+                    print("🎤 Dinliyorum...")
+                    # Eşik arka planda güncel tutuluyor, kalibrasyon beklenmez
+                    try:
+                        audio = self.recognizer.listen(
+                            source, 
+                            timeout=timeout,
+                            phrase_time_limit=phrase_limit
+                        )
+                    except sr.WaitTimeoutError:
+                        return ""
+                self._speech_ended_at = time.monotonic()
+                pcm, sample_rate = audio.get_raw_data(), audio.sample_rate
+                streamed_text = ""
             
-            text = self.recognizer.recognize_google(audio, language="tr-TR")
-            print(f"📝 Anlaşılan: {text}")
+            route = self.stt.route(len(pcm) / 2 / sample_rate, mode)
+            if streamed_text and route and route[0].supports_streaming:
+                # Akış sonucu zaten birincil arka uçtan geldi, tekrar tanıma yok
+                text = streamed_text
+                self.stt.last_backend = route[0].name
+            else:
+                text = self.stt.recognize(pcm, sample_rate, mode=mode)
+            self._record_latency()
+            if not text:
+                return ""
+            print(f"📝 Anlaşılan ({self.stt.last_backend}): {text}")
             return text.lower()
             
-        except sr.WaitTimeoutError:
-            return ""
-        except sr.UnknownValueError:
-            return ""
         except Exception as e:
             print(f"❌ Dinleme hatası: {e}")
             return ""
     
+    def _capture_utterance(self, timeout: float, phrase_limit: float, start_seq: int = None,
+                           on_partial=None):
+        """
+        Ortak akışın kareleri üzerinden VAD ile tek bir ifadeyi yakala
+        -> (pcm, sample_rate, akış_metni) veya None
+        """
+        capture = self.capture
+        endpointer = Endpointer(
+            self.vad,
+            frame_ms=capture.frame_seconds * 1000,
+            pre_roll_ms=self.vad_config['pre_roll_ms'],
+            start_ms=self.vad_config['start_ms'],
+            hangover_ms=self.vad_config['hangover_ms'],
+            timeout=timeout,
+            phrase_limit=phrase_limit
+        )
+        
+        # Ara sonuçlar için akış destekli arka uç; model henüz yükleniyorsa
+        # bu ifade akışsız tanınır (kare okuma döngüsü model yüklemesini beklemez)
+        streaming = self.stt.streaming_backend() if on_partial else None
+        if streaming is not None and not streaming.ready:
+            self.stt.warm_streaming()
+            streaming = None
+        session = None
+        transcript = PartialTranscript()
+        
+        print("🎤 Dinliyorum...")
+        reader = capture.reader(start_seq)
+        try:
+            while True:
+                frame, seq = reader.read(timeout=1.0)
+                if frame is None:
+                    if not capture.running:
+                        return None
+                    continue
+                
+                # Karenin yakalandığı an TTS çalıyorsa yankı kapısından geçer
+                captured_at = capture.ring.time_of(seq)
+                event = endpointer.feed(frame, captured_at)
+                
+                if endpointer.is_idle_frame() and not self.echo_gate.is_active(captured_at):
+                    self.noise_floor.update(frame)
+                
+                if event == 'timeout':
+                    return None
+                
+                if streaming is not None and endpointer.in_speech:
+                    try:
+                        if event == 'start':
+                            session = streaming.open_stream(capture.sample_rate)
+                            chunks = endpointer.frames
+                        else:
+                            chunks = [frame]
+                        for chunk in chunks:
+                            partial = session.feed(chunk.tobytes())
+                        if transcript.update(partial):
+                            self._emit_partial(on_partial, transcript)
+                    except Exception as e:
+                        # Akış bozuldu: ifade yine yakalanır, sonunda akışsız tanınır
+                        print(f"⚠️ Ara sonuç akışı kapandı: {e}")
+                        streaming = None
+                        session = None
+                
+                if event == 'end':
+                    break
+        finally:
+            reader.close()
+        
+        self._speech_ended_at = endpointer.speech_ended_at
+        streamed_text = ""
+        if session is not None:
+            try:
+                streamed_text = session.finish()
+            except Exception as e:
+                print(f"⚠️ Ara sonuç akışı tamamlanamadı: {e}")
+        return endpointer.audio_bytes(), capture.sample_rate, streamed_text
+    
+    def _emit_partial(self, on_partial, transcript: PartialTranscript):
+        """Ara sonucu çağırana ilet (hatası dinlemeyi bozmaz)"""
+        try:
+            on_partial(transcript.text, transcript.stable_prefix)
+        except Exception as e:
+            print(f"⚠️ Ara sonuç callback hatası: {e}")
+    
+    def _take_pending_wake_seq(self, max_age: float = 3.0):
+        """Son wake word'ün kare numarasını al (tazeyse)"""
+        seq = self._pending_wake_seq
+        self._pending_wake_seq = None
+        if seq is None or time.monotonic() - self._pending_wake_time > max_age:
+            return None
+        return seq
+    
+    def _record_latency(self):
+        """Konuşma sonu -> tanıma sonucu gecikmesini kaydet"""
+        if self._speech_ended_at is None:
+            return
+        latency_ms = (time.monotonic() - self._speech_ended_at) * 1000
+        self.latency_samples.append(latency_ms)
+        self._speech_ended_at = None
+    
+    def get_latency_stats(self) -> dict:
+        """Konuşma sonu -> sonuç gecikme özeti (ms)"""
+        samples = sorted(self.latency_samples)
+        if not samples:
+            return {'count': 0, 'avg_ms': 0, 'p95_ms': 0, 'last_ms': 0}
+        return {
+            'count': len(samples),
+            'avg_ms': sum(samples) / len(samples),
+            'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'last_ms': self.latency_samples[-1]
+        }
+    
+    def start_level_meter(self) -> bool:
+        """Arayüz dalga göstergesi için seviye aboneliği (ortak akış yoksa False)"""
+        if self.capture is None:
+            return False
+        self.capture.subscribe_level_meter()
+        return True
+    
+    def stop_level_meter(self):
+        if self.capture is not None:
+            self.capture.unsubscribe_level_meter()
+    
+    def input_levels(self, count: int) -> list:
+        """Son count ses karesinin seviyesi (0.0-1.0, eskiden yeniye)"""
+        if self.capture is None:
+            return []
+        return self.capture.recent_levels(count)
+    
     def listen_with_indicator(self, timeout: int = 5):
         """Ses seviyesi göstergeli dinleme"""
-        if not SOUNDDEVICE_AVAILABLE:
+        if self.capture is None:
             return self.listen(timeout)
         
         print("🎤 Dinliyor... (ses seviyesi gösteriliyor)")
-        result = [""]  # Thread'ler arası iletişim için
         
-        def audio_callback(indata, frames, time_info, status):
-            volume_norm = np.linalg.norm(indata) * 10
+        # Gösterge ayrı bir akış açmaz, ortak akışa abone olur
+        def on_frame(frame, seq):
+            volume_norm = np.linalg.norm(frame.astype(np.float32) / 32768.0) * 10
             bars = int(volume_norm)
             print(f"\r{'█' * min(bars, 50)}", end='', flush=True)
         
-        def listen_thread():
-            result[0] = self.listen(timeout)
-        
-        thread = threading.Thread(target=listen_thread)
-        thread.start()
-        
-        with sd.InputStream(callback=audio_callback, channels=1):
-            thread.join(timeout=timeout+1)
+        self.capture.subscribe('indicator', on_frame)
+        try:
+            result = self.listen(timeout)
+        finally:
+            self.capture.unsubscribe('indicator')
         
         print()  # Yeni satır
-        return result[0]
+        return result
     
     def start_wake_word(self, callback):
         """Wake word dinlemeyi başlat"""
-        if not self.porcupine:
+        if not self.porcupine or self.capture is None:
+            return False
+        
+        if self.porcupine.frame_length != self.capture.blocksize or self.porcupine.sample_rate != self.capture.sample_rate:
+            print("❌ Wake word kare boyutu ortak akışla uyumsuz")
             return False
         
         self.wake_callback = callback
         self.wake_active = True
-        threading.Thread(target=self._wake_loop, daemon=True).start()
+        # Ses thread'i bloklanmaz: kareler abone thread'inde işlenir
+        self._wake_reader = self.capture.subscribe('wake_word', self._on_wake_frame)
         print("🔊 Wake word dinleniyor... ('Jarvis' deyin)")
         return True
     
-    def _wake_loop(self):
-        """Wake word döngüsü"""
-        if not self.porcupine or not SOUNDDEVICE_AVAILABLE:
+    def _on_wake_frame(self, frame, seq):
+        """Her ses karesi için çağrılır (abone thread'i)"""
+        if not self.wake_active or len(frame) != self.porcupine.frame_length:
+            return
+        
+        start = time.thread_time()
+        result = self.porcupine.process(frame)
+        self.wake_metrics['cpu_seconds'] += time.thread_time() - start
+        self.wake_metrics['frames'] += 1
+        self.wake_metrics['audio_seconds'] += self.capture.frame_seconds
+        
+        # Wake word akışı gürültü tabanını da besler (kendi sesimiz hariç)
+        if not self.echo_gate.is_active(self.capture.ring.time_of(seq)):
+            self.noise_floor.update(frame)
+        
+        if result < 0:
+            return
+        
+        # Refrakter süre: uyumak yerine zaman damgası ile bastır
+        now = time.monotonic()
+        if now - self._last_wake_time < self.wake_refractory:
+            self.wake_metrics['suppressed'] += 1
             return
+        self._last_wake_time = now
+        
+        word = self.wake_keywords[result]
+        print(f"\n🔊 '{word}' algılandı!")
+        self.stats['wake_word_triggers'] += 1
         
-        frame_length = self.porcupine.frame_length
+        # Komut, wake word'ün hemen arkasındaki kareden okunacak
+        self._pending_wake_seq = seq + 1
+        self._pending_wake_time = now
         
+        if self.wake_callback:
+            self._wake_executor.submit(self._run_wake_callback, word)
+    
+    def _run_wake_callback(self, word: str):
+        """Wake callback'ini ayrı executor'da çalıştır"""
         try:
-            with sd.InputStream(
-                samplerate=self.porcupine.sample_rate,
-                channels=1,
-                dtype='int16',
-                blocksize=frame_length
-            ) as stream:
-                
-                while self.wake_active:
-                    try:
-                        frame, overflowed = stream.read(frame_length)
-                        
-                        if len(frame) == frame_length:
-                            pcm = frame.flatten().astype(np.int16).tobytes()
-                            result = self.porcupine.process(pcm)
-                            
-                            if result >= 0:
-                                word = self.wake_keywords[result]
-                                print(f"\n🔊 '{word}' algılandı!")
-                                self.stats['wake_word_triggers'] += 1
-                                
-                                if self.wake_callback:
-                                    self.wake_callback(word)
-                                
-                                time.sleep(1.5)
-                        
-                        time.sleep(0.01)
-                    except Exception as e:
-                        print(f"⚠️ Wake word döngü hatası: {e}")
-                        time.sleep(0.1)
-                    
+            self.wake_callback(word)
         except Exception as e:
-            print(f"❌ Wake word ses akışı hatası: {e}")
+            print(f"⚠️ Wake word callback hatası: {e}")
+    
+    def get_wake_stats(self) -> dict:
+        """Wake word performans metrikleri"""
+        metrics = dict(self.wake_metrics)
+        reader = getattr(self, '_wake_reader', None)
+        if reader is not None:
+            metrics['dropped_frames'] = reader.dropped
+        metrics['overflows'] = self.capture.overflows if self.capture else 0
+        audio = metrics['audio_seconds']
+        # Saniyelik ses başına Porcupine CPU süresi (ms)
+        metrics['cpu_ms_per_audio_second'] = (metrics['cpu_seconds'] / audio * 1000) if audio else 0.0
+        return metrics
     
     def stop_wake_word(self):
         """Wake word dinlemeyi durdur"""
         self.wake_active = False
+        if self.capture is not None:
+            self.capture.unsubscribe('wake_word')
+        self.noise_floor.save()
         print("⏹️ Wake word durduruldu")
     
     def set_volume(self, volume: float):
@@ -460,44 +758,40 @@ class VoiceEngineEnhanced:
         return self.is_playing or not self.sound_queue.empty()
     
     def _add_to_history(self, text: str, voice: str):
-        """Konuşma geçmişine ekle"""
-        self.history.append({
+        """Konuşma geçmişine ekle (disk yazımı arka planda)"""
+        entry = {
             'text': text,
             'voice': voice,
             'timestamp': datetime.now().isoformat(),
             'words': len(text.split())
-        })
+        }
+        self.history.append(entry)
         
         # Son 100 konuşmayı tut
-        if len(self.history) > 100:
-            self.history = self.history[-100:]
+        if len(self.history) > self.history_limit:
+            self.history = self.history[-self.history_limit:]
         
-        self._save_history()
+        self.history_log.append(entry, self.stats)
     
     def _save_history(self):
-        """Geçmişi kaydet"""
-        try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'history': self.history,
-                    'stats': self.stats
-                }, f, indent=2, ensure_ascii=False)
-        except:
-            pass
+        """Bekleyen geçmiş kayıtlarını diske yaz"""
+        self.history_log.update_stats(self.stats)
+        self.history_log.flush()
     
     def _load_history(self):
-        """Geçmişi yükle"""
+        """Geçmişi yükle (sadece günlüğün sonu okunur)"""
         try:
-            if self.history_file.exists():
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.history = data.get('history', [])
-                    self.stats = data.get('stats', self.stats)
+            history, stats = self.history_log.load_tail()
+            self.history = history
+            if stats:
+                self.stats.update(stats)
         except:
             pass
     
     def get_stats(self) -> str:
         """İstatistikleri göster"""
+        wake = self.get_wake_stats()
+        speech = self.sound_queue.get_stats()
         return f"""
 📊 **SES İSTATİSTİKLERİ**
 
@@ -505,6 +799,11 @@ class VoiceEngineEnhanced:
 💬 Konuşulan cümle: {self.stats['sentences_spoken']}
 👂 Dinleme oturumu: {self.stats['listening_sessions']}
 🔊 Wake word tetikleme: {self.stats['wake_word_triggers']}
+🧮 Wake word CPU: {wake['cpu_ms_per_audio_second']:.1f} ms/sn ses, taşma: {wake['overflows']}
+🔇 Yankı kapısı: {self.echo_gate.gated_frames} kare bastırıldı
+📥 Konuşma kuyruğu: {speech['depth']} bekliyor, ort. bekleme {speech['avg_wait_ms']:.0f} ms (maks. {speech['max_wait_ms']:.0f} ms)
+♻️ Değiştirilen/atılan: {speech['superseded']}/{speech['expired']}
+⏱️ Konuşma sonu → sonuç: {self.get_latency_stats()['avg_ms']:.0f} ms (ort.)
 
 🎙️ Aktif ses: {self.voices[self.current_voice]}
 🔊 Ses seviyesi: %{int(self.volume * 100)}
@@ -527,7 +826,7 @@ class VoiceEngineEnhanced:
     def clear_history(self):
         """Geçmişi temizle"""
         self.history = []
-        self._save_history()
+        self.history_log.clear(self.stats)
         print("🧹 Konuşma geçmişi temizlendi")
     
     def test_microphone(self):
@@ -0,0 +1,241 @@
+# src/models/audio_capture.py - ANDROID UYUMLU
+"""
+Ortak mikrofon yakalama servisi
+- 🎙️ Tek, sürekli açık ses akışı (wake word + dinleme + seviye göstergesi)
+- 🔁 Kilitsiz halka tampon (tek yazıcı, çok okuyucu)
+- 📡 Abonelere kare dağıtımı
+- ⏪ Tampondan geriye dönük okuma (wake word sonrası boşluksuz komut)
+"""
+
+import time
+import threading
+from collections import deque
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except:
+    NUMPY_AVAILABLE = False
+
+# Ses kayıt (Android'de sınırlı)
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = NUMPY_AVAILABLE
+except:
+    SOUNDDEVICE_AVAILABLE = False
+
+
+class AudioRingBuffer:
+    """
+    Sabit boyutlu kare halkası.
+    Tek yazıcı (ses callback'i) kareyi yuvaya koyar ve ardından write_seq'i
+    artırır; okuyucular kendi sıra numaralarıyla kilitsiz okur.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._times = [0.0] * capacity
+        self.write_seq = 0
+
+    def push(self, frame, captured_at: float = 0.0):
+        """Kare ekle (sadece yazıcı thread'i çağırır)"""
+        seq = self.write_seq
+        self._slots[seq % self.capacity] = frame
+        self._times[seq % self.capacity] = captured_at
+        # Yuva doldurulduktan sonra yayınla
+        self.write_seq = seq + 1
+
+    def get(self, seq: int):
+        """seq numaralı kareyi döndür (üzerine yazıldıysa None)"""
+        if seq < self.oldest_seq or seq >= self.write_seq:
+            return None
+        return self._slots[seq % self.capacity]
+
+    def time_of(self, seq: int) -> float:
+        """seq numaralı karenin yakalanma anı (time.monotonic)"""
+        return self._times[seq % self.capacity]
+
+    @property
+    def oldest_seq(self) -> int:
+        """Tamponda hâlâ duran en eski kare"""
+        return max(0, self.write_seq - self.capacity + 1)
+
+
+class AudioReader:
+    """Bir okuyucunun halka üzerindeki imleci"""
+
+    def __init__(self, service, start_seq: int = None):
+        self.service = service
+        ring = service.ring
+        if start_seq is None:
+            start_seq = ring.write_seq
+        self.seq = max(start_seq, ring.oldest_seq)
+        self.dropped = 0
+        self.closed = False
+
+    def read(self, timeout: float = 1.0):
+        """Sıradaki kareyi oku -> (kare, seq) veya (None, None)"""
+        ring = self.service.ring
+        deadline = time.monotonic() + timeout
+
+        while not self.closed:
+            if self.seq < ring.oldest_seq:
+                # Okuyucu geride kaldı, kaybolan kareleri atla
+                self.dropped += ring.oldest_seq - self.seq
+                self.seq = ring.oldest_seq
+
+            frame = ring.get(self.seq)
+            if frame is not None:
+                seq = self.seq
+                self.seq += 1
+                return frame, seq
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.service.running:
+                return None, None
+            self.service.wait_for_data(remaining)
+
+        return None, None
+
+    def close(self):
+        self.closed = True
+
+
+class AudioCaptureService:
+    """
+    Uygulama genelinde tek mikrofon akışı.
+    Wake word, VAD/tanıma ve seviye göstergesi aynı akıştan beslenir.
+    """
+
+    def __init__(self, sample_rate: int = 16000, blocksize: int = 512,
+                 buffer_seconds: float = 10.0):
+        self.sample_rate = sample_rate
+        self.blocksize = blocksize
+        self.frame_seconds = blocksize / sample_rate
+        self.ring = AudioRingBuffer(int(buffer_seconds / self.frame_seconds) + 1)
+
+        self.stream = None
+        self.running = False
+        self.overflows = 0
+        # Seviye göstergesi: son kare ve son kareler (dalga çubukları için)
+        self.level = 0.0
+        self.levels = deque(maxlen=64)
+
+        self._data_ready = threading.Condition()
+        self._subscribers = {}
+        self._start_lock = threading.Lock()
+
+    # ============================================
+    # AKIŞ
+    # ============================================
+
+    def start(self) -> bool:
+        """Akışı başlat (zaten açıksa bir şey yapmaz)"""
+        if not SOUNDDEVICE_AVAILABLE:
+            return False
+
+        with self._start_lock:
+            if self.running:
+                return True
+            try:
+                self.stream = sd.InputStream(
+                    samplerate=self.sample_rate,
+                    channels=1,
+                    dtype='int16',
+                    blocksize=self.blocksize,
+                    callback=self._audio_callback
+                )
+                self.stream.start()
+                self.running = True
+                print("🎙️ Ortak ses akışı başlatıldı")
+                return True
+            except Exception as e:
+                print(f"❌ Ses akışı başlatılamadı: {e}")
+                self.stream = None
+                return False
+
+    def stop(self):
+        """Akışı durdur"""
+        with self._start_lock:
+            self.running = False
+            if self.stream is not None:
+                try:
+                    self.stream.stop()
+                    self.stream.close()
+                except:
+                    pass
+                self.stream = None
+        with self._data_ready:
+            self._data_ready.notify_all()
+
+    def _audio_callback(self, indata, frames, time_info, status):
+        """PortAudio callback'i - sadece kopyala ve yayınla"""
+        if status and status.input_overflow:
+            self.overflows += 1
+        self.ring.push(indata[:, 0].copy(), time.monotonic())
+        with self._data_ready:
+            self._data_ready.notify_all()
+
+    def wait_for_data(self, timeout: float):
+        """Yeni kare gelene kadar bekle"""
+        with self._data_ready:
+            self._data_ready.wait(timeout)
+
+    # ============================================
+    # OKUYUCULAR VE ABONELER
+    # ============================================
+
+    def reader(self, start_seq: int = None) -> AudioReader:
+        """Çekme (pull) tipinde okuyucu aç"""
+        self.start()
+        return AudioReader(self, start_seq)
+
+    def subscribe(self, name: str, callback, start_seq: int = None):
+        """Her kare için callback(frame, seq) çağıran abone ekle"""
+        self.unsubscribe(name)
+        reader = self.reader(start_seq)
+        thread = threading.Thread(target=self._dispatch_loop, args=(reader, callback), daemon=True)
+        self._subscribers[name] = reader
+        thread.start()
+        return reader
+
+    def unsubscribe(self, name: str):
+        """Aboneyi kaldır"""
+        reader = self._subscribers.pop(name, None)
+        if reader is not None:
+            reader.close()
+
+    def _dispatch_loop(self, reader: AudioReader, callback):
+        """Abone thread'i"""
+        while not reader.closed and self.running:
+            frame, seq = reader.read(timeout=0.5)
+            if frame is None:
+                continue
+            try:
+                callback(frame, seq)
+            except Exception as e:
+                print(f"⚠️ Ses abonesi hatası: {e}")
+
+    def subscribe_level_meter(self):
+        """Ses seviyesi göstergesini ekle (self.level / self.levels güncellenir)"""
+        def on_frame(frame, seq):
+            self.level = frame_level(frame)
+            self.levels.append(self.level)
+        return self.subscribe('level_meter', on_frame)
+
+    def unsubscribe_level_meter(self):
+        self.unsubscribe('level_meter')
+        self.level = 0.0
+        self.levels.clear()
+
+    def recent_levels(self, count: int) -> list:
+        """Son count karenin seviyesi (eskiden yeniye, 0.0-1.0 RMS)"""
+        levels = list(self.levels)
+        return levels[-count:] if count else []
+
+
+def frame_level(frame) -> float:
+    """int16 karenin RMS seviyesi (0.0-1.0)"""
+    samples = np.asarray(frame, dtype=np.float32) / 32768.0
+    return float(np.sqrt(np.mean(samples * samples))) if len(samples) else 0.0
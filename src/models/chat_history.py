@@ -0,0 +1,285 @@
+# src/models/chat_history.py - ANDROID UYUMLU
+"""
+Sohbet geçmişi deposu
+- 💍 Bellekte sınırlı halka (son N mesaj), slotlu kayıtlar
+- 💾 Diskte yalnız eklenen JSON Lines dosyası; güncellemeler aynı sıra numarasıyla eklenir
+- 🗜️ Dosya büyüyünce sıkıştırılır (en yeni max_rows kayıt kalır)
+- 📜 Daha eski mesajlar ihtiyaç olunca (yukarı kaydırınca) diskten okunur;
+  seq -> bayt konumu dizini sayesinde yalnız istenen satırlar okunur
+"""
+
+import os
+import sys
+import json
+import time
+import bisect
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+# Android tespiti
+IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
+
+
+def default_history_path() -> Path:
+    if IS_ANDROID:
+        return Path("/storage/emulated/0/ANNA/data/chat_history.jsonl")
+    return Path("data/chat_history.jsonl")
+
+
+@dataclass(slots=True, eq=False)
+class ChatMessage:
+    """Tek sohbet mesajı"""
+    seq: int
+    sender: str
+    text: str
+    is_user: bool
+    ts: float
+    # Ekranda canlı metin kontrolü (akışta değişir); diske yazılmaz
+    view: object = None
+
+    def sync(self):
+        """Canlı kontrolün güncel metnini kayda al"""
+        if self.view is not None:
+            value = getattr(self.view, 'value', None)
+            if value is not None:
+                self.text = value
+
+    def to_row(self) -> list:
+        return [self.seq, round(self.ts, 1), self.sender, int(self.is_user), self.text]
+
+    @classmethod
+    def from_row(cls, row: list):
+        seq, ts, sender, is_user, text = row
+        return cls(seq, sender, text, bool(is_user), ts)
+
+
+class ChatHistory:
+    """
+    Sohbet mesajları: bellekte son max_memory kayıt, diskte son max_rows kayıt.
+    Yazmalar birleştirilip gecikmeli yapılır (UI thread'i diske beklemez).
+    """
+
+    def __init__(self, path: Path = None, max_memory: int = 200, max_rows: int = 5000,
+                 save_delay: float = 2.0):
+        self.path = Path(path or default_history_path())
+        self.max_memory = max_memory
+        self.max_rows = max_rows
+        self.save_delay = save_delay
+
+        self.messages = deque(maxlen=max_memory)
+        self._next_seq = 1
+        self._oldest_seq = None
+        self._pending = {}
+        self._file_lines = 0
+        self._lock = threading.Lock()
+        # Zamanlayıcı ve okuma yolundan gelen kayıtlar dosyaya sırayla yazılır
+        self._io_lock = threading.Lock()
+        # Disk dizini (_io_lock altında): seq -> son satırın bayt konumu, sıralı seq listesi
+        self._offsets = {}
+        self._disk_seqs = []
+        self._save_timer = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    # ============================================
+    # OKUMA
+    # ============================================
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    @property
+    def oldest_seq(self):
+        """Diskteki / bellekteki en eski mesajın sıra numarası (boşsa None)"""
+        return self._oldest_seq
+
+    def recent(self, count: int) -> list:
+        """En yeni count mesaj (eskiden yeniye)"""
+        with self._lock:
+            items = list(self.messages)
+        return items[-count:] if count else []
+
+    def older(self, before_seq: int, count: int) -> list:
+        """
+        before_seq'ten önceki count mesaj (eskiden yeniye); bellekte yoksa diskten.
+        Disk yolu dosya okur: UI thread'inden değil, arka plandan çağırın.
+        """
+        with self._lock:
+            items = [m for m in self.messages if m.seq < before_seq]
+            oldest_in_memory = self.messages[0].seq if self.messages else before_seq
+        if len(items) >= count or oldest_in_memory <= (self._oldest_seq or 1):
+            return items[-count:]
+
+        # Halka dışında kalanlar: dizinden yalnız gereken satırlar okunur
+        self.save()
+        with self._io_lock:
+            end = bisect.bisect_left(self._disk_seqs, before_seq)
+            seqs = self._disk_seqs[max(0, end - count):end]
+            return self._read_rows(seqs)
+
+    # ============================================
+    # YAZMA
+    # ============================================
+
+    def append(self, sender: str, text: str, is_user: bool, view=None) -> ChatMessage:
+        """Yeni mesaj ekle (view: akışta güncellenecek metin kontrolü)"""
+        with self._lock:
+            message = ChatMessage(self._next_seq, sender, text, is_user, time.time(), view)
+            self._next_seq += 1
+            if self._oldest_seq is None:
+                self._oldest_seq = message.seq
+            self.messages.append(message)
+            self._pending[message.seq] = message
+        self._schedule_save()
+        return message
+
+    def changed(self, message: ChatMessage = None):
+        """Mesaj metni değişti (akış); kaydı planla"""
+        if message is not None:
+            with self._lock:
+                self._pending[message.seq] = message
+        self._schedule_save()
+
+    def release(self, message: ChatMessage):
+        """Mesaj ekrandan çıktı: son metni al, kontrol referansını bırak"""
+        message.sync()
+        message.view = None
+        self.changed(message)
+
+    def clear(self):
+        with self._lock:
+            self.messages.clear()
+            self._pending.clear()
+            self._file_lines = 0
+            self._oldest_seq = None
+        with self._io_lock:
+            self._offsets.clear()
+            self._disk_seqs.clear()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    # ============================================
+    # KALICILIK
+    # ============================================
+
+    def _scan_disk(self) -> dict:
+        """Tüm dosyayı tara: seq -> (ChatMessage, bayt konumu); aynı seq'in son satırı geçerli"""
+        records = {}
+        try:
+            with open(self.path, 'rb') as f:
+                offset = 0
+                for line in f:
+                    try:
+                        message = ChatMessage.from_row(json.loads(line))
+                        records[message.seq] = (message, offset)
+                    except (ValueError, TypeError):
+                        pass
+                    offset += len(line)
+        except OSError:
+            pass
+        return records
+
+    def _read_rows(self, seqs: list) -> list:
+        """Dizindeki konumlardan yalnız verilen seq'lerin satırlarını oku (_io_lock altında)"""
+        messages = []
+        try:
+            with open(self.path, 'rb') as f:
+                for seq in seqs:
+                    f.seek(self._offsets[seq])
+                    try:
+                        messages.append(ChatMessage.from_row(json.loads(f.readline())))
+                    except (ValueError, TypeError):
+                        continue
+        except OSError as e:
+            print(f"⚠️ Sohbet geçmişi okunamadı: {e}")
+        return messages
+
+    def _index(self, records: dict):
+        """Disk dizinini tarama sonucundan kur"""
+        self._offsets = {seq: offset for seq, (_, offset) in records.items()}
+        self._disk_seqs = sorted(self._offsets)
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                self._file_lines = sum(1 for _ in f)
+        except OSError:
+            self._file_lines = 0
+        records = self._scan_disk()
+        self._index(records)
+        if records:
+            ordered = [records[seq][0] for seq in self._disk_seqs]
+            self.messages.extend(ordered[-self.max_memory:])
+            self._oldest_seq = ordered[0].seq
+            self._next_seq = ordered[-1].seq + 1
+
+    def _schedule_save(self):
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self):
+        """Bekleyen kayıtları dosyanın sonuna ekle"""
+        with self._lock:
+            self._save_timer = None
+            pending = list(self._pending.values())
+            self._pending.clear()
+        if not pending:
+            return
+        for message in pending:
+            message.sync()
+        with self._io_lock:
+            try:
+                with open(self.path, 'ab') as f:
+                    for message in pending:
+                        offset = f.tell()
+                        f.write((json.dumps(message.to_row(), ensure_ascii=False) + "\n").encode('utf-8'))
+                        # Güncelleme aynı seq ile eklenir: dizin en son satırı gösterir
+                        if message.seq not in self._offsets:
+                            bisect.insort(self._disk_seqs, message.seq)
+                        self._offsets[message.seq] = offset
+                self._file_lines += len(pending)
+            except OSError as e:
+                print(f"⚠️ Sohbet geçmişi kaydedilemedi: {e}")
+                return
+            if self._file_lines > self.max_rows * 2:
+                self._compact()
+
+    def _compact(self):
+        """Tekrarlı satırları ve en eskileri at (atomik yeniden yazma; _io_lock altında)"""
+        records = self._scan_disk()
+        kept = [records[seq][0] for seq in sorted(records)][-self.max_rows:]
+        tmp_path = self.path.with_suffix(".tmp")
+        offsets = {}
+        try:
+            with open(tmp_path, 'wb') as f:
+                for message in kept:
+                    offsets[message.seq] = f.tell()
+                    f.write((json.dumps(message.to_row(), ensure_ascii=False) + "\n").encode('utf-8'))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Sohbet geçmişi sıkıştırılamadı: {e}")
+            return
+        self._offsets = offsets
+        self._disk_seqs = [m.seq for m in kept]
+        with self._lock:
+            self._file_lines = len(kept)
+            if kept:
+                self._oldest_seq = kept[0].seq
+        print(f"🗜️ Sohbet geçmişi sıkıştırıldı ({len(kept)} mesaj)")
+
+    def get_stats(self) -> dict:
+        return {
+            'in_memory': len(self.messages),
+            'file_lines': self._file_lines,
+            'next_seq': self._next_seq,
+            'live_views': sum(1 for m in self.messages if m.view is not None)
+        }
@@ -0,0 +1,284 @@
+# src/models/command_executor.py - ANDROID UYUMLU
+"""
+Komut yürütücü - UI thread'i bloklanmadan komut çalıştırma
+- 🧵 Sınırlı iş parçacığı havuzu: aynı anda gelen komutlar paralel çalışır
+- ⏳ "Düşünüyor…" yer tutucusu, sonuç gelince yerine yazılır
+- ⏱️ Komut türüne göre zaman aşımı; geç gelen sonuçlar atılır
+- ✋ Komut başına iptal; aynı türden yeni komut eskisini geçersiz kılabilir
+- 🧟 Zaman aşımına uğrayıp hâlâ çalışan işçiler sayılır, kapasiteden düşülür
+- 📷 Gruplar: aynı kaynağı kullanan komutlardan (kamera) aynı anda yalnız biri
+"""
+
+import time
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class CommandCancelled(Exception):
+    """Komut iptal edildi veya zaman aşımına uğradı"""
+
+
+class CommandHandle:
+    """Çalışan / bekleyen tek komut"""
+
+    def __init__(self, command_id: int, name: str, timeout: float):
+        self.id = command_id
+        self.name = name
+        self.timeout = timeout
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+        # 'queued' | 'running' | 'done' | 'failed' | 'cancelled' | 'timed_out'
+        self.status = 'queued'
+        self.error = None
+        self.future = None
+        self._cancel_event = threading.Event()
+        self._timer = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ('queued', 'running')
+
+    def cancel(self, status: str = 'cancelled'):
+        """
+        İptal et. Bekleyen komut hiç başlamaz; çalışan komut bir sonraki
+        check() / yer tutucu güncellemesinde durur (iş parçacıkları öldürülemez).
+        """
+        if not self.active:
+            return False
+        self.status = status
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+        return True
+
+    def check(self):
+        """Uzun işlerin içinden çağrılır; iptal edildiyse durdurur"""
+        if self._cancel_event.is_set():
+            raise CommandCancelled(self.status)
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.monotonic()) - self.created
+
+
+class CommandContext:
+    """
+    İşleyicinin çıktı kanalı.
+    İlk cevap yer tutucu baloncuğun yerine yazılır, sonrakiler yeni mesaj olur.
+    İptal edilmiş komutun çıktısı gösterilmez.
+    """
+
+    def __init__(self, handle: CommandHandle, placeholder=None, post=None, speak=None, refresh=None):
+        self.handle = handle
+        self.placeholder = placeholder
+        self._post = post
+        self._speak = speak
+        # Yer tutucu değişince çağrılır (UI zamanlayıcısı varsa birleştirilir)
+        self._refresh = refresh or (lambda control: control.update())
+        self._used_placeholder = placeholder is None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.handle.cancelled
+
+    def check(self):
+        self.handle.check()
+
+    def show(self, text: str):
+        """Yer tutucuyu güncelle (akış için); iptal edildiyse durdurur"""
+        self.check()
+        if self.placeholder is not None:
+            self.placeholder.value = text
+            self._refresh(self.placeholder)
+            self._used_placeholder = True
+        elif self._post:
+            self._post(text)
+
+    def reply(self, text: str, speech=None, key: str = None):
+        """
+        Sonucu göster ve oku.
+        speech=None: metnin kendisi okunur; speech=False: sessiz
+        """
+        if self.cancelled:
+            return None
+        if not self._used_placeholder:
+            self._used_placeholder = True
+            self.placeholder.value = text
+            self._refresh(self.placeholder)
+        elif self._post:
+            self._post(text)
+        if speech is not False and self._speak:
+            return self._speak(speech or text, key)
+        return None
+
+
+class CommandExecutor:
+    """
+    Komutları sınırlı havuzda çalıştırır.
+    submit() hemen döner; UI thread'i yalnız niyet çözümleme kadar meşgul olur.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 16,
+                 default_timeout: float = 20.0, timeouts: dict = None, groups: dict = None,
+                 thread_name_prefix: str = "anna-cmd"):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.default_timeout = default_timeout
+        self.timeouts = dict(timeouts or {})
+        # Komut adı -> grup; aynı gruptan aynı anda tek komut (ör. kamerayı kullananlar)
+        self.groups = dict(groups or {})
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.in_flight = {}
+        # Kayıttan düşmüş ama işçisi hâlâ çalışan komutlar (check() çağırmayan işler)
+        self.orphaned = {}
+
+        self.counters = {
+            'submitted': 0,
+            'done': 0,
+            'failed': 0,
+            'cancelled': 0,
+            'timed_out': 0,
+            'rejected': 0,
+            'superseded': 0,
+            'group_busy': 0
+        }
+        self.latencies = []
+
+    def submit(self, name: str, fn, *args, timeout: float = None, supersede: bool = False,
+               on_timeout=None, on_error=None):
+        """
+        fn(handle, *args) komutunu kuyruğa al -> CommandHandle (havuz doluysa None)
+        supersede: aynı isimli çalışan komutlar iptal edilir (ör. yeni AI sorusu)
+        on_timeout(handle) / on_error(handle, hata): UI'ye bildirim için
+        """
+        timeout = timeout or self.timeouts.get(name, self.default_timeout)
+
+        with self._lock:
+            if supersede:
+                for other in list(self.in_flight.values()):
+                    if other.name == name and other.cancel('cancelled'):
+                        self.counters['superseded'] += 1
+            if self._group_busy(name):
+                self.counters['group_busy'] += 1
+                return None
+            # Takılı işçiler de havuzu işgal eder
+            if len(self.in_flight) + len(self.orphaned) >= self.max_pending:
+                self.counters['rejected'] += 1
+                return None
+            handle = CommandHandle(next(self._ids), name, timeout)
+            self.in_flight[handle.id] = handle
+            self.counters['submitted'] += 1
+
+        def expire():
+            if handle.cancel('timed_out'):
+                self.counters['timed_out'] += 1
+                print(f"⏱️ Komut zaman aşımı: {name} ({timeout:.0f} sn)")
+                if on_timeout:
+                    try:
+                        on_timeout(handle)
+                    except Exception as e:
+                        print(f"⚠️ Zaman aşımı bildirimi hatası: {e}")
+                self._forget(handle)
+
+        # Süre kuyrukta beklemeyi de kapsar
+        handle._timer = threading.Timer(timeout, expire)
+        handle._timer.daemon = True
+        handle._timer.start()
+
+        handle.future = self._pool.submit(self._run, handle, fn, args, on_error)
+        # Başlamadan iptal edilen komut da kayıttan düşer
+        handle.future.add_done_callback(lambda _: self._forget(handle))
+        return handle
+
+    def _group_busy(self, name: str) -> bool:
+        group = self.groups.get(name)
+        if group is None:
+            return False
+        handles = list(self.in_flight.values()) + list(self.orphaned.values())
+        return any(self.groups.get(h.name) == group and h.finished is None for h in handles)
+
+    def busy(self, name: str) -> bool:
+        """Bu komutun grubundan çalışan / takılı komut var mı?"""
+        with self._lock:
+            return self._group_busy(name)
+
+    def _run(self, handle: CommandHandle, fn, args, on_error):
+        if handle.cancelled:
+            return None
+        handle.status = 'running'
+        handle.started = time.monotonic()
+        try:
+            result = fn(handle, *args)
+            if handle.status == 'running':
+                handle.status = 'done'
+                self.counters['done'] += 1
+            return result
+        except CommandCancelled:
+            return None
+        except Exception as e:
+            if handle.status != 'running':
+                # İptal / zaman aşımı sonrası gelen hata: kullanıcı zaten bilgilendirildi
+                return None
+            handle.status = 'failed'
+            handle.error = e
+            self.counters['failed'] += 1
+            print(f"❌ Komut hatası ({handle.name}): {e}")
+            if on_error:
+                try:
+                    on_error(handle, e)
+                except Exception:
+                    pass
+            return None
+        finally:
+            handle.finished = time.monotonic()
+            with self._lock:
+                self.orphaned.pop(handle.id, None)
+            self._forget(handle)
+
+    def _forget(self, handle: CommandHandle):
+        """Kayıttan düş (birden çok kez çağrılabilir)"""
+        if handle._timer is not None:
+            handle._timer.cancel()
+        with self._lock:
+            if self.in_flight.pop(handle.id, None) is None:
+                return
+            if handle.started is not None and handle.finished is None:
+                # İptal / zaman aşımı: işçi check() çağırana ya da bitene kadar meşgul
+                self.orphaned[handle.id] = handle
+            if handle.status == 'done':
+                self.latencies.append(handle.elapsed * 1000)
+                del self.latencies[:-100]
+            elif handle.status == 'cancelled':
+                self.counters['cancelled'] += 1
+
+    def cancel(self, name: str = None) -> int:
+        """İsimle (veya hepsini) iptal et -> iptal edilen sayısı"""
+        with self._lock:
+            handles = [h for h in self.in_flight.values() if name is None or h.name == name]
+        return sum(1 for h in handles if h.cancel())
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False)
+
+    def get_stats(self) -> dict:
+        stats = dict(self.counters)
+        with self._lock:
+            stats['in_flight'] = len(self.in_flight)
+            stats['orphaned'] = len(self.orphaned)
+            stats['busy_workers'] = min(self.max_workers, len(self.orphaned) + sum(
+                1 for h in self.in_flight.values() if h.status == 'running'))
+            ordered = sorted(self.latencies)
+        if ordered:
+            stats['p50_ms'] = round(ordered[len(ordered) // 2])
+            stats['p95_ms'] = round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))])
+        return stats
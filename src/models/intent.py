@@ -0,0 +1,444 @@
+# src/models/intent.py - ANDROID UYUMLU
+"""
+Yerel niyet motoru (LLM'e gitmeden komut tanıma)
+- 🔤 Tüm anahtar kelimeler tek Aho-Corasick otomatında: metin uzunluğunda tarama
+- 🇹🇷 Türkçe ekler: "havayı", "haberleri" eşleşir; "havalimanı" eşleşmez
+- 🧩 Slotlar: şehir, süre (dakika), haber kategorisi, rehberdeki kişi
+- 🎲 Kelime eşleşmezse küçük Naive Bayes sınıflandırıcı (yazım hataları için)
+"""
+
+import re
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+
+# ============================================
+# SÖZLÜKLER
+# ============================================
+
+# Kök -> özellik. "*" ile bitenler fiil kökü: her ek kabul edilir ("hatırlatır mısın");
+# "=" ile bitenler yalnız tam kelime ("ne" eşleşir, "nedir" / "neden" eşleşmez)
+KEYWORDS = {
+    'kamera': 'camera', 'ar': 'ar',
+    'aç*': 'open', 'başlat*': 'start', 'durdur*': 'stop', 'kapat*': 'close',
+    'fotoğraf': 'photo', 'foto': 'photo', 'resim': 'photo', 'yazı': 'text', 'metin': 'text',
+    'çek*': 'shoot', 'oku*': 'read', 'tara*': 'read',
+    'günaydın': 'good_morning', 'sabah': 'morning', 'özet': 'summary', 'brifing': 'briefing',
+    'hava': 'weather', 'hava durum': 'weather', 'yağmur': 'weather', 'sıcaklık': 'weather',
+    'kar yağ*': 'weather', 'şemsiye': 'weather',
+    'haber': 'news', 'manşet': 'news', 'gündem': 'news', 'son dakika': 'news',
+    'batarya': 'battery', 'pil': 'battery', 'şarj': 'battery',
+    'depolama': 'storage', 'boş alan': 'storage',
+    'rehber': 'phonebook', 'kişiler': 'phonebook', 'kişi listesi': 'phonebook',
+    'numara': 'number', 'telefon': 'number',
+    'hatırlat*': 'remind', 'hatırlatıcı': 'remind', 'alarm': 'remind',
+    'yeni': 'new', 'sohbet': 'chat', 'konuşma': 'chat', 'hafıza': 'memory',
+    'sıfırla*': 'reset', 'unut*': 'reset',
+    'yardım': 'help', 'komut': 'help', 'neler yapabilir*': 'help',
+    'saat': 'hour', 'kaç': 'how_many', 'tarih': 'date', 'bugün': 'today', 'ne=': 'what',
+    'günlerden': 'weekday', 'hangi gün': 'weekday',
+    'merhaba': 'hello', 'selam': 'hello', 'nasılsın': 'hello', 'iyi akşamlar': 'hello',
+    # Selamlaşma kalıpları: "ne haber" haber istemez ("ne haberler var" ise ister)
+    'ne haber=': 'greeting_phrase', 'naber=': 'greeting_phrase', 'nbr=': 'greeting_phrase',
+    'teşekkür*': 'thanks', 'sağ ol*': 'thanks', 'eyvallah': 'thanks', 'sağol*': 'thanks',
+}
+
+# Fiil köküyle başlayan ama fiil olmayan kelimeler: kök -> reddedilen ek başları
+# ("açıkla", "açık" -> aç değil; "okul" -> oku değil)
+VERB_EXCLUDE = {
+    'aç': ('ık',),
+    'oku': ('l',),
+    'tara': ('f',),
+}
+
+# Niyet kuralları: (niyet, gereken özellikler, ağırlık). Aynı niyetin kuralları toplanır.
+RULES = [
+    ('ar_start', ('camera', 'open'), 4), ('ar_start', ('ar', 'start'), 4),
+    ('ar_stop', ('camera', 'close'), 4), ('ar_stop', ('ar', 'stop'), 4),
+    ('photo', ('photo', 'shoot'), 4),
+    ('ocr', ('photo', 'read'), 5), ('ocr', ('text', 'read'), 5),
+    ('briefing', ('good_morning',), 4), ('briefing', ('morning', 'summary'), 4),
+    ('briefing', ('briefing',), 4),
+    ('weather', ('weather',), 2),
+    ('news', ('news',), 2),
+    ('battery', ('battery',), 3),
+    ('storage', ('storage',), 3),
+    ('contacts', ('phonebook',), 3), ('contacts', ('contact_name', 'number'), 4),
+    ('reminder', ('remind',), 5),
+    ('new_chat', ('new', 'chat'), 4), ('new_chat', ('chat', 'reset'), 4),
+    ('new_chat', ('memory', 'reset'), 4),
+    ('help', ('help',), 2),
+    ('time', ('hour', 'how_many'), 3),
+    ('date', ('date', 'what'), 3), ('date', ('date', 'today'), 3), ('date', ('weekday',), 3),
+    ('greeting', ('hello',), 1), ('greeting', ('greeting_phrase',), 3),
+    ('thanks', ('thanks',), 2),
+]
+
+# Eşitlikte eski if/elif sırası korunur
+INTENT_ORDER = ['ar_start', 'ar_stop', 'photo', 'briefing', 'weather', 'news', 'battery',
+                'storage', 'contacts', 'ocr', 'reminder', 'new_chat', 'help', 'time', 'date',
+                'greeting', 'thanks']
+
+# Bu niyetlerin özellikleri yan yana ve kuraldaki sırayla gelmeli:
+# "kamerayı aç", "saat kaç" evet; "açıkla kamera ...", "kaç saat sürer" hayır
+ADJACENT_INTENTS = {'ar_start', 'ar_stop', 'photo', 'ocr', 'time'}
+
+# Uzun cümlelerde bu niyetler yerine LLM'e gidilir ("... yardım eder misin" bir sorudur)
+MAX_WORDS = {'help': 4, 'greeting': 3, 'thanks': 5, 'time': 5, 'date': 6,
+             'ar_start': 4, 'ar_stop': 4, 'photo': 5, 'ocr': 5}
+
+NEWS_CATEGORIES = {
+    'teknoloji': 'technology', 'spor': 'sports', 'ekonomi': 'business', 'iş dünya': 'business',
+    'sağlık': 'health', 'bilim': 'science', 'eğlence': 'entertainment', 'magazin': 'entertainment'
+}
+
+CITIES = [
+    'Adana', 'Adıyaman', 'Afyonkarahisar', 'Ağrı', 'Aksaray', 'Amasya', 'Ankara', 'Antalya',
+    'Ardahan', 'Artvin', 'Aydın', 'Balıkesir', 'Bartın', 'Batman', 'Bayburt', 'Bilecik',
+    'Bingöl', 'Bitlis', 'Bolu', 'Burdur', 'Bursa', 'Çanakkale', 'Çankırı', 'Çorum', 'Denizli',
+    'Diyarbakır', 'Düzce', 'Edirne', 'Elazığ', 'Erzincan', 'Erzurum', 'Eskişehir', 'Gaziantep',
+    'Giresun', 'Gümüşhane', 'Hakkari', 'Hatay', 'Iğdır', 'Isparta', 'İstanbul', 'İzmir',
+    'Kahramanmaraş', 'Karabük', 'Karaman', 'Kars', 'Kastamonu', 'Kayseri', 'Kırıkkale',
+    'Kırklareli', 'Kırşehir', 'Kilis', 'Kocaeli', 'Konya', 'Kütahya', 'Malatya', 'Manisa',
+    'Mardin', 'Mersin', 'Muğla', 'Muş', 'Nevşehir', 'Niğde', 'Ordu', 'Osmaniye', 'Rize',
+    'Sakarya', 'Samsun', 'Siirt', 'Sinop', 'Sivas', 'Şanlıurfa', 'Şırnak', 'Tekirdağ', 'Tokat',
+    'Trabzon', 'Tunceli', 'Uşak', 'Van', 'Yalova', 'Yozgat', 'Zonguldak',
+    'Bodrum', 'Alanya', 'Fethiye', 'Marmaris', 'Kapadokya', 'Londra', 'Paris', 'Berlin'
+]
+
+# İsim çekim ekleri (çoğul x iyelik x hal); isim köklerinden sonra yalnız bunlar kabul edilir
+_PLURAL = ('', 'lar', 'ler')
+_POSSESSIVE = ('', 'ı', 'i', 'u', 'ü', 'sı', 'si', 'su', 'sü', 'm', 'ım', 'im', 'um', 'üm', 'n', 'ın', 'in')
+_CASE = ('', 'ı', 'i', 'u', 'ü', 'yı', 'yi', 'yu', 'yü', 'nı', 'ni', 'nu', 'nü', 'a', 'e', 'ya', 'ye',
+         'na', 'ne', 'da', 'de', 'ta', 'te', 'nda', 'nde', 'dan', 'den', 'tan', 'ten', 'ndan', 'nden',
+         'ın', 'in', 'un', 'ün', 'nın', 'nin', 'nun', 'nün', 'la', 'le', 'yla', 'yle', 'ki',
+         'daki', 'deki', 'taki', 'teki', 'ndaki', 'ndeki', 'dır', 'dir', 'mı', 'mi')
+NOUN_SUFFIXES = frozenset(p + s + c for p in _PLURAL for s in _POSSESSIVE for c in _CASE)
+
+# Sayı kelimeleri (süre slotu için)
+_NUMBER_WORDS = {'bir': 1, 'iki': 2, 'üç': 3, 'dört': 4, 'beş': 5, 'altı': 6, 'yedi': 7,
+                 'sekiz': 8, 'dokuz': 9, 'on': 10, 'yirmi': 20, 'otuz': 30, 'kırk': 40,
+                 'elli': 50, 'altmış': 60, 'yarım': 0.5, 'çeyrek': 0.25}
+_NUMBER = r"(\d+|(?:%s)(?:\s+(?:%s))?)" % ('|'.join(_NUMBER_WORDS), '|'.join(_NUMBER_WORDS))
+_DURATION = re.compile(r"\b" + _NUMBER + r"\s*(dakika|dk|saat|saniye|sn)\w*")
+
+# Hatırlatıcı mesajından atılan dolgu kelimeleri
+_FILLER = {'bana', 'beni', 'sonra', 'içinde', 'lütfen', 'bir', 'mısın', 'misin', 'hatırlat', 'alarm'}
+
+_FOLD = str.maketrans({'â': 'a', 'î': 'i', 'û': 'u'})
+
+
+def normalize(text: str) -> str:
+    """
+    Türkçe küçük harf; harf/rakam dışı her karakter boşluk olur.
+    Uzunluk korunur ki eşleşme konumları özgün metne uysun.
+    """
+    lowered = text.replace('İ', 'i').replace('I', 'ı').lower().translate(_FOLD)
+    if len(lowered) != len(text):
+        # Nadir Unicode durumları: karakter karakter küçült
+        lowered = "".join((c.lower() or c)[0] for c in text.replace('İ', 'i').replace('I', 'ı')).translate(_FOLD)
+    return "".join(c if c.isalnum() else ' ' for c in lowered)
+
+
+def parse_duration(text: str):
+    """'5 dakika', 'yarım saat', 'on beş dk' -> (dakika, (başlangıç, bitiş)) veya None"""
+    match = _DURATION.search(text)
+    if not match:
+        return None
+    amount = 0.0
+    for part in match.group(1).split():
+        amount += float(part) if part.isdigit() else _NUMBER_WORDS.get(part, 0)
+    unit = match.group(2)
+    if unit in ('saat',):
+        minutes = amount * 60
+    elif unit in ('saniye', 'sn'):
+        minutes = amount / 60
+    else:
+        minutes = amount
+    return max(1, int(round(minutes))), match.span()
+
+
+# ============================================
+# AHO-CORASICK
+# ============================================
+
+class KeywordAutomaton:
+    """
+    Çoklu kalıp eşleyici. Tüm kalıplar tek geçişte bulunur;
+    süre metin uzunluğu + eşleşme sayısıyla orantılı.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+    def add(self, pattern: str, payload):
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), payload))
+
+    def build(self):
+        """Hata bağlantılarını kur (BFS)"""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        return self
+
+    def find(self, text: str):
+        """-> (başlangıç, bitiş, payload) üreteci"""
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, payload in out[state]:
+                yield i - length + 1, i + 1, payload
+
+
+# ============================================
+# YEDEK SINIFLANDIRICI
+# ============================================
+
+# Kısa örnek cümleler; kelime eşleşmesi olmayan (yazım hatalı) girdiler için
+TRAINING = {
+    'weather': ['hva durumu', 'havva durumu', 'dışarısı soğuk mu', 'yağış var mı',
+                'kaç derece', 'hava drumu', 'dışarıda güneş var mı'],
+    'news': ['habrler', 'neler oluyor dünyada', 'son gelişmeler', 'hbr oku', 'gazete manşetleri'],
+    'battery': ['batrya', 'pilim ne durumda', 'şarjım kaç', 'telefonun enerjisi'],
+    'storage': ['depolma', 'ne kadar yer kaldı', 'telefonda yer var mı'],
+    'reminder': ['hatrlat', 'unutmayayım', 'bana haber ver sonra', 'not al sonra söyle'],
+    'time': ['saat kac', 'saat ne', 'zaman ne'],
+    'help': ['yardm', 'ne yapabilirsin', 'komutlar'],
+    'chat': ['bana bir fıkra anlat', 'python nedir', 'türkiyenin başkenti neresi',
+             'havalimanına nasıl giderim', 'habercilik nedir', 'pilot olmak istiyorum',
+             'depresyon nedir', 'hatıra defteri', 'saatçi nerede', 'ekonomi nasıl',
+             'işler nasıl gidiyor', 'nasıl yapılır',
+             'aşk nedir', 'bir şiir yaz', 'dünyanın en büyük okyanusu hangisi',
+             'yapay zeka nasıl çalışır', 'bana tarif ver', 'kitap önerir misin',
+             'matematik sorusu çöz', 'hangi film izlenir', 'bu kelimenin anlamı ne'],
+}
+
+
+class NaiveBayesClassifier:
+    """Karakter üçlüleri üzerinde çok terimli Naive Bayes"""
+
+    def __init__(self, examples: dict):
+        self.counts = {}
+        self.totals = {}
+        self.priors = {}
+        vocab = set()
+        total_docs = sum(len(v) for v in examples.values())
+        for label, texts in examples.items():
+            counter = Counter()
+            for text in texts:
+                counter.update(self.features(text))
+            self.counts[label] = counter
+            self.totals[label] = sum(counter.values())
+            self.priors[label] = math.log(len(texts) / total_docs)
+            vocab.update(counter)
+        self.vocab_size = len(vocab) or 1
+
+    @staticmethod
+    def features(text: str) -> list:
+        padded = f" {' '.join(normalize(text).split())} "
+        return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+    def predict(self, text: str):
+        """-> (etiket, olasılık)"""
+        features = self.features(text)
+        scores = {}
+        for label, counter in self.counts.items():
+            denom = self.totals[label] + self.vocab_size
+            scores[label] = self.priors[label] + sum(math.log((counter[f] + 1) / denom) for f in features)
+        best = max(scores, key=scores.get)
+        peak = scores[best]
+        total = sum(math.exp(s - peak) for s in scores.values())
+        return best, 1.0 / total
+
+
+# ============================================
+# NİYET MOTORU
+# ============================================
+
+@dataclass(frozen=True, slots=True)
+class Intent:
+    """Ayrıştırılmış komut"""
+    name: str                       # 'weather', 'news', ... veya 'chat' (LLM'e gider)
+    slots: dict = field(default_factory=dict)
+    confidence: float = 1.0
+    source: str = 'keyword'         # 'keyword' | 'classifier' | 'fallback'
+
+    @property
+    def is_local(self) -> bool:
+        return self.name != 'chat'
+
+
+class IntentEngine:
+    """Metin -> Intent. Rehber değişince set_contacts() ile otomat yeniden kurulur."""
+
+    def __init__(self, contacts: list = None, min_confidence: float = 0.85):
+        self.min_confidence = min_confidence
+        self.classifier = NaiveBayesClassifier(TRAINING)
+        self.contacts = []
+        self.metrics = Counter()
+        self._automaton = None
+        self.set_contacts(contacts or [])
+
+    def set_contacts(self, names: list):
+        """Rehberdeki isimleri slot olarak ekle (tam ad ve ilk ad)"""
+        self.contacts = list(names)
+        self._automaton = self._compile()
+
+    def _compile(self) -> KeywordAutomaton:
+        automaton = KeywordAutomaton()
+        for keyword, feature in KEYWORDS.items():
+            if keyword.endswith('*'):
+                stem = normalize(keyword[:-1])
+                mode = ('verb', VERB_EXCLUDE.get(keyword[:-1], ()))
+            elif keyword.endswith('='):
+                stem, mode = normalize(keyword[:-1]), 'exact'
+            else:
+                stem, mode = normalize(keyword), 'noun'
+            automaton.add(stem, ('kw', feature, mode))
+        for turkish, english in NEWS_CATEGORIES.items():
+            automaton.add(normalize(turkish), ('category', english, 'noun'))
+        for city in CITIES:
+            automaton.add(normalize(city), ('city', city, 'noun'))
+        for name in self.contacts:
+            full = " ".join(normalize(name).split())
+            if not full:
+                continue
+            automaton.add(full, ('contact', name, 'noun'))
+            first = full.split()[0]
+            if len(first) >= 3 and first != full:
+                automaton.add(first, ('contact', name, 'noun'))
+        return automaton.build()
+
+    @staticmethod
+    def _word_match(text: str, start: int, end: int, mode) -> bool:
+        """Kelime başında mı ve kalan kısım geçerli bir ek mi?"""
+        if start > 0 and text[start - 1] != ' ':
+            return False
+        word_end = text.find(' ', end)
+        rest = text[end:] if word_end == -1 else text[end:word_end]
+        if mode == 'exact':
+            return not rest
+        if mode == 'noun':
+            return rest in NOUN_SUFFIXES
+        # Fiil: her ek, kökle başlayan başka kelimeler hariç
+        return not any(rest.startswith(prefix) for prefix in mode[1])
+
+    @staticmethod
+    def _adjacent(required: tuple, positions: dict) -> bool:
+        """Özellikler ardışık kelimelerde ve sırayla mı?"""
+        return any(
+            all(i + k in positions.get(feature, ()) for k, feature in enumerate(required[1:], 1))
+            for i in positions.get(required[0], ())
+        )
+
+    def scan(self, text: str) -> tuple:
+        """normalize metin -> (özellikler, slotlar, özellik aralıkları)"""
+        features = set()
+        slots = {}
+        spans = []
+        for start, end, (kind, value, mode) in self._automaton.find(text):
+            if not self._word_match(text, start, end, mode):
+                continue
+            if kind == 'kw':
+                features.add(value)
+                spans.append((start, end, value))
+            elif kind == 'contact':
+                features.add('contact_name')
+                # En uzun eşleşen isim (tam ad ilk addan önce gelir)
+                if len(value) >= len(slots.get('contact', '')):
+                    slots['contact'] = value
+            else:
+                slots.setdefault(kind, value)
+        return features, slots, spans
+
+    def parse(self, text: str) -> Intent:
+        """Komut metnini niyete çevir"""
+        normalized = normalize(text)
+        features, slots, spans = self.scan(normalized)
+        word_count = len(normalized.split())
+
+        duration = parse_duration(normalized)
+        if duration:
+            slots['minutes'] = duration[0]
+
+        # Özellik -> geçtiği kelime sıraları (yan yana kuralları için)
+        positions = {}
+        for start, _, feature in spans:
+            positions.setdefault(feature, set()).add(len(normalized[:start].split()))
+
+        scores = {}
+        # Kural özellikleri bulunup sıra / uzunluk yüzünden elendiyse sınıflandırıcı da denemez
+        rejected = False
+        for intent, required, weight in RULES:
+            if all(f in features for f in required):
+                if intent in ADJACENT_INTENTS and not self._adjacent(required, positions):
+                    rejected = True
+                    continue
+                if word_count > MAX_WORDS.get(intent, word_count):
+                    rejected = True
+                    continue
+                scores[intent] = scores.get(intent, 0) + weight
+
+        if scores:
+            best = max(scores, key=lambda name: (scores[name], -INTENT_ORDER.index(name)))
+            if best == 'reminder':
+                slots['message'] = self._reminder_message(text, normalized, spans, duration)
+            self.metrics['keyword'] += 1
+            return Intent(best, slots, 1.0, 'keyword')
+
+        # Kelime tutmadı: yazım hatası olabilir (kısa komutlarda)
+        label, probability = self.classifier.predict(normalized)
+        if label != 'chat' and probability >= self.min_confidence and word_count <= 4 and not rejected:
+            if label == 'reminder':
+                slots['message'] = self._reminder_message(text, normalized, spans, duration)
+            self.metrics['classifier'] += 1
+            return Intent(label, slots, probability, 'classifier')
+
+        self.metrics['fallback'] += 1
+        return Intent('chat', slots, 1.0 - probability if label != 'chat' else probability, 'fallback')
+
+    @staticmethod
+    def _reminder_message(text: str, normalized: str, spans: list, duration) -> str:
+        """Tetik kelimeleri ve süre ifadesi atılmış özgün metin"""
+        removed = [(s, e) for s, e, feature in spans if feature == 'remind']
+        if duration:
+            removed.append(duration[1])
+        chars = list(text if len(text) == len(normalized) else normalized)
+        for start, end in removed:
+            # Fiil eklerini de at ("hatırlatır" -> tüm kelime)
+            word_end = normalized.find(' ', end)
+            end = len(normalized) if word_end == -1 else word_end
+            for i in range(start, end):
+                chars[i] = ' '
+        words = [w for w in "".join(chars).split() if normalize(w).strip() not in _FILLER]
+        return " ".join(words).strip(" ,.") or "Hatırlatıcı"
+
+    def get_stats(self) -> dict:
+        total = sum(self.metrics.values())
+        stats = dict(self.metrics)
+        stats['local_rate'] = (total - self.metrics['fallback']) / total if total else 0.0
+        return stats
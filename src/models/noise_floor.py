@@ -0,0 +1,139 @@
+# src/models/noise_floor.py - ANDROID UYUMLU
+"""
+Mikrofon gürültü tabanı tahmini
+- 🎚️ Sürekli arka plan kalibrasyonu (wake word / boşta mikrofon kareleri)
+- 💾 Kalibrasyon oturumlar arası saklanır
+- ⚡ listen() kalibrasyon beklemeden başlar
+"""
+
+import json
+import time
+import threading
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except:
+    NUMPY_AVAILABLE = False
+
+
+class NoiseFloorEstimator:
+    """
+    Gelen ses karelerinden ortam gürültüsünü takip eder ve
+    SpeechRecognition'ın energy_threshold değerini günceller.
+
+    Gürültü tabanı hızlı düşer, yavaş yükselir; böylece konuşma
+    kareleri tabanı yukarı çekmez ama ortam değişimine uyum sağlanır.
+    """
+
+    def __init__(self, cache_file: Path, recognizer=None,
+                 ratio: float = 1.5, min_threshold: float = 300,
+                 max_threshold: float = 4000, default_threshold: float = 3000,
+                 save_interval: float = 60.0):
+        self.cache_file = Path(cache_file)
+        self.recognizer = recognizer
+        self.ratio = ratio
+        self.min_threshold = min_threshold
+        self.max_threshold = max_threshold
+        self.save_interval = save_interval
+
+        # Takip katsayıları (kare başına)
+        self.fall_rate = 0.3
+        self.rise_rate = 0.005
+
+        self.noise_floor = None
+        self.energy_threshold = default_threshold
+        self.frames_seen = 0
+        self.calibrated = False
+
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._lock = threading.Lock()
+
+        self._load()
+        self._apply()
+
+    # ============================================
+    # KALİBRASYON
+    # ============================================
+
+    def update(self, frame) -> float:
+        """Bir ses karesi (int16) ile gürültü tabanını güncelle"""
+        if not NUMPY_AVAILABLE or frame is None or len(frame) == 0:
+            return self.energy_threshold
+
+        samples = np.asarray(frame, dtype=np.float32).reshape(-1)
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        return self.update_rms(rms)
+
+    def update_rms(self, rms: float) -> float:
+        """Hazır RMS değeri ile güncelle (audioop.rms ile aynı ölçek)"""
+        with self._lock:
+            if self.noise_floor is None:
+                self.noise_floor = rms
+            elif rms < self.noise_floor:
+                self.noise_floor += (rms - self.noise_floor) * self.fall_rate
+            else:
+                self.noise_floor += (rms - self.noise_floor) * self.rise_rate
+
+            self.frames_seen += 1
+            threshold = self.noise_floor * self.ratio
+            self.energy_threshold = max(self.min_threshold, min(self.max_threshold, threshold))
+            self.calibrated = True
+            self._dirty = True
+
+        self._apply()
+
+        if time.monotonic() - self._last_save > self.save_interval:
+            self._last_save = time.monotonic()
+            threading.Thread(target=self.save, daemon=True).start()
+
+        return self.energy_threshold
+
+    def is_speech(self, rms: float) -> bool:
+        """RMS değeri eşik üstünde mi?"""
+        return rms > self.energy_threshold
+
+    def _apply(self):
+        """Eşiği recognizer'a uygula"""
+        if self.recognizer is not None:
+            self.recognizer.energy_threshold = self.energy_threshold
+            if self.calibrated:
+                # Eşik artık buradan yönetilir; recognizer her cümlede kendi eşiğini uyarlamasın
+                self.recognizer.dynamic_energy_threshold = False
+
+    # ============================================
+    # KALICILIK
+    # ============================================
+
+    def _load(self):
+        """Kayıtlı kalibrasyonu yükle"""
+        try:
+            if self.cache_file.exists():
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.noise_floor = data.get('noise_floor')
+                self.energy_threshold = data.get('energy_threshold', self.energy_threshold)
+                self.calibrated = self.noise_floor is not None
+        except:
+            pass
+
+    def save(self):
+        """Kalibrasyonu kaydet"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                'noise_floor': self.noise_floor,
+                'energy_threshold': self.energy_threshold,
+                'updated': datetime.now().isoformat()
+            }
+            self._dirty = False
+
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except:
+            pass
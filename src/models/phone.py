@@ -36,6 +36,9 @@ class PhoneInfo:
         
         if IS_ANDROID:
             print("📱 Android modunda çalışıyor")
+        elif PSUTIL_AVAILABLE:
+            # İlk örnek: sonraki cpu_percent çağrıları beklemeden ölçer
+            psutil.cpu_percent(interval=None)
     
     def get_battery_info(self) -> str:
         """Batarya bilgileri"""
@@ -195,7 +198,8 @@ Kullanım: %{cpu_percent}
         # Bilgisayar için (psutil)
         elif PSUTIL_AVAILABLE:
             try:
-                cpu_percent = psutil.cpu_percent(interval=1)
+                # Son çağrıdan bu yana kullanım (1 sn bloklamaz)
+                cpu_percent = psutil.cpu_percent(interval=None)
                 cpu_count = psutil.cpu_count()
                 cpu_freq = psutil.cpu_freq()
                 
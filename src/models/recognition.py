@@ -0,0 +1,384 @@
+# src/models/recognition.py - ANDROID UYUMLU
+"""
+Konuşma tanıma arka uçları
+- ☁️ Google Speech (bulut)
+- 📴 Vosk / Kaldi küçük Türkçe model (çevrimdışı)
+- 📴 Whisper-tiny int8 (çevrimdışı, faster-whisper)
+- 🔀 Yönlendirme: kısa komutlar önce yerel, dikte önce bulut
+- ✏️ Konuşurken ara sonuçlar (Vosk akışı)
+- 💤 Yerel modeller ilk kullanımda (veya warm ile arka planda) bir kez yüklenir;
+  bellek eşlemesi (mmap) yok: Vosk ve CTranslate2 model dosyalarını kendi
+  yükleyicileriyle belleğe okur, Python tarafından eşlenecek bir yol sunmazlar
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+# Android tespiti
+IS_ANDROID = 'android' in sys.platform or 'ANDROID_ARGUMENT' in os.environ
+
+# Google Speech
+try:
+    import speech_recognition as sr
+    SR_AVAILABLE = True
+except:
+    SR_AVAILABLE = False
+
+# Vosk (çevrimdışı)
+try:
+    import vosk
+    VOSK_AVAILABLE = True
+except:
+    VOSK_AVAILABLE = False
+
+# Whisper (çevrimdışı, CPU int8)
+try:
+    from faster_whisper import WhisperModel
+    WHISPER_AVAILABLE = True
+except:
+    WHISPER_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except:
+    NUMPY_AVAILABLE = False
+
+
+class RecognitionBackend(ABC):
+    """Tanıma arka ucu arayüzü"""
+
+    name = "base"
+    is_local = False
+    supports_streaming = False
+
+    @property
+    @abstractmethod
+    def available(self) -> bool:
+        """Bağımlılıklar / model hazır mı?"""
+
+    @property
+    def ready(self) -> bool:
+        """Kullanıma hazır mı (model yükleme beklemeden)?"""
+        return True
+
+    def warm(self):
+        """Ağır kaynakları önceden yükle (yoksa bir şey yapmaz)"""
+
+    def open_stream(self, sample_rate: int):
+        """
+        Akış oturumu aç. Varsayılan: ara sonuç vermeyen, sesi biriktirip
+        finish()'te tek seferde tanıyan oturum (supports_streaming olanlar ezer).
+        """
+        return BufferedStream(self, sample_rate)
+
+    @abstractmethod
+    def recognize(self, pcm: bytes, sample_rate: int, language: str = "tr-TR") -> str:
+        """Ham PCM (int16 mono) -> metin. Anlaşılamazsa "" döndürür."""
+
+
+class BufferedStream:
+    """Akışsız arka uçlar için oturum - ara sonuç yok, sonda toplu tanıma"""
+
+    def __init__(self, backend: RecognitionBackend, sample_rate: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self._chunks = []
+
+    def feed(self, pcm: bytes) -> str:
+        self._chunks.append(pcm)
+        return ""
+
+    def finish(self) -> str:
+        return self.backend.recognize(b"".join(self._chunks), self.sample_rate)
+
+
+class GoogleBackend(RecognitionBackend):
+    """Google Speech (ağ gerekir)"""
+
+    name = "google"
+    is_local = False
+
+    def __init__(self, recognizer=None):
+        self.recognizer = recognizer or (sr.Recognizer() if SR_AVAILABLE else None)
+
+    @property
+    def available(self) -> bool:
+        return self.recognizer is not None
+
+    def recognize(self, pcm: bytes, sample_rate: int, language: str = "tr-TR") -> str:
+        audio = sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return self.recognizer.recognize_google(audio, language=language)
+        except sr.UnknownValueError:
+            return ""
+
+
+class VoskBackend(RecognitionBackend):
+    """Vosk / Kaldi küçük model - ilk kullanımda bir kez yüklenir"""
+
+    name = "vosk"
+    is_local = True
+    supports_streaming = True
+
+    def __init__(self, model_path: Path):
+        self.model_path = Path(model_path)
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return VOSK_AVAILABLE and self.model_path.exists()
+
+    def _get_model(self):
+        """Modeli tembel yükle (thread güvenli)"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    vosk.SetLogLevel(-1)
+                    started = time.perf_counter()
+                    self._model = vosk.Model(str(self.model_path))
+                    print(f"✅ Vosk modeli yüklendi ({time.perf_counter() - started:.1f} sn)")
+        return self._model
+
+    def recognize(self, pcm: bytes, sample_rate: int, language: str = "tr-TR") -> str:
+        recognizer = vosk.KaldiRecognizer(self._get_model(), sample_rate)
+        recognizer.AcceptWaveform(pcm)
+        result = json.loads(recognizer.FinalResult())
+        return result.get('text', '')
+
+    @property
+    def ready(self) -> bool:
+        """Model bellekte mi (akış açmak bloklamaz)?"""
+        return self._model is not None
+
+    def warm(self):
+        """Modeli önceden yükle (arka plan thread'inden çağrılır)"""
+        if self.available:
+            self._get_model()
+
+    def open_stream(self, sample_rate: int):
+        return VoskStream(vosk.KaldiRecognizer(self._get_model(), sample_rate))
+
+
+class VoskStream:
+    """Vosk akış oturumu - kare kare besle, ara sonuçları al"""
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+        self._final_parts = []
+
+    def feed(self, pcm: bytes) -> str:
+        """Kare ekle, güncel ara metni döndür"""
+        if self.recognizer.AcceptWaveform(pcm):
+            # Vosk bir cümle sınırı buldu
+            text = json.loads(self.recognizer.Result()).get('text', '')
+            if text:
+                self._final_parts.append(text)
+            return " ".join(self._final_parts)
+        partial = json.loads(self.recognizer.PartialResult()).get('partial', '')
+        return " ".join(self._final_parts + ([partial] if partial else []))
+
+    def finish(self) -> str:
+        """Son metni döndür"""
+        text = json.loads(self.recognizer.FinalResult()).get('text', '')
+        if text:
+            self._final_parts.append(text)
+        return " ".join(self._final_parts)
+
+
+class PartialTranscript:
+    """
+    Ardışık ara hipotezlerden kararlı öneki çıkarır.
+    Bir kelime, art arda iki hipotezde aynı konumda görünürse kararlıdır.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.stable_words = []
+        self._previous = []
+
+    def update(self, text: str) -> bool:
+        """Yeni hipotez -> metin değiştiyse True"""
+        if text == self.text:
+            return False
+        words = text.split()
+        common = []
+        for a, b in zip(self._previous, words):
+            if a != b:
+                break
+            common.append(a)
+        # Kararlı önek geri alınmaz, sadece uzar
+        if len(common) > len(self.stable_words):
+            self.stable_words = common
+        self._previous = words
+        self.text = text
+        return True
+
+    @property
+    def stable_prefix(self) -> str:
+        return " ".join(self.stable_words)
+
+
+class WhisperBackend(RecognitionBackend):
+    """Whisper-tiny, CPU üzerinde int8 nicemlenmiş (faster-whisper)"""
+
+    name = "whisper"
+    is_local = True
+
+    def __init__(self, model_size_or_path: str = "tiny", download_root: Path = None):
+        self.model_size_or_path = model_size_or_path
+        self.download_root = download_root
+        # Bulunan yerel model klasörü (bulununca bir daha aranmaz)
+        self._local_path = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        # Çevrimdışı yedek: model diskte yoksa ilk kullanımda indirmeye kalkmaz
+        return WHISPER_AVAILABLE and NUMPY_AVAILABLE and self.local_model_path() is not None
+
+    def local_model_path(self):
+        """
+        Diskteki model klasörü (yoksa None).
+        Yerel yol verildiyse o; model adı verildiyse download_root altındaki
+        Hugging Face önbelleği (models--*--faster-whisper-<ad>/snapshots/*/model.bin).
+        """
+        if self._local_path is not None:
+            return self._local_path
+        direct = Path(self.model_size_or_path)
+        if (direct / "model.bin").exists():
+            self._local_path = direct
+        elif self.download_root is not None and Path(self.download_root).exists():
+            pattern = f"models--*--faster-whisper-{self.model_size_or_path}/snapshots/*/model.bin"
+            for model_file in sorted(Path(self.download_root).glob(pattern)):
+                self._local_path = model_file.parent
+                break
+        return self._local_path
+
+    def _get_model(self):
+        """Modeli tembel yükle (thread güvenli, yalnız diskten)"""
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    path = self.local_model_path()
+                    if path is None:
+                        raise RuntimeError(f"Whisper modeli diskte yok: {self.model_size_or_path}")
+                    started = time.perf_counter()
+                    self._model = WhisperModel(str(path), device="cpu", compute_type="int8")
+                    print(f"✅ Whisper modeli yüklendi ({time.perf_counter() - started:.1f} sn)")
+        return self._model
+
+    def recognize(self, pcm: bytes, sample_rate: int, language: str = "tr-TR") -> str:
+        # Whisper 16 kHz float32 bekler
+        audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        if sample_rate != 16000:
+            positions = np.linspace(0, len(audio) - 1, int(len(audio) * 16000 / sample_rate))
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+        segments, _ = self._get_model().transcribe(
+            audio,
+            language=language.split('-')[0],
+            beam_size=1,
+            vad_filter=False
+        )
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+
+class RecognitionRouter:
+    """
+    Arka uçlar arasında yönlendirme.
+    mode='command' -> kısa ifadeler önce yerel modelde
+    mode='dictation' -> önce bulut, çevrimdışıysa yerel
+    """
+
+    def __init__(self, data_dir: Path, recognizer=None):
+        self.data_dir = Path(data_dir)
+        models_dir = self.data_dir / "models"
+
+        vosk_path = os.getenv("VOSK_MODEL_PATH") or str(models_dir / "vosk-model-small-tr-0.3")
+        whisper_model = os.getenv("WHISPER_MODEL", "tiny")
+
+        self.backends = {
+            'vosk': VoskBackend(vosk_path),
+            'whisper': WhisperBackend(whisper_model, download_root=models_dir / "whisper"),
+            'google': GoogleBackend(recognizer),
+        }
+
+        # Yönlendirme ayarları (recognition.json ile değiştirilebilir)
+        self.config = {
+            'short_max_seconds': 4.0,
+            'command': ['vosk', 'whisper', 'google'],
+            'dictation': ['google', 'whisper', 'vosk'],
+        }
+        self.config_file = self.data_dir / "recognition.json"
+        self._load_config()
+
+        self.last_backend = None
+
+        local = [name for name, b in self.backends.items() if b.is_local and b.available]
+        print(f"📴 Çevrimdışı tanıma: {', '.join(local) if local else '❌'}")
+
+    def _load_config(self):
+        """Yönlendirme ayarlarını yükle"""
+        try:
+            if self.config_file.exists():
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    self.config.update(json.load(f))
+        except:
+            pass
+
+    def route(self, duration: float, mode: str = "command") -> list:
+        """Bu ifade için denenecek arka uç sırası"""
+        if mode == "command" and duration > self.config['short_max_seconds']:
+            # Uzun "komut" aslında dikte gibi davranır
+            mode = "dictation"
+        order = self.config.get(mode, self.config['command'])
+        return [self.backends[name] for name in order
+                if name in self.backends and self.backends[name].available]
+
+    def streaming_backend(self):
+        """Ara sonuç verebilen ilk kullanılabilir arka uç"""
+        for backend in self.backends.values():
+            if backend.supports_streaming and backend.available:
+                return backend
+        return None
+
+    def warm_streaming(self):
+        """Akış modelini arka planda yükle; ilk ifadede yakalama döngüsü beklemez"""
+        backend = self.streaming_backend()
+        if backend is None or backend.ready:
+            return None
+
+        def load():
+            try:
+                backend.warm()
+            except Exception as e:
+                print(f"⚠️ {backend.name} modeli yüklenemedi: {e}")
+
+        thread = threading.Thread(target=load, name=f"{backend.name}-warm", daemon=True)
+        thread.start()
+        return thread
+
+    def recognize(self, pcm: bytes, sample_rate: int, mode: str = "command",
+                  language: str = "tr-TR") -> str:
+        """Sıradaki arka uçları dene, ilk anlaşılır sonucu döndür"""
+        duration = len(pcm) / 2 / sample_rate
+
+        for backend in self.route(duration, mode):
+            try:
+                text = backend.recognize(pcm, sample_rate, language)
+            except Exception as e:
+                print(f"⚠️ {backend.name} tanıma hatası: {e}")
+                continue
+            if text:
+                self.last_backend = backend.name
+                return text
+
+        return ""
@@ -0,0 +1,110 @@
+# src/models/recognition_benchmark.py
+"""
+Konuşma tanıma karşılaştırması - WER ve gecikme
+Kullanım:
+    python -m src.models.recognition_benchmark <wav_klasörü>
+
+Klasördeki her `ornek.wav` için aynı isimli `ornek.txt` referans metni beklenir.
+"""
+
+import sys
+import time
+import wave
+from pathlib import Path
+
+from src.models.recognition import RecognitionRouter
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Kelime hata oranı (Levenshtein, kelime bazında)"""
+    ref = reference.lower().split()
+    hyp = hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,          # silme
+                current[j - 1] + 1,       # ekleme
+                previous[j - 1] + (r != h)  # değiştirme
+            )
+        previous = current
+
+    return previous[-1] / len(ref)
+
+
+def load_fixtures(folder: Path) -> list:
+    """(isim, pcm, sample_rate, referans) listesi"""
+    fixtures = []
+    for wav_path in sorted(Path(folder).glob("*.wav")):
+        txt_path = wav_path.with_suffix(".txt")
+        if not txt_path.exists():
+            continue
+        with wave.open(str(wav_path), 'rb') as wf:
+            if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+                print(f"⚠️ {wav_path.name}: 16-bit mono değil, atlandı")
+                continue
+            pcm = wf.readframes(wf.getnframes())
+            sample_rate = wf.getframerate()
+        reference = txt_path.read_text(encoding='utf-8').strip()
+        fixtures.append((wav_path.name, pcm, sample_rate, reference))
+    return fixtures
+
+
+def run_benchmark(folder: Path, data_dir: Path = Path("data/voice")) -> dict:
+    """Tüm kullanılabilir arka uçları örnekler üzerinde karşılaştır"""
+    router = RecognitionRouter(data_dir)
+    fixtures = load_fixtures(folder)
+    if not fixtures:
+        print("📭 Örnek bulunamadı")
+        return {}
+
+    results = {}
+    for name, backend in router.backends.items():
+        if not backend.available:
+            continue
+
+        # İlk çağrı model yükleme süresini içerir, ayrı ölçülür
+        warmup_start = time.perf_counter()
+        try:
+            backend.recognize(fixtures[0][1], fixtures[0][2])
+        except Exception as e:
+            print(f"⚠️ {name} kullanılamadı: {e}")
+            continue
+        warmup = time.perf_counter() - warmup_start
+
+        errors = []
+        latencies = []
+        for _, pcm, sample_rate, reference in fixtures:
+            started = time.perf_counter()
+            try:
+                hypothesis = backend.recognize(pcm, sample_rate)
+            except Exception:
+                hypothesis = ""
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors.append(word_error_rate(reference, hypothesis))
+
+        latencies.sort()
+        results[name] = {
+            'wer': sum(errors) / len(errors),
+            'avg_ms': sum(latencies) / len(latencies),
+            'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            'warmup_s': warmup,
+        }
+
+    print(f"\n📊 {len(fixtures)} örnek üzerinde sonuçlar")
+    print(f"{'Arka uç':<10} {'WER':>7} {'Ort. ms':>9} {'p95 ms':>9} {'Yükleme':>9}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['wer']:>7.1%} {r['avg_ms']:>9.0f} {r['p95_ms']:>9.0f} {r['warmup_s']:>8.1f}s")
+
+    return results
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    run_benchmark(Path(sys.argv[1]))
@@ -0,0 +1,185 @@
+# src/models/speech_scheduler.py - ANDROID UYUMLU
+"""
+Öncelikli konuşma zamanlayıcı
+- 🔢 Konuşma başına öncelik
+- 🔁 Aynı anahtarlı eski cevabı yenisiyle değiştirme (supersede)
+- ✋ İptal tutamaçları ve yüksek öncelikle kesme (preemption)
+- ⌛ Çok bekleyen konuşmaları atma
+- 📊 Kuyruk derinliği ve bekleme süresi
+"""
+
+import time
+import heapq
+import itertools
+import threading
+from collections import deque
+
+# Öncelik seviyeleri
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+PRIORITY_URGENT = 3
+
+
+class SpeechHandle:
+    """Kuyruğa alınmış tek bir konuşma"""
+
+    def __init__(self, text: str, voice: str, speed: float, priority: int,
+                 key: str = None, max_age: float = None):
+        self.text = text
+        self.voice = voice
+        self.speed = speed
+        self.priority = priority
+        self.key = key
+        self.max_age = max_age
+        self.created = time.monotonic()
+        self.started = None
+        # 'queued' | 'speaking' | 'done' | 'cancelled' | 'superseded' | 'expired'
+        self.status = 'queued'
+        self._done = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.status in ('cancelled', 'superseded', 'expired')
+
+    def cancel(self):
+        """Konuşmayı iptal et (çalıyorsa durdurulur)"""
+        if self.status in ('queued', 'speaking'):
+            self._finish('cancelled')
+
+    def wait(self, timeout: float = None) -> bool:
+        """Konuşma bitene (veya iptal edilene) kadar bekle"""
+        return self._done.wait(timeout)
+
+    def _finish(self, status: str):
+        self.status = status
+        self._done.set()
+
+
+class SpeechScheduler:
+    """
+    sound_queue yerine geçen öncelik kuyruğu.
+    Yüksek öncelik önce okunur; eşit öncelikte ilk gelen önce.
+    """
+
+    def __init__(self, max_age: float = 20.0, on_preempt=None):
+        self.max_age = max_age
+        self.on_preempt = on_preempt
+
+        self._heap = []
+        self._counter = itertools.count()
+        self._by_key = {}
+        self._cond = threading.Condition()
+        self.current = None
+
+        self.counters = {
+            'submitted': 0,
+            'spoken': 0,
+            'superseded': 0,
+            'cancelled': 0,
+            'expired': 0,
+            'preempted': 0
+        }
+        self._waits = deque(maxlen=50)
+
+    def submit(self, text: str, voice: str, speed: float,
+               priority: int = PRIORITY_NORMAL, key: str = None,
+               max_age: float = None, preempt: bool = False) -> SpeechHandle:
+        """Konuşmayı kuyruğa al"""
+        handle = SpeechHandle(text, voice, speed, priority, key,
+                              max_age if max_age is not None else self.max_age)
+
+        with self._cond:
+            self.counters['submitted'] += 1
+
+            # Aynı anahtarla bekleyen eski cevabı değiştir
+            if key is not None:
+                old = self._by_key.get(key)
+                if old is not None and old.status == 'queued':
+                    old._finish('superseded')
+                    self.counters['superseded'] += 1
+                self._by_key[key] = handle
+
+            heapq.heappush(self._heap, (-priority, next(self._counter), handle))
+
+            # Çalan konuşmadan daha öncelikliyse kes
+            current = self.current
+            preempt_current = (current is not None and current.status == 'speaking' and
+                               (priority > current.priority or
+                                (preempt and key is not None and key == current.key)))
+            if preempt_current:
+                current._finish('cancelled')
+                self.counters['preempted'] += 1
+
+            self._cond.notify()
+
+        if preempt_current and self.on_preempt:
+            self.on_preempt(current)
+
+        return handle
+
+    def get(self, timeout: float = 1.0):
+        """Sıradaki geçerli konuşmayı al (yoksa None)"""
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                while self._heap:
+                    _, _, handle = heapq.heappop(self._heap)
+                    if handle.cancelled:
+                        if handle.status == 'cancelled':
+                            self.counters['cancelled'] += 1
+                        continue
+
+                    waited = time.monotonic() - handle.created
+                    if handle.max_age and waited > handle.max_age:
+                        handle._finish('expired')
+                        self.counters['expired'] += 1
+                        continue
+
+                    self._waits.append(waited)
+                    handle.status = 'speaking'
+                    handle.started = time.monotonic()
+                    self.current = handle
+                    return handle
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def done(self, handle: SpeechHandle):
+        """Çalma bitti"""
+        with self._cond:
+            if handle.status == 'speaking':
+                handle._finish('done')
+                self.counters['spoken'] += 1
+            if self.current is handle:
+                self.current = None
+            if handle.key is not None and self._by_key.get(handle.key) is handle:
+                del self._by_key[handle.key]
+
+    def cancel_all(self):
+        """Bekleyen tüm konuşmaları iptal et"""
+        with self._cond:
+            for _, _, handle in self._heap:
+                handle.cancel()
+            self._heap.clear()
+            self._by_key.clear()
+
+    def depth(self) -> int:
+        """Bekleyen (iptal edilmemiş) konuşma sayısı"""
+        with self._cond:
+            return sum(1 for _, _, h in self._heap if h.status == 'queued')
+
+    def empty(self) -> bool:
+        return self.depth() == 0
+
+    def get_stats(self) -> dict:
+        """Kuyruk derinliği ve bekleme süreleri"""
+        waits = sorted(self._waits)
+        stats = dict(self.counters)
+        stats['depth'] = self.depth()
+        stats['avg_wait_ms'] = (sum(waits) / len(waits) * 1000) if waits else 0.0
+        stats['max_wait_ms'] = (waits[-1] * 1000) if waits else 0.0
+        return stats
@@ -0,0 +1,234 @@
+# src/models/vad.py - ANDROID UYUMLU
+"""
+Ses aktivitesi algılama (VAD) ve konuşma sonu tespiti
+- 📈 Enerji + sıfır geçiş oranı (ZCR) modeli
+- 🧠 WebRTC VAD (kuruluysa)
+- ⏪ Ön kayıt (pre-roll) tamponu
+- ⏱️ Hangover ayarlı hızlı konuşma sonu tespiti
+- 🔇 TTS yankı kapısı (çalma sırasında dinleme)
+"""
+
+import time
+from collections import deque
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except:
+    NUMPY_AVAILABLE = False
+
+# WebRTC VAD (opsiyonel, daha isabetli)
+try:
+    import webrtcvad
+    WEBRTC_AVAILABLE = True
+except:
+    WEBRTC_AVAILABLE = False
+
+
+class EchoGate:
+    """
+    A.N.N.A'nın kendi sesini (TTS) mikrofondan ayıklar.
+    Çalma zaman damgaları tutulur; çalma sırasında mikrofona sızan
+    yankının enerjisi öğrenilir ve konuşma sayılmak için bu seviyenin
+    belirgin şekilde üstüne çıkmak gerekir (enerji tabanlı ducking).
+    """
+
+    def __init__(self, tail_ms: int = 250, barge_in_ratio: float = 2.0,
+                 learn_ms: int = 200):
+        self.tail = tail_ms / 1000
+        # Çalmanın ilk anlarında yankı seviyesi öğrenilir, her şey kapılanır
+        self.learn = learn_ms / 1000
+        self.barge_in_ratio = barge_in_ratio
+        self.echo_level = 0.0
+        self._playing_since = None
+        self._stopped_at = 0.0
+        self.gated_frames = 0
+
+    def playback_started(self):
+        """TTS çalmaya başladı"""
+        self._playing_since = time.monotonic()
+
+    def playback_stopped(self):
+        """TTS çalması bitti"""
+        self._playing_since = None
+        self._stopped_at = time.monotonic()
+
+    def is_active(self, at: float = None) -> bool:
+        """Verilen anda (varsayılan: şimdi) TTS çalıyor muydu?"""
+        at = time.monotonic() if at is None else at
+        since = self._playing_since
+        if since is not None and at >= since:
+            return True
+        # Hoparlör/oda gecikmesi için kısa kuyruk
+        return self._stopped_at - self.tail <= at <= self._stopped_at + self.tail
+
+    def observe(self, rms: float):
+        """Çalma sırasındaki mikrofon seviyesinden yankı seviyesini öğren"""
+        if rms > self.echo_level:
+            self.echo_level += (rms - self.echo_level) * 0.5
+        else:
+            self.echo_level += (rms - self.echo_level) * 0.02
+
+    def allows(self, rms: float, at: float = None) -> bool:
+        """Çalma sırasında bu kare kullanıcı konuşması sayılabilir mi?"""
+        at = time.monotonic() if at is None else at
+        since = self._playing_since
+        learning = since is not None and at - since < self.learn
+        allowed = not learning and rms > self.echo_level * self.barge_in_ratio
+        if not allowed:
+            self.gated_frames += 1
+            self.observe(rms)
+        return allowed
+
+
+class VoiceActivityDetector:
+    """
+    Kare bazlı konuşma / sessizlik sınıflandırıcı.
+    Eşik, NoiseFloorEstimator'dan gelen energy_threshold ile güncel tutulur.
+    """
+
+    def __init__(self, sample_rate: int = 16000, noise_floor=None,
+                 zcr_max: float = 0.35, loud_factor: float = 2.5,
+                 webrtc_mode: int = 2, echo_gate: EchoGate = None):
+        self.sample_rate = sample_rate
+        self.noise_floor = noise_floor
+        self.echo_gate = echo_gate
+        self.zcr_max = zcr_max
+        self.loud_factor = loud_factor
+
+        self.webrtc = None
+        if WEBRTC_AVAILABLE and sample_rate in (8000, 16000, 32000, 48000):
+            try:
+                self.webrtc = webrtcvad.Vad(webrtc_mode)
+            except:
+                self.webrtc = None
+
+        # WebRTC 10 ms alt kareleri
+        self._sub_frame = sample_rate // 100
+
+    @property
+    def threshold(self) -> float:
+        """Güncel enerji eşiği"""
+        if self.noise_floor is not None:
+            return self.noise_floor.energy_threshold
+        return 300
+
+    def analyse(self, frame, at: float = None):
+        """Kareyi analiz et -> (konuşma mı, rms). at: karenin yakalanma anı"""
+        samples = np.asarray(frame, dtype=np.int16).reshape(-1)
+        if len(samples) == 0:
+            return False, 0.0
+
+        floats = samples.astype(np.float32)
+        rms = float(np.sqrt(np.mean(floats * floats)))
+
+        # TTS çalarken yankı seviyesinin altındaki her şey sessizliktir
+        if self.echo_gate is not None and self.echo_gate.is_active(at):
+            if not self.echo_gate.allows(rms, at):
+                return False, rms
+
+        if self.webrtc is not None:
+            return self._webrtc_is_speech(samples) and rms > self.threshold * 0.5, rms
+
+        if rms <= self.threshold:
+            return False, rms
+
+        # Çok yüksek enerji her zaman konuşma sayılır
+        if rms > self.threshold * self.loud_factor:
+            return True, rms
+
+        # Tıslama / fan gürültüsü yüksek ZCR verir
+        signs = np.signbit(samples)
+        zcr = float(np.count_nonzero(signs[1:] != signs[:-1])) / len(samples)
+        return zcr < self.zcr_max, rms
+
+    def _webrtc_is_speech(self, samples) -> bool:
+        """10 ms alt karelerde çoğunluk oyu"""
+        step = self._sub_frame
+        votes = 0
+        total = 0
+        for start in range(0, len(samples) - step + 1, step):
+            chunk = samples[start:start + step].tobytes()
+            try:
+                votes += 1 if self.webrtc.is_speech(chunk, self.sample_rate) else 0
+            except Exception:
+                pass
+            total += 1
+        return total > 0 and votes * 2 >= total
+
+
+class Endpointer:
+    """
+    Akış halinde konuşma başı / sonu tespiti.
+    feed() her kare için çağrılır ve şu olaylardan birini döndürür:
+    None, 'start', 'end', 'timeout'
+    """
+
+    def __init__(self, vad: VoiceActivityDetector, frame_ms: float = 32,
+                 pre_roll_ms: int = 300, start_ms: int = 64,
+                 hangover_ms: int = 400, timeout: float = 5,
+                 phrase_limit: float = 10):
+        self.vad = vad
+        self.frame_ms = frame_ms
+        self.start_frames = max(1, int(start_ms / frame_ms))
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.timeout = timeout
+        self.phrase_limit = phrase_limit
+
+        self.pre_roll = deque(maxlen=max(1, int(pre_roll_ms / frame_ms)))
+        self.frames = []
+        self.in_speech = False
+        self.speech_run = 0
+        self.silence_run = 0
+
+        self.started_at = time.monotonic()
+        self.speech_started_at = None
+        self.speech_ended_at = None
+
+    def feed(self, frame, at: float = None):
+        """Kareyi işle ve olay döndür. at: karenin yakalanma anı"""
+        now = time.monotonic()
+        is_speech, rms = self.vad.analyse(frame, at)
+
+        if not self.in_speech:
+            self.pre_roll.append(frame)
+            self.speech_run = self.speech_run + 1 if is_speech else 0
+
+            if self.speech_run >= self.start_frames:
+                self.in_speech = True
+                self.speech_started_at = now
+                self.frames = list(self.pre_roll)
+                self.pre_roll.clear()
+                self.silence_run = 0
+                return 'start'
+
+            if self.timeout and now - self.started_at > self.timeout:
+                return 'timeout'
+            return None
+
+        self.frames.append(frame)
+
+        if is_speech:
+            self.silence_run = 0
+        else:
+            self.silence_run += 1
+            if self.silence_run >= self.hangover_frames:
+                # Konuşma hangover başlangıcında bitti
+                self.speech_ended_at = now - self.silence_run * self.frame_ms / 1000
+                return 'end'
+
+        if self.phrase_limit and now - self.speech_started_at > self.phrase_limit:
+            self.speech_ended_at = now
+            return 'end'
+
+        return None
+
+    def is_idle_frame(self) -> bool:
+        """Son kare sessizlik miydi? (gürültü tabanı beslemesi için)"""
+        return not self.in_speech and self.speech_run == 0
+
+    def audio_bytes(self) -> bytes:
+        """Yakalanan konuşmanın ham PCM (int16) verisi"""
+        if not self.frames:
+            return b""
+        return np.concatenate([np.asarray(f, dtype=np.int16).reshape(-1) for f in self.frames]).tobytes()
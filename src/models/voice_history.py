@@ -0,0 +1,249 @@
+# src/models/voice_history.py - ANDROID UYUMLU
+"""
+Konuşma geçmişi kalıcılığı - Append-only JSONL günlük
+- ✍️ Arka plan yazıcı (toplu yazma + periyodik fsync)
+- 🗜️ Periyodik sıkıştırma (son N kayıt)
+- ⚡ Yüklemede sadece dosyanın sonu okunur
+- 🔒 Dosyayı yalnız yazıcı thread değiştirir (eski biçimden aktarma dahil)
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+from pathlib import Path
+
+
+class VoiceHistoryLog:
+    """
+    Konuşma geçmişi ve istatistikleri için append-only günlük.
+    append() hiçbir zaman diske dokunmaz; kayıtlar kuyruğa atılır ve
+    arka plan thread'i tarafından toplu olarak yazılır.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 100,
+                 flush_interval: float = 2.0, compact_factor: int = 5):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        # Dosya max_entries * compact_factor satırı geçince sıkıştırılır
+        self.compact_limit = max_entries * compact_factor
+
+        self._queue = queue.Queue()
+        # Okuma ile yeniden yazma aynı anda olmasın
+        self._io_lock = threading.Lock()
+        # Yalnız yazıcı thread günceller
+        self._line_count = self._count_lines()
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ============================================
+    # YAZMA
+    # ============================================
+
+    def append(self, entry: dict, stats: dict = None):
+        """Kayıt ekle (bloklamaz)"""
+        self._queue.put(('h', dict(entry)))
+        if stats is not None:
+            self._queue.put(('s', dict(stats)))
+
+    def update_stats(self, stats: dict):
+        """Sadece istatistikleri güncelle (bloklamaz)"""
+        self._queue.put(('s', dict(stats)))
+
+    def clear(self, stats: dict = None):
+        """Günlüğü temizle (bloklamaz)"""
+        self._queue.put(('clear', dict(stats) if stats else None))
+
+    def flush(self, timeout: float = 5.0):
+        """Bekleyen kayıtların yazılmasını bekle"""
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        done.wait(timeout)
+
+    def close(self):
+        """Yazıcıyı durdur (bekleyenleri yazar)"""
+        if not self._running:
+            return
+        self.flush()
+        self._running = False
+        self._queue.put(('stop', None))
+
+    def _writer_loop(self):
+        """Arka plan yazıcı - kayıtları biriktirir, flush_interval'da bir yazar"""
+        pending = []
+        last_stats = None
+        next_flush = time.monotonic() + self.flush_interval
+
+        while True:
+            try:
+                wait = max(0.0, next_flush - time.monotonic())
+                kind, payload = self._queue.get(timeout=wait)
+            except queue.Empty:
+                kind, payload = None, None
+
+            if kind == 'h':
+                pending.append({'t': 'h', **payload})
+            elif kind == 's':
+                last_stats = payload
+            elif kind == 'clear':
+                pending = []
+                self._rewrite([], payload)
+                last_stats = None
+                continue
+            elif kind == 'import':
+                self._import_legacy(payload)
+                continue
+
+            # Süre dolmadıysa ve zorunlu flush yoksa biriktirmeye devam et
+            if kind in ('h', 's') and time.monotonic() < next_flush:
+                continue
+
+            if pending or last_stats is not None:
+                records = pending
+                if last_stats is not None:
+                    records = records + [{'t': 's', 'stats': last_stats}]
+                self._write_batch(records)
+                pending = []
+                last_stats = None
+
+            if self._line_count > self.compact_limit:
+                self._compact()
+
+            next_flush = time.monotonic() + self.flush_interval
+
+            if kind == 'flush':
+                payload.set()
+            elif kind == 'stop':
+                return
+
+    def _write_batch(self, records: list):
+        """Kayıtları dosyanın sonuna ekle ve fsync et"""
+        try:
+            with self._io_lock:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._line_count += len(records)
+        except Exception as e:
+            print(f"⚠️ Geçmiş yazma hatası: {e}")
+
+    def _compact(self):
+        """Günlüğü son N kayda sıkıştır"""
+        history, stats = self.load_tail()
+        self._rewrite(history, stats)
+
+    def _rewrite(self, history: list, stats: dict = None) -> bool:
+        """Dosyayı atomik olarak yeniden yaz"""
+        records = [{'t': 'h', **h} for h in history[-self.max_entries:]]
+        if stats is not None:
+            records.append({'t': 's', 'stats': stats})
+
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with self._io_lock:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            self._line_count = len(records)
+            return True
+        except Exception as e:
+            print(f"⚠️ Geçmiş sıkıştırma hatası: {e}")
+            return False
+
+    # ============================================
+    # OKUMA
+    # ============================================
+
+    def load_tail(self):
+        """Dosyanın sonundan son N kaydı ve en güncel istatistikleri oku"""
+        history = []
+        stats = None
+
+        for line in reversed(self._tail_lines(self.max_entries * 2 + 1)):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Yarım kalmış son satır olabilir
+                continue
+
+            kind = record.pop('t', 'h')
+            if kind == 's':
+                if stats is None:
+                    stats = record.get('stats')
+            elif len(history) < self.max_entries:
+                history.append(record)
+
+            if stats is not None and len(history) >= self.max_entries:
+                break
+
+        history.reverse()
+        return history, stats
+
+    def _tail_lines(self, count: int, block_size: int = 8192) -> list:
+        """Dosyanın son `count` satırını geriye doğru bloklar halinde oku"""
+        if not self.path.exists():
+            return []
+
+        try:
+            with self._io_lock, open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                data = b""
+
+                while position > 0 and data.count(b"\n") <= count:
+                    read_size = min(block_size, position)
+                    position -= read_size
+                    f.seek(position)
+                    data = f.read(read_size) + data
+
+            lines = data.decode('utf-8', errors='ignore').splitlines()
+            if position > 0:
+                # İlk satır bloğun ortasından başlamış olabilir
+                lines = lines[1:]
+            return [l for l in lines[-count:] if l.strip()]
+        except Exception:
+            return []
+
+    def _count_lines(self) -> int:
+        """Mevcut satır sayısı (sıkıştırma eşiği için)"""
+        if not self.path.exists():
+            return 0
+        try:
+            with open(self.path, 'rb') as f:
+                return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(65536), b""))
+        except Exception:
+            return 0
+
+    def import_legacy(self, legacy_file: Path, timeout: float = 5.0):
+        """
+        Eski voice_history.json dosyasını günlüğe aktar.
+        Aktarma yazıcı thread'inde yapılır (ilk kayıtlarla çakışmaz);
+        sonraki load_tail() aktarılan kayıtları görsün diye beklenir.
+        """
+        self._queue.put(('import', Path(legacy_file)))
+        self.flush(timeout)
+
+    def _import_legacy(self, legacy_file: Path):
+        """Yazıcı thread'i: günlük henüz yoksa eski dosyayı yeniden yazarak aktar"""
+        if self.path.exists() or not legacy_file.exists():
+            return
+
+        try:
+            with open(legacy_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # Yazılamadıysa eski dosya silinmez, sonraki açılışta yeniden denenir
+            if self._rewrite(data.get('history', []), data.get('stats')):
+                legacy_file.unlink()
+                print("✅ Eski konuşma geçmişi JSONL günlüğüne aktarıldı")
+        except Exception as e:
+            print(f"⚠️ Eski geçmiş aktarılamadı: {e}")
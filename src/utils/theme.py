@@ -0,0 +1,192 @@
+# src/utils/theme.py - ANDROID UYUMLU
+"""
+Tema jetonları (Flet)
+- 🎨 3 mavi tema: koyu, okyanus, buz; her tema aynı jeton tablosu
+- 🔁 MobileTheme.current tek sözlüktür, tema değişince yerinde güncellenir
+- 🖌️ Mevcut kontroller yeniden kurulmadan boyanır: eski jeton rengi -> yeni jeton rengi
+- 🫥 Saydamlık ekleri korunur (colors["primary"] + "40")
+"""
+
+import dataclasses
+
+# Tüm renkler #RRGGBB; kullanım yerinde saydamlık eki eklenebilir.
+# Bir tema içinde her jetonun rengi farklı olmalı (boyama renkten jetonu bulur).
+THEMES = {
+    "dark": {
+        "bg_primary": "#0a0e1a",
+        "bg_secondary": "#121829",
+        "glass": "#1a2236",
+        "glass_dark": "#0f1524",
+        "primary": "#3b82f6",
+        "primary_light": "#60a5fa",
+        "secondary": "#6366f1",
+        "accent": "#22d3ee",
+        "accent_light": "#67e8f9",
+        "text": "#f1f5f9",
+        "text_secondary": "#cbd5e1",
+        "text_muted": "#64748b",
+        "success": "#22c55e",
+        "warning": "#f59e0b",
+        "error": "#ef4444",
+        "info": "#38bdf8",
+    },
+    "ocean": {
+        "bg_primary": "#031926",
+        "bg_secondary": "#06283d",
+        "glass": "#0b3954",
+        "glass_dark": "#052233",
+        "primary": "#1e90ff",
+        "primary_light": "#4fb3ff",
+        "secondary": "#00a6a6",
+        "accent": "#2ec4b6",
+        "accent_light": "#7de2d1",
+        "text": "#e6f6ff",
+        "text_secondary": "#b8d8e8",
+        "text_muted": "#5e8ca6",
+        "success": "#2ecc71",
+        "warning": "#f4a261",
+        "error": "#e63946",
+        "info": "#48cae4",
+    },
+    "ice": {
+        "bg_primary": "#eaf4fb",
+        "bg_secondary": "#d6eaf8",
+        "glass": "#ffffff",
+        "glass_dark": "#c5dcec",
+        "primary": "#1565c0",
+        "primary_light": "#42a5f5",
+        "secondary": "#5c6bc0",
+        "accent": "#0097a7",
+        "accent_light": "#4dd0e1",
+        "text": "#0d1b2a",
+        "text_secondary": "#34495e",
+        "text_muted": "#7b8fa1",
+        "success": "#2e7d32",
+        "warning": "#ef6c00",
+        "error": "#c62828",
+        "info": "#0288d1",
+    },
+}
+
+# Kontrollerde doğrudan renk tutan özellikler
+COLOR_ATTRS = (
+    "bgcolor", "color", "icon_color", "border_color", "focused_border_color",
+    "cursor_color", "selection_color", "fill_color", "focused_color",
+)
+
+# Renk içeren stil nesneleri (Border, Gradient, BoxShadow, TextStyle, ButtonStyle)
+STYLE_ATTRS = (
+    "border", "gradient", "shadow", "text_style", "hint_style", "label_style", "style",
+)
+
+
+class MobileTheme:
+    """
+    Etkin tema. Kontroller renklerini colors[jeton] ile alır;
+    set_theme() sonrası restyle() ile ekrandakiler yerinde boyanır.
+    """
+
+    name = "dark"
+    current = dict(THEMES["dark"])
+
+    @classmethod
+    def set_theme(cls, name: str) -> dict:
+        """Temayı değiştir -> önceki renkler (restyle için)"""
+        if name not in THEMES:
+            print(f"⚠️ Bilinmeyen tema: {name}")
+            return dict(cls.current)
+        previous = dict(cls.current)
+        cls.current.update(THEMES[name])
+        cls.name = name
+        return previous
+
+    @classmethod
+    def restyle(cls, roots, previous: dict) -> int:
+        """Kontrol ağaçlarını önceki temadan etkin temaya boya -> değişen özellik sayısı"""
+        mapping = {}
+        for token, old in previous.items():
+            new = cls.current.get(token)
+            if new and old.lower() != new.lower():
+                mapping.setdefault(old.lower(), new)
+        if not mapping:
+            return 0
+        painter = _Painter(mapping)
+        for root in roots:
+            painter.control(root)
+        return painter.changed
+
+
+class _Painter:
+    """Ağacı bir kez dolaşır; ortak stil nesneleri iki kez boyanmaz"""
+
+    def __init__(self, mapping: dict):
+        self.mapping = mapping
+        self.changed = 0
+        self._seen = set()
+
+    def color(self, value):
+        if isinstance(value, str) and value.startswith("#") and len(value) >= 7:
+            new = self.mapping.get(value[:7].lower())
+            if new is not None:
+                self.changed += 1
+                return new + value[7:]
+        return value
+
+    def value(self, value):
+        """Renk, renk listesi / sözlüğü (durum -> renk) veya stil nesnesi"""
+        if isinstance(value, str):
+            return self.color(value)
+        if isinstance(value, list):
+            return [self.value(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self.value(v) for k, v in value.items()}
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            self.style(value)
+        return value
+
+    def style(self, obj):
+        if id(obj) in self._seen:
+            return
+        self._seen.add(id(obj))
+        for field in dataclasses.fields(obj):
+            old = getattr(obj, field.name, None)
+            if old is None:
+                continue
+            new = self.value(old)
+            if new is not old:
+                setattr(obj, field.name, new)
+
+    def control(self, control):
+        if control is None or id(control) in self._seen:
+            return
+        self._seen.add(id(control))
+
+        for attr in COLOR_ATTRS:
+            old = getattr(control, attr, None)
+            if isinstance(old, str):
+                new = self.color(old)
+                if new != old:
+                    setattr(control, attr, new)
+
+        for attr in STYLE_ATTRS:
+            old = getattr(control, attr, None)
+            if old is not None and not isinstance(old, str):
+                # Yeniden atama: Flet stil nesnesini güncellemede tekrar yazar
+                setattr(control, attr, self.value(old))
+
+        for child in _children(control):
+            self.control(child)
+
+
+def _children(control) -> list:
+    get_children = getattr(control, "_get_children", None)
+    if callable(get_children):
+        try:
+            return [c for c in get_children() if c is not None]
+        except Exception:
+            pass
+    children = list(getattr(control, "controls", None) or [])
+    content = getattr(control, "content", None)
+    if content is not None and not isinstance(content, str):
+        children.append(content)
+    return children
@@ -0,0 +1,128 @@
+# src/utils/ui_scheduler.py - ANDROID UYUMLU
+"""
+UI güncelleme zamanlayıcı (Flet)
+- 🧺 Kontrol değişiklikleri kirli olarak işaretlenir, tek thread'den gönderilir
+- 🎞️ Kare başına en fazla bir gönderim (varsayılan 30 fps)
+- 🎯 Sayfanın tamamı yerine yalnız kirli kontroller: page.update(*kontroller)
+- 📊 İstenen / gönderilen güncelleme sayaçları
+"""
+
+import time
+import threading
+
+
+class UIScheduler:
+    """
+    page.update() yerine mark(kontrol) çağrılır.
+    Aynı kare içindeki istekler birleştirilir; art arda 50 akış parçası
+    veya 10 dalga karesi tek gönderime iner.
+    """
+
+    def __init__(self, page, fps: float = 30.0):
+        self.page = page
+        self.interval = 1.0 / fps
+        self._dirty = {}
+        self._full = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = True
+        self._last_flush = 0.0
+
+        self.counters = {
+            'requested': 0,      # mark / mark_page çağrıları
+            'flushed': 0,        # gerçek gönderimler (kare)
+            'controls_sent': 0,  # gönderilen kontrol sayısı
+            'full_updates': 0,   # tüm sayfa gönderimleri
+            'errors': 0
+        }
+
+        self._thread = threading.Thread(target=self._loop, name="anna-ui", daemon=True)
+        self._thread.start()
+
+    # ============================================
+    # İSTEK
+    # ============================================
+
+    def mark(self, *controls):
+        """Kontrolleri kirli işaretle (bir sonraki karede gönderilir)"""
+        with self._lock:
+            for control in controls:
+                if control is not None:
+                    self._dirty[id(control)] = control
+            self.counters['requested'] += 1
+        self._wake.set()
+
+    def mark_page(self):
+        """Sayfa düzeyi değişiklik (snack_bar, dialog, tema): tüm sayfa gönderilir"""
+        with self._lock:
+            self._full = True
+            self.counters['requested'] += 1
+        self._wake.set()
+
+    def flush(self):
+        """Bekleyenleri hemen gönder (örn. page.clean() öncesi)"""
+        with self._lock:
+            dirty = list(self._dirty.values())
+            full = self._full
+            self._dirty.clear()
+            self._full = False
+        self._send(dirty, full)
+
+    # ============================================
+    # GÖNDERİM
+    # ============================================
+
+    def _loop(self):
+        while self._running:
+            self._wake.wait()
+            if not self._running:
+                break
+            # Kare sınırına kadar bekle; bu sürede gelen istekler birikir
+            delay = self._last_flush + self.interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._wake.clear()
+            self.flush()
+
+    @staticmethod
+    def _mounted(control) -> bool:
+        """Henüz sayfaya eklenmemiş kontrol, ebeveyni gönderilince zaten çizilir"""
+        try:
+            return getattr(control, 'page', True) is not None
+        except Exception:
+            return False
+
+    def _send(self, dirty: list, full: bool):
+        dirty = [c for c in dirty if self._mounted(c)]
+        if not dirty and not full:
+            return
+        self._last_flush = time.monotonic()
+        self.counters['flushed'] += 1
+        try:
+            if full:
+                # Tüm sayfa zaten kirli kontrolleri de kapsar
+                self.counters['full_updates'] += 1
+                self.page.update()
+                return
+            self.counters['controls_sent'] += len(dirty)
+            self.page.update(*dirty)
+        except Exception:
+            # Sayfadan kaldırılmış bir kontrol toplu gönderimi bozabilir: tek tek dene
+            for control in dirty:
+                try:
+                    control.update()
+                except Exception:
+                    self.counters['errors'] += 1
+
+    def stop(self):
+        """Zamanlayıcıyı durdur (bekleyenler gönderilir)"""
+        self._running = False
+        self._wake.set()
+        self.flush()
+
+    def get_stats(self) -> dict:
+        stats = dict(self.counters)
+        requested = stats['requested']
+        stats['coalesced'] = max(0, requested - stats['flushed'])
+        stats['ratio'] = stats['flushed'] / requested if requested else 0.0
+        return stats
@@ -0,0 +1,79 @@
+# tests/test_audio_capture.py
+"""Ortak ses akışı: halka tampon, okuyucular, seviye göstergesi"""
+
+import time
+import threading
+
+import pytest
+
+from src.models.audio_capture import AudioCaptureService, AudioReader, AudioRingBuffer
+
+
+def test_ring_buffer_overwrites_oldest():
+    ring = AudioRingBuffer(4)
+    for i in range(6):
+        ring.push(f"kare {i}", captured_at=float(i))
+
+    assert ring.write_seq == 6
+    assert ring.oldest_seq == 3
+    assert ring.get(2) is None
+    assert ring.get(3) == "kare 3"
+    assert ring.get(6) is None
+    assert ring.time_of(5) == 5.0
+
+
+def make_service(running=True):
+    service = AudioCaptureService(sample_rate=16000, blocksize=160, buffer_seconds=0.05)
+    # Gerçek mikrofon açılmaz; kareler doğrudan tampona itilir
+    service.start = lambda: True
+    service.running = running
+    return service
+
+
+def push(service, frame):
+    service.ring.push(frame, time.monotonic())
+    with service._data_ready:
+        service._data_ready.notify_all()
+
+
+def test_reader_reads_in_order_and_counts_dropped_frames():
+    service = make_service()
+    reader = AudioReader(service, start_seq=0)
+    for i in range(service.ring.capacity + 3):
+        push(service, i)
+
+    frame, seq = reader.read(timeout=0.1)
+    assert seq == service.ring.oldest_seq
+    assert reader.dropped == service.ring.oldest_seq
+    assert frame == seq
+
+
+def test_reader_wakes_when_frame_arrives():
+    service = make_service()
+    reader = service.reader()
+    threading.Timer(0.05, push, args=(service, "yeni")).start()
+    assert reader.read(timeout=2.0) == ("yeni", 0)
+
+
+def test_reader_returns_none_when_stream_stops():
+    service = make_service(running=False)
+    assert service.reader().read(timeout=0.05) == (None, None)
+
+
+def test_level_meter_tracks_recent_levels():
+    np = pytest.importorskip("numpy")
+    service = make_service()
+    service.subscribe_level_meter()
+    try:
+        push(service, np.zeros(160, dtype=np.int16))
+        push(service, np.full(160, 16384, dtype=np.int16))
+        deadline = time.monotonic() + 2.0
+        while len(service.levels) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert service.recent_levels(2) == pytest.approx([0.0, 0.5])
+        assert service.level == pytest.approx(0.5)
+    finally:
+        service.unsubscribe_level_meter()
+    assert service.recent_levels(20) == []
+    assert 'level_meter' not in service._subscribers
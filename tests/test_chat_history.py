@@ -0,0 +1,125 @@
+# tests/test_chat_history.py
+"""Sohbet geçmişi: bellek halkası, dizinle diskten eski sayfa, güncellemeler, sıkıştırma"""
+
+import types
+
+import pytest
+
+from src.models.chat_history import ChatHistory
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "chat.jsonl"
+
+
+def make_history(path, **kwargs):
+    kwargs.setdefault("save_delay", 60)
+    return ChatHistory(path, **kwargs)
+
+
+def fill(history, count, start=0):
+    return [history.append("Sen", f"mesaj {start + i}", True) for i in range(count)]
+
+
+def texts(messages):
+    return [m.text for m in messages]
+
+
+def test_ring_keeps_newest_in_memory(path):
+    history = make_history(path, max_memory=5)
+    fill(history, 8)
+    assert len(history) == 5
+    assert texts(history.recent(3)) == ["mesaj 5", "mesaj 6", "mesaj 7"]
+    assert history.oldest_seq == 1
+    assert history.recent(0) == []
+
+
+def test_older_served_from_ring(path):
+    history = make_history(path, max_memory=10)
+    messages = fill(history, 6)
+    assert texts(history.older(messages[4].seq, 2)) == ["mesaj 2", "mesaj 3"]
+    # Halka en eski mesajı içeriyor: disk okunmaz, eksik sayfa döner
+    assert texts(history.older(messages[1].seq, 5)) == ["mesaj 0"]
+    assert not path.exists()
+
+
+def test_older_reads_only_indexed_rows_from_disk(path, monkeypatch):
+    history = make_history(path, max_memory=5)
+    fill(history, 20)
+    history.save()
+
+    reloaded = make_history(path, max_memory=5)
+    assert texts(reloaded.recent(5)) == [f"mesaj {i}" for i in range(15, 20)]
+    monkeypatch.setattr(reloaded, "_scan_disk", lambda: pytest.fail("tüm dosya tarandı"))
+
+    first = reloaded.recent(5)[0].seq
+    page = reloaded.older(first, 4)
+    assert texts(page) == [f"mesaj {i}" for i in range(11, 15)]
+    assert texts(reloaded.older(page[0].seq, 20)) == [f"mesaj {i}" for i in range(11)]
+    assert reloaded.older(1, 5) == []
+
+
+def test_older_flushes_pending_before_reading(path):
+    history = make_history(path, max_memory=3)
+    fill(history, 6)
+    # Kaydedilmemiş mesajlar da dizine girer
+    assert texts(history.older(history.recent(3)[0].seq, 2)) == ["mesaj 1", "mesaj 2"]
+
+
+def test_update_is_reappended_and_latest_wins(path):
+    history = make_history(path, max_memory=2)
+    messages = fill(history, 4)
+    history.save()
+
+    messages[0].view = types.SimpleNamespace(value="düzeltilmiş")
+    history.release(messages[0])
+    history.save()
+    assert messages[0].view is None
+    assert path.read_text(encoding="utf-8").count("\n") == 5
+
+    assert texts(history.older(messages[2].seq, 2)) == ["düzeltilmiş", "mesaj 1"]
+    reloaded = make_history(path, max_memory=2)
+    assert texts(reloaded.older(messages[2].seq, 2)) == ["düzeltilmiş", "mesaj 1"]
+
+
+def test_compaction_keeps_newest_rows_and_rebuilds_index(path):
+    history = make_history(path, max_memory=2, max_rows=5)
+    messages = fill(history, 8)
+    history.save()
+    for message in messages[-3:]:
+        history.changed(message)
+    history.save()
+
+    assert history.get_stats()['file_lines'] == 5
+    assert path.read_text(encoding="utf-8").count("\n") == 5
+    assert history.oldest_seq == messages[3].seq
+    assert texts(history.older(messages[6].seq, 10)) == [f"mesaj {i}" for i in range(3, 6)]
+
+    reloaded = make_history(path, max_memory=2)
+    assert reloaded.oldest_seq == messages[3].seq
+    assert texts(reloaded.recent(2)) == ["mesaj 6", "mesaj 7"]
+
+
+def test_sequence_continues_after_reload(path):
+    history = make_history(path)
+    fill(history, 3)
+    history.save()
+    assert make_history(path).append("ANNA", "yeni", False).seq == 4
+
+
+def test_clear_removes_file_and_index(path):
+    history = make_history(path, max_memory=2)
+    fill(history, 5)
+    history.save()
+    history.clear()
+
+    assert not path.exists()
+    assert len(history) == 0
+    assert history.oldest_seq is None
+    assert history.older(10, 5) == []
+
+    message = history.append("Sen", "baştan", True)
+    history.save()
+    assert history.oldest_seq == message.seq
+    assert texts(make_history(path).recent(5)) == ["baştan"]
@@ -0,0 +1,155 @@
+# tests/test_command_executor.py
+"""Komut yürütücü: zaman aşımı, takılı işçiler, gruplar, kapasite ve sayaçlar"""
+
+import time
+import threading
+
+import pytest
+
+from src.models.command_executor import CommandExecutor
+
+
+def wait_until(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("koşul zamanında sağlanmadı")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def executor():
+    executor = CommandExecutor(max_workers=2, max_pending=3, default_timeout=5,
+                               groups={'photo': 'camera', 'ocr': 'camera'})
+    yield executor
+    executor.shutdown()
+
+
+def blocking_job(started: threading.Event, release: threading.Event):
+    """check() çağırmayan iş: zaman aşımında işçiyi bırakmaz"""
+    def job(handle):
+        started.set()
+        release.wait(5)
+        return "bitti"
+    return job
+
+
+def test_completed_command_is_counted(executor):
+    handle = executor.submit('weather', lambda handle, city: city.upper(), "izmir")
+    assert handle.future.result(2) == "IZMIR"
+    wait_until(lambda: not executor.in_flight)
+
+    stats = executor.get_stats()
+    assert handle.status == 'done'
+    assert stats['submitted'] == 1 and stats['done'] == 1
+    assert stats['in_flight'] == 0 and stats['busy_workers'] == 0
+    assert 'p50_ms' in stats
+
+
+def test_timeout_orphans_running_worker_until_it_finishes(executor):
+    started, release = threading.Event(), threading.Event()
+    timed_out = []
+    handle = executor.submit('ai', blocking_job(started, release), timeout=0.05,
+                             on_timeout=timed_out.append)
+    assert started.wait(2)
+    wait_until(lambda: handle.status == 'timed_out')
+    wait_until(lambda: handle.id in executor.orphaned)
+
+    stats = executor.get_stats()
+    assert timed_out == [handle]
+    assert stats['timed_out'] == 1
+    assert stats['in_flight'] == 0
+    assert stats['orphaned'] == 1 and stats['busy_workers'] == 1
+
+    release.set()
+    wait_until(lambda: not executor.orphaned)
+    # Geç gelen sonuç 'done' sayılmaz
+    assert handle.status == 'timed_out'
+    assert executor.get_stats()['done'] == 0
+
+
+def test_orphaned_workers_count_against_capacity(executor):
+    started, release = threading.Event(), threading.Event()
+    handle = executor.submit('ai', blocking_job(started, release), timeout=0.05)
+    assert started.wait(2)
+    wait_until(lambda: handle.id in executor.orphaned)
+
+    blockers = [executor.submit('ai', blocking_job(threading.Event(), release)) for _ in range(2)]
+    assert all(blockers)
+    assert executor.submit('ai', lambda handle: None) is None
+    assert executor.counters['rejected'] == 1
+    release.set()
+
+
+def test_supersede_cancels_same_name(executor):
+    started, release = threading.Event(), threading.Event()
+
+    def cooperative(handle):
+        started.set()
+        while not release.is_set():
+            handle.check()
+            time.sleep(0.005)
+
+    first = executor.submit('ai', cooperative)
+    assert started.wait(2)
+    second = executor.submit('ai', lambda handle: "yeni", supersede=True)
+
+    assert second.future.result(2) == "yeni"
+    wait_until(lambda: not executor.in_flight and not executor.orphaned)
+    assert first.status == 'cancelled'
+    assert executor.counters['superseded'] == 1
+    assert executor.counters['cancelled'] == 1
+    release.set()
+
+
+def test_group_allows_one_command_at_a_time(executor):
+    started, release = threading.Event(), threading.Event()
+    photo = executor.submit('photo', blocking_job(started, release), timeout=0.05)
+    assert started.wait(2)
+
+    assert executor.busy('ocr')
+    assert not executor.busy('weather')
+    assert executor.submit('ocr', lambda handle: None) is None
+    assert executor.counters['group_busy'] == 1
+
+    # Zaman aşımından sonra da kamera serbest değil: işçi hâlâ çalışıyor
+    wait_until(lambda: photo.id in executor.orphaned)
+    assert executor.busy('ocr')
+
+    release.set()
+    wait_until(lambda: not executor.busy('ocr'))
+    assert executor.submit('ocr', lambda handle: "ok").future.result(2) == "ok"
+
+
+def test_failure_reports_error(executor):
+    errors = []
+
+    def broken(handle):
+        raise ValueError("bozuk")
+
+    handle = executor.submit('news', broken, on_error=lambda h, e: errors.append((h, e)))
+    handle.future.result(2)
+    wait_until(lambda: not executor.in_flight)
+
+    assert handle.status == 'failed'
+    assert isinstance(handle.error, ValueError)
+    assert errors == [(handle, handle.error)]
+    assert executor.counters['failed'] == 1
+
+
+def test_cancel_by_name_skips_queued_command():
+    executor = CommandExecutor(max_workers=1, max_pending=4)
+    started, release = threading.Event(), threading.Event()
+    ran = []
+    try:
+        executor.submit('ai', blocking_job(started, release))
+        assert started.wait(2)
+        queued = executor.submit('news', lambda handle: ran.append(1))
+
+        assert executor.cancel('news') == 1
+        release.set()
+        wait_until(lambda: not executor.in_flight)
+        assert queued.status == 'cancelled'
+        assert ran == []
+    finally:
+        executor.shutdown()
@@ -0,0 +1,63 @@
+# tests/test_conversation.py
+"""Sohbet hafızası: özetleme sürerken sıfırlanan sohbet geri gelmemeli"""
+
+import asyncio
+import json
+import threading
+
+from src.api.conversation import ConversationMemory
+
+
+def make_memory(tmp_path):
+    memory = ConversationMemory("test", budget_tokens=40, keep_recent=2, path=tmp_path / "test.json")
+    for i in range(4):
+        memory.add_exchange(f"eski soru {i} " * 5, f"eski cevap {i} " * 5)
+    assert memory.needs_compaction()
+    return memory
+
+
+def test_clear_during_compaction_discards_summary(tmp_path):
+    memory = make_memory(tmp_path)
+
+    async def summarizer(text):
+        memory.clear()
+        memory.add_exchange("yeni soru", "yeni cevap")
+        return "eski konuşmanın özeti"
+
+    asyncio.run(memory.acompact(summarizer))
+    assert memory.summary == ""
+    assert [t['content'] for t in memory.turns] == ["yeni soru", "yeni cevap"]
+    assert memory.metrics['discarded'] == 1
+
+
+def test_compaction_keeps_recent_turns(tmp_path):
+    memory = make_memory(tmp_path)
+
+    async def summarizer(text):
+        return "özet"
+
+    asyncio.run(memory.acompact(summarizer))
+    assert memory.summary == "özet"
+    assert len(memory.turns) == 2
+
+
+def test_concurrent_saves(tmp_path):
+    memory = make_memory(tmp_path)
+    threads = [threading.Thread(target=memory.save) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    data = json.loads(memory.path.read_text(encoding='utf-8'))
+    assert len(data['turns']) == len(memory.turns)
+
+
+def test_memory_is_kept_per_user(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.api.conversation.default_conversation_dir", lambda: tmp_path)
+    ali = ConversationMemory("ali")
+    ali.add_exchange("benim adım Ali", "Merhaba Ali")
+    ayse = ConversationMemory("../ayşe")
+
+    assert ayse.path.parent == tmp_path
+    assert ayse.history() == []
+    assert ConversationMemory("ali").history()[0]['content'] == "benim adım Ali"
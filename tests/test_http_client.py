@@ -0,0 +1,285 @@
+# tests/test_http_client.py
+"""Ortak HTTP istemcisi: yerel sahte sunucuya karşı tekrar deneme, sınırlar, zaman aşımları"""
+
+import json
+import time
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+requests = pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from src.api.http_client import (AsyncHttpClient, HttpClient, LatencyHistogram,
+                                 LATENCY_BUCKETS_MS)
+from src.api.async_runtime import run_sync
+
+
+class StubServer:
+    """
+    Yol başına sıralı cevaplar: (durum, gövde, başlıklar, gecikme).
+    Sıra bitince son cevap tekrarlanır.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = {}
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                with stub._lock:
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                    index = stub.hits.get(path, 0)
+                    stub.hits[path] = index + 1
+                    stub.requests.append((path, dict(self.headers)))
+                    script = stub.routes.get(path) or [(404, {}, {}, 0)]
+                status, body, headers, delay = script[min(index, len(script) - 1)]
+                try:
+                    if delay:
+                        time.sleep(delay)
+                    payload = json.dumps(body).encode() if status != 304 else b""
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except OSError:
+                    pass
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def route(self, path: str, *responses):
+        defaults = (200, {}, {}, 0)
+        self.routes[path] = [tuple(r) + defaults[len(r):] for r in responses]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    yield server
+    server.close()
+
+
+def fast_client(**kwargs) -> HttpClient:
+    kwargs.setdefault("backoff_base", 0.001)
+    kwargs.setdefault("backoff_max", 0.01)
+    return HttpClient(**kwargs)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# ============================================
+# HİSTOGRAM
+# ============================================
+
+def test_histogram_buckets_and_percentiles():
+    hist = LatencyHistogram()
+    for ms in (10, 20, 30, 40, 600, 700, 800, 900, 20000):
+        hist.record(ms)
+    hist.record(3000, error=True)
+
+    summary = hist.summary()
+    assert summary['count'] == 10
+    assert summary['errors'] == 1
+    assert summary['buckets']['50'] == 4
+    assert summary['buckets'][str(LATENCY_BUCKETS_MS[-1])] == 1
+    assert hist.percentile(0.4) == 50
+    assert hist.percentile(0.5) == 1000
+    assert hist.percentile(0.95) == float('inf')
+
+
+# ============================================
+# SENKRON İSTEMCİ
+# ============================================
+
+def test_retries_retryable_status_then_succeeds(stub):
+    stub.route("/data", (503, {}), (429, {}, {"Retry-After": "0"}), (200, {"ok": True}))
+    client = fast_client(max_retries=2)
+
+    response = client.get(stub.url + "/data")
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert stub.hits["/data"] == 3
+
+    summary = client.get_stats()[f"127.0.0.1:{stub.server.server_address[1]}/data"]
+    assert summary['count'] == 3
+    assert summary['errors'] == 1   # 429 sunucu hatası sayılmaz
+
+
+def test_gives_up_after_max_retries(stub):
+    stub.route("/down", (502, {}))
+    client = fast_client(max_retries=2)
+
+    assert client.get(stub.url + "/down").status_code == 502
+    assert stub.hits["/down"] == 3
+
+
+def test_client_errors_are_not_retried(stub):
+    stub.route("/missing", (404, {}))
+    client = fast_client(max_retries=3)
+
+    assert client.get(stub.url + "/missing").status_code == 404
+    assert stub.hits["/missing"] == 1
+
+
+def test_read_timeout_raises_after_retries(stub):
+    stub.route("/slow", (200, {}, {}, 0.5))
+    client = fast_client(read_timeout=0.1, max_retries=1)
+
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get(stub.url + "/slow")
+    assert stub.hits["/slow"] == 2
+
+
+def test_connection_error_raises_after_retries():
+    client = fast_client(connect_timeout=0.5, max_retries=2)
+    url = f"http://127.0.0.1:{free_port()}/none"
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get(url)
+    summary = next(iter(client.get_stats().values()))
+    assert summary['count'] == 3
+    assert summary['errors'] == 3
+
+
+def test_per_host_limit_caps_concurrency(stub):
+    stub.route("/busy", (200, {}, {}, 0.1))
+    client = fast_client(per_host_limit=2, pool_size=8)
+
+    threads = [threading.Thread(target=client.get, args=(stub.url + "/busy",)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert stub.hits["/busy"] == 6
+    assert stub.max_active == 2
+
+
+# ============================================
+# ASYNC İSTEMCİ
+# ============================================
+
+def test_async_client_retries_and_limits(stub):
+    pytest.importorskip("httpx")
+    import asyncio
+
+    stub.route("/flaky", (500, {}), (200, {"ok": True}))
+    stub.route("/busy", (200, {}, {}, 0.1))
+    client = AsyncHttpClient(fast_client(), max_retries=2, per_host_limit=2)
+
+    async def scenario():
+        try:
+            first = await client.get(stub.url + "/flaky")
+            await asyncio.gather(*(client.get(stub.url + "/busy") for _ in range(6)))
+            return first
+        finally:
+            await client.close()
+
+    response = run_sync(scenario())
+    assert response.status_code == 200
+    assert stub.hits["/flaky"] == 2
+    assert stub.max_active == 2
+
+
+def test_async_timeout_maps_to_requests_exception(stub):
+    pytest.importorskip("httpx")
+    stub.route("/slow", (200, {}, {}, 0.5))
+    client = AsyncHttpClient(fast_client(), read_timeout=0.1, max_retries=0)
+
+    async def scenario():
+        try:
+            await client.get(stub.url + "/slow")
+        finally:
+            await client.close()
+
+    with pytest.raises(requests.exceptions.Timeout):
+        run_sync(scenario())
+
+
+# ============================================
+# API İSTEMCİLERİ
+# ============================================
+
+@pytest.fixture
+def api_env(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.api.weather.default_cache_dir", lambda: tmp_path)
+    monkeypatch.setattr("src.api.news.default_cache_dir", lambda: tmp_path)
+    monkeypatch.setenv("OPENWEATHER_API_KEY", "test-key")
+    monkeypatch.setenv("NEWS_API_KEY", "test-key")
+
+
+def test_weather_api_through_stub(stub, api_env):
+    from src.api.weather import WeatherAPI
+
+    stub.route("/weather", (503, {}), (200, {
+        "name": "İstanbul", "dt": 1700000000,
+        "weather": [{"description": "açık", "icon": "01d"}],
+        "main": {"temp": 21.5, "feels_like": 20.0, "humidity": 40}
+    }))
+    api = WeatherAPI(http=AsyncHttpClient(fast_client()), base_url=stub.url)
+
+    obs = api.fetch_weather("İstanbul")
+    assert obs.city == "İstanbul"
+    assert obs.temp == 21.5
+    assert stub.hits["/weather"] == 2
+
+    # İkinci istek TTL içinde önbellekten
+    api.fetch_weather("istanbul")
+    assert stub.hits["/weather"] == 2
+
+
+def test_news_api_revalidates_with_etag(stub, api_env):
+    from src.api.news import NewsAPI
+
+    article = {"title": "Başlık", "source": {"name": "Kaynak"},
+               "publishedAt": "2024-01-01T00:00:00Z", "url": "http://example.com/a"}
+    stub.route("/top-headlines",
+               (200, {"status": "ok", "totalResults": 1, "articles": [article]}, {"ETag": '"v1"'}),
+               (304, {}))
+    api = NewsAPI(http=AsyncHttpClient(fast_client()), base_url=stub.url)
+
+    result = api.fetch_headlines('general')
+    assert [a.title for a in result.articles] == ["Başlık"]
+
+    # Kayıt çok eskidi: koşullu istek, 304 eski sonucu korur
+    api.cache.max_stale = 0
+    for entry in api.cache._entries.values():
+        entry.stored_at = 0
+    again = api.fetch_headlines('general')
+    assert [a.title for a in again.articles] == ["Başlık"]
+    assert stub.hits["/top-headlines"] == 2
+    assert stub.requests[-1][1].get("If-None-Match") == '"v1"'
+    assert api.cache.metrics['revalidated'] == 1
@@ -0,0 +1,61 @@
+# tests/test_intent.py
+"""Yerel niyet motoru: sıradan cümleler cihaz komutuna gitmemeli"""
+
+import pytest
+
+from src.models.intent import IntentEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return IntentEngine(["Ahmet Yılmaz"])
+
+
+@pytest.mark.parametrize("text", [
+    "açıkla kamera ne işe yarar",
+    "kamera açıkla",
+    "istanbul ankara arası kaç saat",
+    "kaç saat sürer",
+    "tarih nedir",
+    "neden gökyüzü mavi",
+    "okulda fotoğraf",
+])
+def test_sentences_go_to_chat(engine, text):
+    assert engine.parse(text).name == "chat"
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("kamera aç", "ar_start"),
+    ("kamerayı aç", "ar_start"),
+    ("kamerayı açar mısın", "ar_start"),
+    ("kamerayı kapat", "ar_stop"),
+    ("fotoğraf çek", "photo"),
+    ("fotoğrafı oku", "ocr"),
+    ("saat kaç", "time"),
+    ("şu an saat kaç", "time"),
+    ("tarih ne", "date"),
+    ("bugünün tarihi ne", "date"),
+    ("hafızanı sıfırla", "new_chat"),
+    ("yeni sohbet", "new_chat"),
+    ("depolama", "storage"),
+    ("spor haberleri", "news"),
+    ("Ahmet'in numarası", "contacts"),
+    ("ne haber", "greeting"),
+    ("selam ne haber", "greeting"),
+    ("naber", "greeting"),
+    ("ne haberler var", "news"),
+    ("ne haber var bugün gündemde", "news"),
+])
+def test_commands(engine, text, intent):
+    assert engine.parse(text).name == intent
+
+
+def test_device_actions_capped_in_long_sentences(engine):
+    assert engine.parse("kamerayı aç ve bana bu odada ne gördüğünü anlat").name == "chat"
+
+
+def test_reminder_slots(engine):
+    intent = engine.parse("10 dakika sonra ilacımı hatırlat")
+    assert intent.name == "reminder"
+    assert intent.slots["minutes"] == 10
+    assert intent.slots["message"] == "ilacımı"
@@ -0,0 +1,49 @@
+# tests/test_llm_cache.py
+"""LLM cevap önbelleği: yakın tekrar katmanı farklı sorulara cevap vermemeli"""
+
+import asyncio
+
+import pytest
+
+from src.api.llm_cache import LLMResponseCache, same_content
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMResponseCache(db_path=tmp_path / "llm_cache.db")
+
+
+def test_numbers_must_match(cache):
+    cache.put("1234 ile 5678 çarpımı kaç eder", "7006652", "model")
+    assert cache.get("1234 ile 5678 çarpımı kaç eder", "model") == "7006652"
+    assert cache.get("1234 ile 5679 çarpımı kaç eder", "model") is None
+
+
+def test_typo_is_near_hit(cache):
+    cache.put("yapay zeka nasıl çalışır acaba", "cevap", "model")
+    assert cache.get("yapay zeka nasıl çalışırr acaba", "model") == "cevap"
+    assert cache.get_stats()['near_hits'] == 1
+
+
+def test_different_content_word_rejected():
+    assert not same_content("istanbulun nüfusu ne kadar", "istanbulun yüzölçümü ne kadar")
+    assert same_content("pythonda liste nasıl sıralanır", "pyhtonda liste nasıl sıralanır")
+
+
+def test_async_access_and_batched_touches(cache):
+    async def scenario():
+        await cache.aput("python liste sıralama nasıl yapılır", "sorted()", "model")
+        return [await cache.aget("python liste sıralama nasıl yapılır", "model") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == ["sorted()"] * 3
+    assert cache.get_stats()['pending_touches'] == 1
+    cache.flush()
+    hits = cache._db.execute("SELECT hits FROM responses").fetchone()[0]
+    assert hits == 3
+
+
+def test_custom_path_creates_its_own_directory(tmp_path):
+    cache = LLMResponseCache(db_path=tmp_path / "nested" / "dir" / "llm_cache.db")
+    cache.put("başkentimiz neresi acaba", "Ankara", "router")
+    assert cache.get("başkentimiz neresi acaba", "router") == "Ankara"
+    assert (tmp_path / "nested" / "dir" / "llm_cache.db").exists()
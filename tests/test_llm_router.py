@@ -0,0 +1,164 @@
+# tests/test_llm_router.py
+"""LLM yönlendirici: devre kesici, model istatistiği, geri düşme ve yedek istek"""
+
+import time
+import asyncio
+
+import pytest
+
+from src.api.llm_router import CircuitBreaker, LLMRouter, ModelStats
+
+
+# ============================================
+# DEVRE KESİCİ
+# ============================================
+
+def expire(breaker):
+    breaker.opened_until = 0.0
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.state == 'closed' and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+
+
+def test_half_open_allows_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record_failure()
+    expire(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == 'half_open'
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+
+def test_failed_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    breaker.trip(30)
+    expire(breaker)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+def test_permanent_failure_opens_for_an_hour():
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    breaker.record_failure(permanent=True)
+    assert breaker.state == 'open'
+    assert breaker.opened_until - time.monotonic() > 3000
+
+
+# ============================================
+# MODEL İSTATİSTİĞİ
+# ============================================
+
+def test_model_stats_defaults_and_error_penalty():
+    stats = ModelStats('groq')
+    assert stats.p50_ttft() == 400.0
+    assert stats.p95_ttft() == 800.0
+
+    for ms in (100, 200, 300, 400, 500):
+        stats.record_ttft(ms)
+    assert stats.p50_ttft() == 300
+    clean = stats.score()
+
+    stats.record_error()
+    assert stats.error_rate == pytest.approx(0.2)
+    assert stats.score() > clean
+    stats.record_success(1000)
+    assert stats.error_rate == pytest.approx(0.16)
+    assert stats.summary()['requests'] == 2
+
+
+# ============================================
+# YÖNLENDİRİCİ
+# ============================================
+
+class FakeClient:
+    """Sahte sağlayıcı: model -> ('ok', parçalar, gecikme) veya ('error', mesaj)"""
+
+    available = True
+
+    def __init__(self, name: str, behaviours: dict):
+        self.name = name
+        self.behaviours = behaviours
+        self.calls = []
+
+    def models(self) -> list:
+        return list(self.behaviours)
+
+    async def astream_raw(self, prompt: str, model: str, memory=None):
+        self.calls.append(model)
+        behaviour = self.behaviours[model]
+        if behaviour[0] == 'error':
+            raise RuntimeError(behaviour[1])
+        _, chunks, delay = behaviour
+        await asyncio.sleep(delay)
+        for chunk in chunks:
+            yield chunk
+
+
+def test_router_falls_back_and_records_failure():
+    groq = FakeClient('groq', {'fast': ('error', 'rate limit'), 'slow': ('ok', ["Mer", "haba"], 0)})
+    router = LLMRouter([groq], min_hedge_ms=1000)
+
+    assert router.ask("selam") == "Merhaba"
+    assert groq.calls == ['fast', 'slow']
+    assert router.last_route == "groq/slow"
+    assert router.metrics['fallbacks'] == 1
+
+    fast, slow = router.candidates
+    assert fast.stats.errors == 1 and fast.breaker.failures == 1
+    assert slow.breaker.state == 'closed'
+    # Hatalı model sıralamada geriye düşer
+    assert router.rank()[0] is slow
+
+
+def test_router_skips_open_circuit():
+    groq = FakeClient('groq', {'a': ('ok', ["A"], 0), 'b': ('ok', ["B"], 0)})
+    router = LLMRouter([groq])
+    router.candidates[0].breaker.trip(60)
+
+    assert router.ask("soru") == "B"
+    assert groq.calls == ['b']
+
+
+def test_router_hedges_slow_primary_to_other_provider():
+    groq = FakeClient('groq', {'m': ('ok', ["yavaş"], 1.0)})
+    gemini = FakeClient('gemini', {'g': ('ok', ["hızlı"], 0)})
+    router = LLMRouter([groq, gemini], min_hedge_ms=50, max_hedge_ms=50)
+
+    assert router.ask("soru") == "hızlı"
+    assert router.metrics['hedged'] == 1
+    assert router.metrics['hedge_wins'] == 1
+    assert router.candidates[0].stats.hedges_lost == 1
+    # Yarıda kalan deneme devrenin tek deneme hakkını tutmaz
+    assert not router.candidates[0].breaker.trial_running
+
+
+def test_router_reports_when_every_model_fails():
+    groq = FakeClient('groq', {'m': ('error', 'model decommissioned')})
+    router = LLMRouter([groq])
+
+    assert router.ask("soru").startswith("❌")
+    assert router.metrics['failed'] == 1
+    breaker = router.candidates[0].breaker
+    assert breaker.state == 'open'
+    assert router.rank() == []
@@ -0,0 +1,74 @@
+# tests/test_noise_floor.py
+"""Gürültü tabanı: hızlı düşüş / yavaş yükseliş, eşik sınırları, recognizer'a uygulama"""
+
+import types
+
+import pytest
+
+from src.models.noise_floor import NoiseFloorEstimator
+
+
+def make_recognizer():
+    return types.SimpleNamespace(energy_threshold=0, dynamic_energy_threshold=True)
+
+
+@pytest.fixture
+def estimator(tmp_path):
+    return NoiseFloorEstimator(tmp_path / "mic.json", recognizer=make_recognizer(),
+                               ratio=2.0, min_threshold=100, max_threshold=4000)
+
+
+def test_uncalibrated_keeps_dynamic_threshold(estimator):
+    assert not estimator.calibrated
+    assert estimator.recognizer.dynamic_energy_threshold is True
+    assert estimator.recognizer.energy_threshold == estimator.energy_threshold
+
+
+def test_first_frame_calibrates_and_disables_dynamic_threshold(estimator):
+    estimator.update_rms(500)
+    assert estimator.calibrated
+    assert estimator.energy_threshold == 1000
+    assert estimator.recognizer.energy_threshold == 1000
+    assert estimator.recognizer.dynamic_energy_threshold is False
+
+
+def test_floor_falls_fast_and_rises_slowly(estimator):
+    estimator.update_rms(1000)
+    estimator.update_rms(200)
+    fallen = estimator.noise_floor
+    assert fallen == pytest.approx(1000 + (200 - 1000) * estimator.fall_rate)
+
+    # Konuşma kareleri tabanı ancak azıcık yükseltir
+    for _ in range(10):
+        estimator.update_rms(3000)
+    assert estimator.noise_floor < fallen * 1.2
+
+
+def test_threshold_is_clamped(estimator):
+    estimator.update_rms(1)
+    assert estimator.energy_threshold == 100
+    estimator.noise_floor = None
+    estimator.update_rms(100000)
+    assert estimator.energy_threshold == 4000
+    assert estimator.is_speech(4001) and not estimator.is_speech(3999)
+
+
+def test_calibration_is_persisted(tmp_path):
+    path = tmp_path / "mic.json"
+    first = NoiseFloorEstimator(path, ratio=2.0)
+    first.update_rms(400)
+    first.save()
+
+    recognizer = make_recognizer()
+    second = NoiseFloorEstimator(path, recognizer=recognizer, ratio=2.0)
+    assert second.calibrated
+    assert second.energy_threshold == 800
+    assert recognizer.energy_threshold == 800
+    assert recognizer.dynamic_energy_threshold is False
+
+
+def test_frame_update_uses_rms(tmp_path):
+    np = pytest.importorskip("numpy")
+    estimator = NoiseFloorEstimator(tmp_path / "mic.json", ratio=1.0, min_threshold=0)
+    estimator.update(np.full(160, 300, dtype=np.int16))
+    assert estimator.noise_floor == pytest.approx(300)
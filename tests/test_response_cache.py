@@ -0,0 +1,163 @@
+# tests/test_response_cache.py
+"""API yanıt önbelleği: TTL, stale-while-revalidate, koşullu yenileme, kalıcılık"""
+
+import asyncio
+
+import pytest
+
+from src.api.response_cache import ResponseCache, format_age
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "cache.json", ttl=60, max_stale=3600, save_delay=60)
+
+
+def age(cache, key, seconds):
+    cache.get(key).stored_at -= seconds
+
+
+class Source:
+    """Sayaçlı sahte kaynak"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+        self.previous = []
+
+    async def fetch(self):
+        self.calls += 1
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    async def conditional(self, previous):
+        self.calls += 1
+        self.previous.append(previous)
+        value = self.values.pop(0)
+        if value == 304:
+            return previous.data, previous.meta
+        return value, {'etag': f'"{value}"'}
+
+
+async def settle(cache):
+    while cache._tasks:
+        await asyncio.gather(*list(cache._tasks))
+
+
+def test_fresh_entry_is_served_without_fetch(cache):
+    source = Source("v1")
+
+    async def scenario():
+        first = await cache.aget_or_fetch("k", source.fetch)
+        second = await cache.aget_or_fetch("k", source.fetch)
+        return first, second
+
+    (data, first_age), (again, _) = asyncio.run(scenario())
+    assert data == again == "v1"
+    assert first_age == 0.0
+    assert source.calls == 1
+    assert cache.metrics['misses'] == 1 and cache.metrics['hits'] == 1
+
+
+def test_stale_entry_is_served_and_refreshed_once(cache):
+    source = Source("v1", "v2")
+
+    async def scenario():
+        await cache.aget_or_fetch("k", source.fetch)
+        age(cache, "k", 120)
+        # Aynı anahtar için iki istek: ikisi de bayat değeri alır, tek yenileme
+        results = [await cache.aget_or_fetch("k", source.fetch) for _ in range(2)]
+        await settle(cache)
+        return results
+
+    results = asyncio.run(scenario())
+    assert [data for data, _ in results] == ["v1", "v1"]
+    assert all(stale_age >= 120 for _, stale_age in results)
+    assert source.calls == 2
+    assert cache.get("k").data == "v2"
+    assert cache.metrics['stale_hits'] == 2
+    assert cache.metrics['refreshes'] == 1
+
+
+def test_per_call_ttl_overrides_default(cache):
+    source = Source("v1", "v2")
+
+    async def scenario():
+        await cache.aget_or_fetch("k", source.fetch)
+        age(cache, "k", 30)
+        data, _ = await cache.aget_or_fetch("k", source.fetch, ttl=10)
+        await settle(cache)
+        return data
+
+    assert asyncio.run(scenario()) == "v1"
+    assert source.calls == 2
+
+
+def test_offline_serves_last_known_value(cache):
+    source = Source("v1", ConnectionError("ağ yok"))
+
+    async def scenario():
+        await cache.aget_or_fetch("k", source.fetch)
+        age(cache, "k", 7200)   # max_stale dışında: senkron getirme denenir
+        return await cache.aget_or_fetch("k", source.fetch)
+
+    data, old_age = asyncio.run(scenario())
+    assert data == "v1"
+    assert old_age >= 7200
+    assert cache.metrics['offline_hits'] == 1
+
+
+def test_miss_without_entry_raises(cache):
+    source = Source(ConnectionError("ağ yok"))
+    with pytest.raises(ConnectionError):
+        asyncio.run(cache.aget_or_fetch("k", source.fetch))
+
+
+def test_conditional_fetch_sends_previous_and_revalidates(cache):
+    source = Source("v1", 304)
+
+    async def scenario():
+        await cache.aget_or_fetch("k", source.conditional, conditional=True)
+        age(cache, "k", 7200)
+        return await cache.aget_or_fetch("k", source.conditional, conditional=True)
+
+    data, fresh_age = asyncio.run(scenario())
+    assert data == "v1"
+    assert source.previous[0] is None
+    assert source.previous[1].meta == {'etag': '"v1"'}
+    assert cache.metrics['revalidated'] == 1
+    # 304 kaydı tazeler
+    assert cache.get("k").age < 1
+    assert fresh_age == 0.0
+
+
+def test_persists_with_encode_decode_and_version(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = ResponseCache(path, encode=lambda d: {'v': d}, decode=lambda raw: raw['v'], version=2)
+    cache.put("k", "değer", {'etag': '"x"'})
+    cache.save()
+
+    reloaded = ResponseCache(path, encode=lambda d: {'v': d}, decode=lambda raw: raw['v'], version=2)
+    assert reloaded.get("k").data == "değer"
+    assert reloaded.get("k").meta == {'etag': '"x"'}
+
+    # Biçim sürümü değişince eski kayıtlar yok sayılır
+    assert ResponseCache(path, version=3).get("k") is None
+
+
+def test_max_entries_drops_oldest(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.json", max_entries=2, save_delay=60)
+    for key in ("a", "b", "c"):
+        cache.put(key, key)
+        cache.get(key).stored_at -= ord("z") - ord(key)
+    assert cache.get("a") is None
+    assert cache.get("c").data == "c"
+
+
+def test_format_age():
+    assert format_age(10) == "az önce"
+    assert format_age(300) == "5 dk önce"
+    assert format_age(2 * 3600) == "2 saat önce"
+    assert format_age(3 * 86400) == "3 gün önce"
@@ -0,0 +1,115 @@
+# tests/test_speech_scheduler.py
+"""Konuşma zamanlayıcı: öncelik sırası, supersede, kesme, yaşlanma ve iptal"""
+
+import threading
+
+from src.models.speech_scheduler import (PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL,
+                                         PRIORITY_URGENT, SpeechScheduler)
+
+
+def submit(scheduler, text, priority=PRIORITY_NORMAL, **kwargs):
+    return scheduler.submit(text, "tr-TR", 1.0, priority=priority, **kwargs)
+
+
+def drain(scheduler):
+    spoken = []
+    while True:
+        handle = scheduler.get(timeout=0)
+        if handle is None:
+            return spoken
+        spoken.append(handle.text)
+        scheduler.done(handle)
+
+
+def test_higher_priority_first_then_fifo():
+    scheduler = SpeechScheduler()
+    submit(scheduler, "düşük", PRIORITY_LOW)
+    submit(scheduler, "normal 1")
+    submit(scheduler, "acil", PRIORITY_URGENT)
+    submit(scheduler, "normal 2")
+    submit(scheduler, "yüksek", PRIORITY_HIGH)
+
+    assert drain(scheduler) == ["acil", "yüksek", "normal 1", "normal 2", "düşük"]
+    stats = scheduler.get_stats()
+    assert stats['spoken'] == 5 and stats['depth'] == 0
+
+
+def test_same_key_supersedes_queued_answer():
+    scheduler = SpeechScheduler()
+    old = submit(scheduler, "eski hava", key="weather")
+    new = submit(scheduler, "yeni hava", key="weather")
+
+    assert old.status == 'superseded' and old.wait(0)
+    assert scheduler.depth() == 1
+    assert drain(scheduler) == ["yeni hava"]
+    assert new.status == 'done'
+    assert scheduler.counters['superseded'] == 1
+
+
+def test_higher_priority_preempts_current():
+    preempted = []
+    scheduler = SpeechScheduler(on_preempt=preempted.append)
+    chat = submit(scheduler, "uzun sohbet")
+    assert scheduler.get(timeout=0) is chat
+
+    submit(scheduler, "aynı öncelik")
+    assert chat.status == 'speaking'
+
+    alarm = submit(scheduler, "hatırlatma", PRIORITY_HIGH)
+    assert chat.status == 'cancelled'
+    assert preempted == [chat]
+    assert scheduler.counters['preempted'] == 1
+
+    scheduler.done(chat)
+    assert scheduler.counters['spoken'] == 0
+    assert scheduler.get(timeout=0) is alarm
+
+
+def test_preempt_flag_interrupts_same_key():
+    scheduler = SpeechScheduler()
+    first = submit(scheduler, "cevap", key="ai")
+    scheduler.get(timeout=0)
+    submit(scheduler, "yeni cevap", key="ai", preempt=True)
+    assert first.status == 'cancelled'
+
+
+def test_stale_speech_expires():
+    scheduler = SpeechScheduler(max_age=5)
+    stale = submit(scheduler, "geç kaldı")
+    stale.created -= 10
+    submit(scheduler, "zamanında")
+
+    assert drain(scheduler) == ["zamanında"]
+    assert stale.status == 'expired'
+    assert scheduler.counters['expired'] == 1
+
+
+def test_cancelled_handles_are_skipped():
+    scheduler = SpeechScheduler()
+    skipped = submit(scheduler, "vazgeçildi")
+    submit(scheduler, "okunur")
+    skipped.cancel()
+
+    assert scheduler.depth() == 1
+    assert drain(scheduler) == ["okunur"]
+    assert scheduler.counters['cancelled'] == 1
+
+
+def test_cancel_all_clears_queue():
+    scheduler = SpeechScheduler()
+    handles = [submit(scheduler, f"mesaj {i}", key=f"k{i}") for i in range(3)]
+    scheduler.cancel_all()
+
+    assert all(h.status == 'cancelled' for h in handles)
+    assert scheduler.empty()
+    assert scheduler.get(timeout=0) is None
+
+
+def test_get_wakes_on_submit():
+    scheduler = SpeechScheduler()
+    result = []
+    worker = threading.Thread(target=lambda: result.append(scheduler.get(timeout=2)))
+    worker.start()
+    handle = submit(scheduler, "merhaba")
+    worker.join(3)
+    assert result == [handle]
@@ -0,0 +1,113 @@
+# tests/test_theme.py
+"""Tema jetonları: set_theme ve mevcut kontrollerin yerinde boyanması"""
+
+import dataclasses
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.theme import THEMES, MobileTheme
+
+
+@dataclasses.dataclass
+class Side:
+    width: int
+    color: str
+
+
+@dataclasses.dataclass
+class Border:
+    top: Side
+    bottom: Side
+
+
+@dataclasses.dataclass
+class Gradient:
+    colors: list
+
+
+@dataclasses.dataclass
+class ButtonStyle:
+    bgcolor: dict
+
+
+@pytest.fixture(autouse=True)
+def dark_theme():
+    MobileTheme.set_theme("dark")
+    yield
+    MobileTheme.set_theme("dark")
+
+
+def dark(token: str) -> str:
+    return THEMES["dark"][token]
+
+
+def ocean(token: str) -> str:
+    return THEMES["ocean"][token]
+
+
+def test_themes_share_tokens_and_unique_colors():
+    tokens = set(THEMES["dark"])
+    for name, colors in THEMES.items():
+        assert set(colors) == tokens, name
+        lowered = [c.lower() for c in colors.values()]
+        assert len(set(lowered)) == len(lowered), name
+
+
+def test_set_theme_updates_shared_dict_in_place():
+    colors = MobileTheme.current
+    previous = MobileTheme.set_theme("ocean")
+    assert colors is MobileTheme.current
+    assert colors["primary"] == ocean("primary")
+    assert previous["primary"] == dark("primary")
+    assert MobileTheme.name == "ocean"
+
+
+def test_unknown_theme_keeps_current():
+    previous = MobileTheme.set_theme("yok")
+    assert MobileTheme.name == "dark"
+    assert previous == THEMES["dark"]
+    assert MobileTheme.restyle([SimpleNamespace(bgcolor=dark("glass"))], previous) == 0
+
+
+def test_restyle_repaints_tree_and_keeps_alpha_suffix():
+    side = Side(1, dark("primary") + "40")
+    shared = Border(top=side, bottom=side)
+    child = SimpleNamespace(color=dark("text"), border=shared, controls=[])
+    twin = SimpleNamespace(color=dark("text_muted"), border=shared, controls=[])
+    button = SimpleNamespace(style=ButtonStyle({"hovered": dark("accent"), "": "#123456"}),
+                             content="metin")
+    root = SimpleNamespace(
+        bgcolor=dark("bg_primary").upper(),
+        gradient=Gradient([dark("bg_primary"), dark("bg_secondary")]),
+        controls=[child, twin, None],
+        content=button,
+    )
+
+    previous = MobileTheme.set_theme("ocean")
+    changed = MobileTheme.restyle([root], previous)
+
+    assert root.bgcolor == ocean("bg_primary")
+    assert root.gradient.colors == [ocean("bg_primary"), ocean("bg_secondary")]
+    assert child.color == ocean("text")
+    assert twin.color == ocean("text_muted")
+    # Ortak stil nesnesi bir kez boyanır, saydamlık eki korunur
+    assert side.color == ocean("primary") + "40"
+    # Tema dışı renk olduğu gibi kalır
+    assert button.style.bgcolor == {"hovered": ocean("accent"), "": "#123456"}
+    assert changed == 7
+
+
+def test_restyle_round_trip_restores_original_colors():
+    control = SimpleNamespace(bgcolor=dark("glass"), color=dark("error"), controls=[])
+    MobileTheme.restyle([control], MobileTheme.set_theme("ice"))
+    MobileTheme.restyle([control], MobileTheme.set_theme("dark"))
+    assert control.bgcolor == dark("glass")
+    assert control.color == dark("error")
+
+
+def test_restyle_uses_flet_children_hook():
+    inner = SimpleNamespace(color=dark("info"))
+    control = SimpleNamespace(_get_children=lambda: [inner, None], controls=[])
+    MobileTheme.restyle([control], MobileTheme.set_theme("ocean"))
+    assert inner.color == ocean("info")
@@ -0,0 +1,113 @@
+# tests/test_ui_scheduler.py
+"""UI zamanlayıcı: aynı karedeki isteklerin birleştirilmesi ve sayaçlar"""
+
+import time
+
+import pytest
+
+from src.utils.ui_scheduler import UIScheduler
+
+
+class FakePage:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    def update(self, *controls):
+        self.calls.append(controls)
+        if self.fail and controls:
+            raise RuntimeError("kontrol sayfada değil")
+
+
+class FakeControl:
+    def __init__(self, page=True, fail: bool = False):
+        self.page = page
+        self.fail = fail
+        self.updates = 0
+
+    def update(self):
+        if self.fail:
+            raise RuntimeError("kaldırıldı")
+        self.updates += 1
+
+
+def manual(page) -> UIScheduler:
+    """Arka plan thread'i durdurulmuş zamanlayıcı: gönderim yalnız flush() ile"""
+    scheduler = UIScheduler(page)
+    scheduler.stop()
+    scheduler._thread.join(1)
+    return scheduler
+
+
+def test_marks_in_one_frame_are_sent_once():
+    page = FakePage()
+    scheduler = manual(page)
+    text, bar = FakeControl(), FakeControl()
+
+    for _ in range(50):
+        scheduler.mark(text)
+    scheduler.mark(bar, None)
+    scheduler.flush()
+
+    assert len(page.calls) == 1
+    assert set(map(id, page.calls[0])) == {id(text), id(bar)}
+    stats = scheduler.get_stats()
+    assert stats['requested'] == 51
+    assert stats['flushed'] == 1
+    assert stats['controls_sent'] == 2
+    assert stats['coalesced'] == 50
+    assert stats['ratio'] == pytest.approx(1 / 51)
+
+
+def test_page_update_covers_dirty_controls():
+    page = FakePage()
+    scheduler = manual(page)
+    scheduler.mark(FakeControl())
+    scheduler.mark_page()
+    scheduler.flush()
+
+    assert page.calls == [()]
+    assert scheduler.counters['full_updates'] == 1
+    assert scheduler.counters['controls_sent'] == 0
+
+
+def test_unmounted_controls_and_empty_frames_are_skipped():
+    page = FakePage()
+    scheduler = manual(page)
+    scheduler.mark(FakeControl(page=None))
+    scheduler.flush()
+    scheduler.flush()
+
+    assert page.calls == []
+    assert scheduler.counters['flushed'] == 0
+
+
+def test_failed_batch_falls_back_to_single_updates():
+    page = FakePage(fail=True)
+    scheduler = manual(page)
+    good, gone = FakeControl(), FakeControl(fail=True)
+    scheduler.mark(good, gone)
+    scheduler.flush()
+
+    assert good.updates == 1
+    assert scheduler.counters['errors'] == 1
+
+
+def test_background_thread_limits_frame_rate():
+    page = FakePage()
+    scheduler = UIScheduler(page, fps=10)
+    control = FakeControl()
+    try:
+        deadline = time.monotonic() + 0.35
+        while time.monotonic() < deadline:
+            scheduler.mark(control)
+            time.sleep(0.002)
+        time.sleep(0.15)
+    finally:
+        scheduler.stop()
+
+    stats = scheduler.get_stats()
+    # ~0.35 sn'de 10 fps: birkaç kare, yüzlerce istek
+    assert 2 <= stats['flushed'] <= 6
+    assert stats['requested'] > 50
+    assert all(call == (control,) for call in page.calls)
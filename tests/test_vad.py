@@ -0,0 +1,142 @@
+# tests/test_vad.py
+"""VAD ve konuşma sonu tespiti: enerji + ZCR, ön kayıt, hangover, yankı kapısı"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.models.vad import EchoGate, Endpointer, VoiceActivityDetector
+
+FRAME = 512   # 16 kHz'de 32 ms
+
+
+def speech(amplitude: float = 3000) -> "np.ndarray":
+    t = np.arange(FRAME) / 16000
+    return (amplitude * np.sin(2 * np.pi * 200 * t)).astype(np.int16)
+
+
+def hiss(amplitude: int = 500) -> "np.ndarray":
+    return np.tile(np.array([amplitude, -amplitude], dtype=np.int16), FRAME // 2)
+
+
+def silence() -> "np.ndarray":
+    return np.zeros(FRAME, dtype=np.int16)
+
+
+def make_vad(threshold: float = 300, **kwargs) -> VoiceActivityDetector:
+    vad = VoiceActivityDetector(noise_floor=SimpleNamespace(energy_threshold=threshold), **kwargs)
+    # Enerji + ZCR modeli sınanır; webrtcvad kurulu olsa da kullanılmaz
+    vad.webrtc = None
+    return vad
+
+
+# ============================================
+# VAD
+# ============================================
+
+def test_vad_classifies_speech_silence_and_hiss():
+    vad = make_vad()
+    is_speech, rms = vad.analyse(speech())
+    assert is_speech and rms == pytest.approx(3000 / 2 ** 0.5, rel=0.01)
+    assert vad.analyse(silence()) == (False, 0.0)
+    # Eşik üstü ama yüksek sıfır geçişli tıslama konuşma değil
+    assert vad.analyse(hiss())[0] is False
+    # Çok yüksek enerji ZCR'den bağımsız konuşmadır
+    assert vad.analyse(hiss(2000))[0] is True
+    assert vad.analyse(np.array([], dtype=np.int16)) == (False, 0.0)
+
+
+def test_vad_follows_noise_floor_threshold():
+    floor = SimpleNamespace(energy_threshold=300)
+    vad = make_vad()
+    vad.noise_floor = floor
+    assert vad.analyse(speech(1000))[0]
+    floor.energy_threshold = 1000
+    assert not vad.analyse(speech(1000))[0]
+    assert VoiceActivityDetector().threshold == 300
+
+
+# ============================================
+# KONUŞMA SONU
+# ============================================
+
+def test_endpointer_start_pre_roll_and_hangover():
+    endpointer = Endpointer(make_vad(), frame_ms=32, pre_roll_ms=160, start_ms=64,
+                            hangover_ms=320, timeout=0)
+    for _ in range(8):
+        assert endpointer.feed(silence()) is None
+        assert endpointer.is_idle_frame()
+
+    assert endpointer.feed(speech()) is None
+    assert endpointer.feed(speech()) == 'start'
+    # Ön kayıt: başlangıçtan önceki 3 sessiz kare + 2 konuşma karesi
+    assert len(endpointer.frames) == 5
+
+    events = [endpointer.feed(speech()) for _ in range(3)]
+    events += [endpointer.feed(silence()) for _ in range(10)]
+    assert events[:-1] == [None] * 12
+    assert events[-1] == 'end'
+    assert endpointer.speech_ended_at <= time.monotonic() - 0.3
+    assert len(endpointer.audio_bytes()) == len(endpointer.frames) * FRAME * 2
+
+
+def test_short_silence_does_not_end_phrase():
+    endpointer = Endpointer(make_vad(), frame_ms=32, start_ms=32, hangover_ms=320, timeout=0)
+    assert endpointer.feed(speech()) == 'start'
+    for _ in range(5):
+        assert endpointer.feed(silence()) is None
+    assert endpointer.feed(speech()) is None
+    assert endpointer.silence_run == 0
+
+
+def test_endpointer_timeout_and_phrase_limit():
+    waiting = Endpointer(make_vad(), timeout=1)
+    waiting.started_at -= 2
+    assert waiting.feed(silence()) == 'timeout'
+
+    talking = Endpointer(make_vad(), frame_ms=32, start_ms=32, phrase_limit=1)
+    assert talking.feed(speech()) == 'start'
+    talking.speech_started_at -= 2
+    assert talking.feed(speech()) == 'end'
+    assert Endpointer(make_vad()).audio_bytes() == b""
+
+
+# ============================================
+# YANKI KAPISI
+# ============================================
+
+def test_echo_gate_learns_echo_then_allows_barge_in():
+    gate = EchoGate(tail_ms=250, barge_in_ratio=2.0, learn_ms=200)
+    assert not gate.is_active()
+
+    gate.playback_started()
+    start = gate._playing_since
+    # Öğrenme süresinde her şey kapılanır ve yankı seviyesi öğrenilir
+    assert not gate.allows(800, at=start + 0.05)
+    assert not gate.allows(800, at=start + 0.1)
+    assert gate.echo_level == pytest.approx(600)
+    assert gate.gated_frames == 2
+
+    assert not gate.allows(900, at=start + 0.5)
+    assert gate.allows(5000, at=start + 0.5)
+
+
+def test_echo_gate_covers_tail_after_playback():
+    gate = EchoGate(tail_ms=250)
+    gate.playback_started()
+    gate.playback_stopped()
+    stopped = gate._stopped_at
+    assert gate.is_active(stopped + 0.2)
+    assert not gate.is_active(stopped + 0.3)
+
+
+def test_vad_gates_tts_echo():
+    gate = EchoGate(learn_ms=0)
+    vad = make_vad(echo_gate=gate)
+    gate.echo_level = 2000
+    gate.playback_started()
+    assert vad.analyse(speech(2000))[0] is False
+    assert vad.analyse(speech(8000))[0] is True
@@ -0,0 +1,83 @@
+# tests/test_voice_history.py
+"""Konuşma geçmişi günlüğü: arka plan yazma, sıkıştırma, eski biçimden aktarma"""
+
+import json
+
+import pytest
+
+from src.models.voice_history import VoiceHistoryLog
+
+
+@pytest.fixture
+def log(tmp_path):
+    history = VoiceHistoryLog(tmp_path / "voice.jsonl", max_entries=5, flush_interval=60, compact_factor=2)
+    yield history
+    history.close()
+
+
+def test_append_is_written_on_flush(log):
+    log.append({'text': 'merhaba'}, stats={'count': 1})
+    log.append({'text': 'nasılsın'}, stats={'count': 2})
+    assert not log.path.exists()
+
+    log.flush()
+    history, stats = log.load_tail()
+    assert [h['text'] for h in history] == ['merhaba', 'nasılsın']
+    assert stats == {'count': 2}
+
+
+def test_compaction_keeps_last_entries(log):
+    for i in range(12):
+        log.append({'text': f'kayıt {i}'}, stats={'count': i})
+        log.flush()
+
+    history, stats = log.load_tail()
+    assert [h['text'] for h in history] == [f'kayıt {i}' for i in range(7, 12)]
+    assert stats == {'count': 11}
+    lines = log.path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) <= log.compact_limit
+
+
+def test_clear_resets_history(log):
+    log.append({'text': 'eski'})
+    log.clear({'count': 0})
+    log.flush()
+    assert log.load_tail() == ([], {'count': 0})
+
+
+def test_tail_skips_torn_last_line(log):
+    log.append({'text': 'tam'})
+    log.flush()
+    with open(log.path, 'a', encoding='utf-8') as f:
+        f.write('{"t": "h", "text": "yar')
+    assert [h['text'] for h in log.load_tail()[0]] == ['tam']
+
+
+def test_legacy_import_runs_on_writer_thread(tmp_path):
+    legacy = tmp_path / "voice_history.json"
+    legacy.write_text(json.dumps({'history': [{'text': f'eski {i}'} for i in range(3)],
+                                  'stats': {'count': 3}}), encoding='utf-8')
+    log = VoiceHistoryLog(tmp_path / "voice.jsonl", max_entries=10, flush_interval=60)
+    try:
+        # Aktarmadan önce kuyruğa giren kayıtlar kaybolmaz, aktarılanlardan sonra gelir
+        log.append({'text': 'yeni'}, stats={'count': 4})
+        log.import_legacy(legacy)
+        log.flush()
+
+        history, stats = log.load_tail()
+        assert [h['text'] for h in history] == ['eski 0', 'eski 1', 'eski 2', 'yeni']
+        assert stats == {'count': 4}
+        assert not legacy.exists()
+    finally:
+        log.close()
+
+
+def test_legacy_import_skipped_when_log_exists(log, tmp_path):
+    log.append({'text': 'mevcut'})
+    log.flush()
+    legacy = tmp_path / "voice_history.json"
+    legacy.write_text(json.dumps({'history': [{'text': 'eski'}]}), encoding='utf-8')
+
+    log.import_legacy(legacy)
+    assert [h['text'] for h in log.load_tail()[0]] == ['mevcut']
+    assert legacy.exists()